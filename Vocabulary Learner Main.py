@@ -1,12 +1,12 @@
-import json
+import os
 import time
-from random import randint
-from datetime import datetime, timedelta
-from collections import defaultdict
+import threading
 
 import kivy
 from kivy.app import App
 from kivy.lang import Builder
+from kivy.clock import Clock
+from kivy.animation import Animation
 from kivy.core.window import Window
 
 from kivy.graphics import *
@@ -26,7 +26,7 @@ from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
 from kivy.uix.modalview import ModalView
 from kivy.uix.togglebutton import ToggleButton
-from kivy.properties import ObjectProperty
+from kivy.properties import ObjectProperty, StringProperty
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.dropdown import DropDown
 
@@ -34,11 +34,36 @@ from kivy.uix.dropdown import DropDown
 from circular_progress_bar import CircularProgressBar
 from wrapped_label import WrappedLabel
 from wrapped_button import WrappedButton
+from resources import res, preload
 
-LEARNED_THRESHOLD = 0.8
-FAMILIAR_THRESHOLD = 0.45
+from engine import Vocabulary, Profiles, LEARNED, FAMILIAR, TO_LEARN
+from engine.exporter import export_file
 
-# load kv file
+# the sqlite store is used once the json file is migrated with
+# `python -m engine Vocabulary_Words.json Vocabulary_Words.db`
+# it's the first profile, the others have their own file, see engine/profiles.py
+VOCAB_FILE = 'Vocabulary_Words.db' if os.path.exists('Vocabulary_Words.db') else 'Vocabulary_Words.json'
+
+# the profiles of everyone using the app, and which one is active
+PROFILES_FILE = 'profiles.json'
+
+# word lists shared by every profile, read only, see engine/library.py
+LIBRARY_FILE = 'Library.json'
+
+# how often (seconds) the store gets to do its housekeeping (e.g. compacting the journal)
+MAINTAIN_INTERVAL = 60
+
+# the word list is only searched once the user stopped typing for this long (seconds)
+SEARCH_DELAY = 0.1
+
+# written by the export button of the word lists screen
+EXPORT_FILE = 'Vocabulary_Export.html'
+
+# a notice fades in and out in NOTICE_FADE and stays for NOTICE_DURATION in between (seconds)
+NOTICE_FADE = 0.15
+NOTICE_DURATION = 0.5
+
+# load kv file, only the templates and modal views, every screen has its own in kv/
 Builder.load_file("vocab.kv")
 
 """
@@ -60,7 +85,7 @@ Root (dict):
                 hour (int)
             correct answer count (int)
             all answers count (int)
-        all logins (str):
+        all logins (str): only in old files, rolled up into daily when the app starts
             time (list):
                 year (int)
                 month (int)
@@ -68,12 +93,31 @@ Root (dict):
                 hour (int)
             correct answer count (int)
             all answers count (int)
+        daily (str):
+            day (str): 'YYYY-MM-DD'
+                correct answer count (int)
+                all answers count (int)
+        monthly (str): days older than 90 days, rolled up
+            month (str): 'YYYY-MM'
+                correct answer count (int)
+                all answers count (int)
     WordList (str):
         word (str): 
             meanings (list)
             answered correctly (int)
             answered total (int)
             list (str)
+    Schedule (str):
+        word (str):
+            due (float)
+            interval (float)
+            ease (float)
+            reps (int)
+    LibraryStats (str): only in the shards of profiles, see engine/library.py
+        word (str): a word of the library
+            answered correctly (int)
+            answered total (int)
+            review state (list): due, interval, ease, reps; null if never reviewed
     LearnedWords (str):
         word (str): 
             meanings (list)
@@ -82,34 +126,90 @@ Root (dict):
             type (list)
             answered correctly (int)
             answered total (int)
+    Journal generation (str): int, the journals older than this are in the file already,
+        see engine/journal.py
 """
-file = open('Vocabulary_Words.json', 'r')
-js = json.load(file)
-
-# Because looping through the words everytime is very inefficient, create a dictionary 
-# that maps lists to words
-
-word_lists = defaultdict(lambda: [])
-
-# generates word_lists
-def generate_word_lists():
-    word_lists.clear()
-    for word in js['WordList']:
-        word_lists[js['WordList'][word][3]].append(word)   
-# removes keys with empty lists in `word_lists`
-def update_word_lists():        
-    i = 0
-    while i < len(word_lists):
-        if len(list(word_lists.values())[i]) == 0:
-            word_lists.pop(list(word_lists.keys())[i])
-        else: i += 1
-generate_word_lists()
-
-# total question answered and number of them that are correct for this login
-total_question_answered = 0
-total_question_answered_correct = 0
-
-screen_manager = ScreenManager()
+# the words, their indexes, questions and grading, see engine/vocabulary.py
+# loaded in the background when the app starts, None until then
+vocabulary = None
+
+# the screens read the user settings and words straight from the store
+store = None
+
+# only the active profile is loaded, `Vocabulary_LearnerApp.switch_profile` changes it
+profiles = Profiles(PROFILES_FILE, VOCAB_FILE, LIBRARY_FILE)
+
+class LazyScreenManager(ScreenManager):
+    """
+    `LazyScreenManager.__init__(**kwargs)`
+    factories: screen name -> (screen class, kv file) of the screens that were not built yet
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factories = {}
+
+    # the screen is only built the first time it is asked for
+    def register(self, name: str, screen_class, kv_file: str):
+        self.factories[name] = (screen_class, kv_file)
+
+    """
+    `LazyScreenManager.get_screen(name: str) -> Screen`
+    Also called by the ScreenManager when `current` changes
+
+    1. If the screen wasn't built yet, loads its kv rules and builds it
+    2. Returns the screen
+    """
+    def get_screen(self, name: str) -> Screen:
+        if name in self.factories:
+            screen_class, kv_file = self.factories.pop(name)
+            Builder.load_file(kv_file)
+            self.add_widget(screen_class(name=name))
+        return super().get_screen(name)
+
+screen_manager = LazyScreenManager()
+
+class ModalPool:
+    """
+    `ModalPool.__init__()`
+    factories: modal name -> (modal class, kwargs) of the modals that were not built yet
+    modals: modal name -> modal, every modal is built once and reused by every opening
+    """
+    def __init__(self):
+        self.factories = {}
+        self.modals = {}
+
+    def register(self, name: str, modal_class, **kwargs):
+        self.factories[name] = (modal_class, kwargs)
+
+    def get(self, name: str) -> ModalView:
+        if name in self.factories:
+            modal_class, kwargs = self.factories.pop(name)
+            self.modals[name] = modal_class(**kwargs)
+        return self.modals[name]
+
+    """
+    `ModalPool.open(name: str, *args)`
+
+    1. Builds the modal if it's the first time
+    2. Calls its `refresh(*args)` so it shows the new data, then opens it
+    """
+    def open(self, name: str, *args):
+        modal = self.get(name)
+        modal.refresh(*args)
+        modal.open()
+
+    # builds the modals that were not built yet, one per frame, so the first opening is fast too
+    def warm(self):
+        names = list(self.factories)
+
+        def build_next(dt):
+            if len(names) == 0:
+                return False
+            self.get(names.pop())
+
+        Clock.schedule_interval(build_next, 0)
+
+modals = ModalPool()
 
 class Main(Screen):
     # label that shows the current list that the user is practicing
@@ -133,6 +233,9 @@ class Main(Screen):
     # if the user answered correctly
     answer_correct = False
 
+    # the current question, see engine/vocabulary.py
+    question = None
+
     # list to practice
     list_to_practice = str()
 
@@ -184,23 +287,10 @@ class Main(Screen):
     `Main.play_valid()`
     Called whenever `self.update()` is called
     
-    1. checks if playing is valid
+    1. checks if playing is valid, the list needs at least 4 different meanings
     """
     def play_valid(self) -> bool:
-        if word_lists.get(self.list_to_practice) == None:
-            return False
-
-        words = word_lists[self.list_to_practice]
-
-        meanings = set()
-        for word in words:
-            mean_list = js['WordList'][word][0]
-            for mean in mean_list:
-                meanings.add(mean)
-            if len(meanings) >= 4:
-                return True
-
-        return False
+        return vocabulary.can_play(self.list_to_practice)
 
     """
     `Main.update()`
@@ -210,207 +300,112 @@ class Main(Screen):
     2. calls `play()` if possible
     """
     def update(self):
+        # nothing can be pressed until the vocabulary is loaded, see `Vocabulary_LearnerApp.on_start`
+        loading = vocabulary is None
+        self.disabled = loading
+
         # set the greetings based on time
         # -------------------------------
         
         # user is a list of first, last name
-        username = js['User']["name"]
+        username = '' if loading else store.get_user('name')
 
         hour = time.localtime()[3]
         if hour > 7 and hour < 13:
-            self.profile_btn.text = "Good Morning, " + username
+            greeting = "Good Morning"
         elif hour > 12 and hour < 19:
-            self.profile_btn.text = "Good Afternoon, " + username
+            greeting = "Good Afternoon"
         else:
-            self.profile_btn.text = "Good Evening, " + username
+            greeting = "Good Evening"
+        self.profile_btn.text = greeting if loading else greeting + ", " + username
 
-        if self.play_valid():
+        if loading:
+            self.current_list.text = "Loading words..."
+            self.deactivate()
+        elif self.play_valid():
             # set the label of the current list
             self.current_list.text = "Currently studying: " + self.list_to_practice
             self.get_word()
         else:
+            self.current_list.text = ""
             self.deactivate()
 
         # update questions_answered
         # -------------------------
 
         # max: the user's goal of how many questions they want to answer
-        self.total_answered.max = js['User']['goal']
-
-        # value: how many questions they actually answered
-        self.total_answered.value = min(self.total_answered.max, total_question_answered)
+        self.total_answered.max = 1 if loading else store.get_user('goal')
 
-        today = time.localtime()[2]
+        # the questions answered correctly today, number of questions answered today
+        correct_count, total_count = (0, 0) if loading else vocabulary.activity.today()
 
-        # add all of the questions answered from previous logins from the today
-        for login in js['Login info']['all logins']:
-            if login[0][2] == today and self.total_answered.value < self.total_answered.max:
-                self.total_answered.value = min(
-                    self.total_answered.value + login[2], self.total_answered.max)
+        # value: how many questions they actually answered
+        self.total_answered.value = min(self.total_answered.max, total_count)
 
-        self.total_answered._default_label_text = str(self.total_answered.value) + " / " \
+        self.total_answered.label_text = str(self.total_answered.value) + " / " \
             + str(self.total_answered.max) + "\n   {}%"
-        self.total_answered._text_label.refresh()
 
         # update correctness
         # ------------------
 
-        # the questions answered correctly today
-        correct_count = 0
-
-        # number of questions answered today
-        total_count = 0
-
-        # these are used to figure out the precentage of correctness
-
-        # calculate precentage from questions answered from previous logins from the today
-        for login in js['Login info']['all logins']:
-            if login[0][2] == today:
-                correct_count += login[1]
-                total_count += login[2]
-
         # update questions_correct
         self.correctness.max = max(1, total_count)
         self.correctness.value = correct_count
-        self.correctness._default_label_text = "Correct\n   {}%"
-        self.correctness._text_label.refresh()
+        self.correctness.label_text = "Correct\n   {}%"
 
     """
     `Main.get_word()`
     Called whenever the user presses the next button
 
-    1. randomly selects a word to be the correct word
+    1. asks the scheduler for the word that is due the earliest, that is the correct word
     2. sets up the incorrect ones
     3. updates statistics on the correct word
     """
     def get_word(self):
-        for label in self.labelToCheck:
-            label.color = (0, 0, 0, 1)
-            label.text = ''
-            self.labelToCheck[label].disabled = False
-
-        # ---------------------------- Pick New Word -----------------------------
-        word_list = word_lists[self.list_to_practice]
-
-        # used for recommendation algorithm (not yet implemented)
-        learned = []
-        familiar = []
-        to_learn = []
-        for word in word_list:
-            correct_percentage = 0 if js['WordList'][word][2] == 0 \
-                else js['WordList'][word][1] / js['WordList'][word][2]
-            if correct_percentage > LEARNED_THRESHOLD:
-                learned.append(word)
-            elif correct_percentage > FAMILIAR_THRESHOLD:
-                familiar.append(word)
-            else:
-                to_learn.append(word)
-
-
-        # selects the correct word `self.wordName`
-        # ----------------------------------------
-
-        self.wordName = word_list[randint(0, len(word_list) - 1)]
+        # in "due only" mode there might be nothing to review right now
+        self.question = vocabulary.next_question(self.list_to_practice)
+        if self.question is None:
+            self.deactivate()
+            self.word.text = 'Nothing to review'
+            return
 
         # sets the main word label on the top
-        self.word.text = self.wordName
-
-        # index 2 is the total number of times answered
-        self.correct_percentage.max = max(1, js['WordList'][self.wordName][2])
-
-        # index 1 is the number of correct times answered
-        self.correct_percentage.value = js['WordList'][self.wordName][1]
- 
-
-        # list of meanings for the current word
-        meanings = js['WordList'][self.wordName][0]
-
-        # puts meanings in `others` except the current word (self.wordName)
-        others = []
-        for word in js['WordList']:  # loop through all the words
-            lst = js['WordList'][word][3]
-            if word != self.wordName and lst == self.list_to_practice:  # if word ≠ current word
-                others += js['WordList'][word][0]
-
-        # remove repeats in `others`
-        others = list(set(others))
-
-        # if the correct label text is in others, remove it
-        for meaning in others:
-            if meaning in meanings: # if the meaning is in the list of meanings for the current word
-                others.remove(meaning)
-
-
-        # the correct answer label for meaning
-        self.correct_label = self.answer_labels[randint(0, 3)]
-
-        # sets the text for the correct label, randomly select one from the list of meanings
-        self.correct_label.text = meanings[randint(0, len(meanings) - 1)]
-
-
-        # the corresponding checkbox for the correct label
-        self.correct_checkbox = self.labelToCheck[self.correct_label]
-
-
-        # list of incorrect answers labels
-        self.incorrect_labels = []
-        for answer_label in self.answer_labels:
-            if answer_label != self.correct_label:
-                self.incorrect_labels.append(answer_label)
-        
-        # this guarentees that meanings will not be repeated
-        # but this also means that the meaning count can be < 4, so we need to take care of that
-
-        # set text to incorrect labels
-        for i in range(3):
-            # if there are no meanings left, disable the checkbox
-            if len(others) <= 0:
-                self.incorrect_labels[i].text = 'N/A'
-                self.labelToCheck[self.incorrect_labels[i]].disabled = True
-
-            # otherwise, pop the current meaning out of `other`
-            else:
-                index = randint(0, len(others) - 1)
-                self.incorrect_labels[i].text = others.pop(index)
+        self.word.text = self.question.word
 
+        # the list can have less than 4 different meanings, those choices are disabled
+        for label, choice in zip(self.answer_labels, self.question.choices):
+            label.color = (0, 0, 0, 1)
+            label.text = 'N/A' if choice is None else choice
+            self.labelToCheck[label].disabled = choice is None
 
         # update CPB, labels about the current word
+        correct, total = self.question.correct, self.question.total
     
         # labels
-        self.correct_num.text = str(js['WordList'][self.wordName][1]) 
-        self.incorrect_num.text = str(js['WordList'][self.wordName][2] - js['WordList'][self.wordName][1])
+        self.correct_num.text = str(correct) 
+        self.incorrect_num.text = str(total - correct)
 
         # CPBs
-        self.correct_percentage.max = max(1, js['WordList'][self.wordName][2])
-        self.correct_percentage.value = js['WordList'][self.wordName][1]
+        self.correct_percentage.max = max(1, total)
+        self.correct_percentage.value = correct
 
     """
     `Main.check()`
     Called whenever the user clicks an answer checkbox
 
     1. Deactives itself, set to red/green depending if the user got it correct
-    2. Updates statistics on the word
-    3. Updates global total question answered/correct 
+    2. Updates statistics on the word and the answers of today
     """
     def check(self, instance):
-        global total_question_answered
-        global total_question_answered_correct
-
-        # the user answered a question, so add to it
-        total_question_answered += 1
-
         # set checkboxes to disabled and color them
         instance.active = False
         instance.disabled = True
 
-        # if the checkbox is correct
-        if instance == self.correct_checkbox:
-            total_question_answered_correct += 1
-
-            # add stats to js file
-            js['WordList'][self.wordName][1] += 1
-            js['WordList'][self.wordName][2] += 1
+        # the index of the choice that belongs to the checkbox
+        choice = [self.labelToCheck[label] for label in self.answer_labels].index(instance)
 
+        # updates the stats, the scheduler only looks at the first answer of every question
+        if vocabulary.answer(self.question, choice):
             # set correct label to green, incorrect to red
             for label in self.labelToCheck.keys():
                 if self.labelToCheck[label] == instance:
@@ -419,15 +414,13 @@ class Main(Screen):
                     label.color = (242/255, 38/255, 19/255, 1)
 
             # disable all incorrect labels
-            for label in self.incorrect_labels:
-                self.labelToCheck[label].disabled = True
+            for checkbox in self.labelToCheck.values():
+                if checkbox != instance:
+                    checkbox.disabled = True
 
             self.answer_correct = True
         # if checkbox is incorrect
         else: 
-            # update stats
-            js['WordList'][self.wordName][2] += 1
-
             for label in self.labelToCheck.keys():
                 if self.labelToCheck[label] == instance:
                     label.color = (242/255, 38/255, 19/255, 1)
@@ -451,16 +444,14 @@ class Main(Screen):
     Called when user presses the profile button
     """
     def go_to_profile(self):
-        modal = UserProfile(pos_hint={"center_x": 0.5, "center_y": 0.5}, size_hint=(0.8, 0.8))
-        modal.open()
+        modals.open('user_profile')
 
     """
     `Main.go_to_settings()`
     Called when user presses the profile button
     """
     def go_to_settings(self):
-        modal = Settings(pos_hint={"center_x": 0.5, "center_y": 0.5}, size_hint=(0.8, 0.8))
-        modal.open()
+        modals.open('settings')
 
 class AddWords(Screen):
     """
@@ -473,8 +464,8 @@ class AddWords(Screen):
             self.size_hint_y = None
             self.height = 200
             self.hint_text = " Enter meaning"
-            self.background_normal = "images/add_words/meaning_input.jpg"
-            self.background_active = "images/add_words/meaning_input.jpg"
+            self.background_normal = res("images/add_words/meaning_input.jpg")
+            self.background_active = res("images/add_words/meaning_input.jpg")
             self.padding = (10, 10) # padding_x = padding_y = 10
 
     # the textbox for the main word
@@ -495,8 +486,6 @@ class AddWords(Screen):
     # cancel button
     cancel = ObjectProperty(None)
 
-    # message for the notice modal
-    message = str()
 
     """
     `AddWords.__init__(**kwargs)`
@@ -510,7 +499,7 @@ class AddWords(Screen):
 
         # Button to add a new MeaningInput
         self.add_meaning_btn = Button(size_hint_y = None, height = 95,
-            background_normal="images/add_words/add_meaning.jpg")
+            background_normal=res("images/add_words/add_meaning.jpg"))
 
         self.add_meaning_btn.bind(on_press=self.add_new_meaningInput)
 
@@ -572,14 +561,14 @@ class AddWords(Screen):
 
         # [add new list] button created separately from the rest, binded to `self.add_new_list`
         btn = Button(text="Add new list", height=60, size_hint_y=None, color=(0, 0, 0, 1),
-            background_normal="mages/add_words/word_list.jpg")
+            background_normal=res("images/add_words/word_list.jpg"))
         btn.bind(on_press=self.createAddNewListModal)
         self.dropdown.add_widget(btn)
 
         # other buttons are added based on word lists
-        for word_list in word_lists:
+        for word_list in store.lists():
             btn = Button(text=word_list, height=60, size_hint_y=None, color=(0, 0, 0, 1),
-                background_normal="images/add_words/word_list.jpg")
+                background_normal=res("images/add_words/word_list.jpg"))
 
             # when button is pressed, call select() in dropdown
             btn.bind(on_press = lambda btn: self.dropdown.select(btn.text))
@@ -610,7 +599,7 @@ class AddWords(Screen):
     def createAddNewListModal(self, btn: Button):
         # modal view that contains a textinput and a confirm button 
         self.add_list_modal = ModalView(pos_hint={"center_x": 0.5, "center_y": 0.5}, size_hint=(0.8, 0.8))
-        self.add_list_modal.background = "images/modal_background.jpg"
+        self.add_list_modal.background = res("images/modal_background.jpg")
 
         # main layout for the modal view
         layout = FloatLayout()
@@ -620,7 +609,7 @@ class AddWords(Screen):
             hint_text="type in the name of the new list", background_color=(137/255, 166/255, 215/255))
 
         self.modal_confirm_btn = Button(pos_hint={"center_x": 0.5, "top": 0.3}, size_hint=(0.6, 0.1),
-            background_normal = "images/add_words/add_list.jpg")
+            background_normal = res("images/add_words/add_list.jpg"))
         self.modal_confirm_btn.bind(on_press=self.add_new_list)
 
         # put stuff into the main layout
@@ -660,7 +649,7 @@ class AddWords(Screen):
                 # don't want to remove this button!
                 if btn.text == 'Add new list': 
                     continue 
-                if len(word_lists[btn.text]) == 0 and btn.text != new_list:
+                if store.list_size(btn.text) == 0 and btn.text != new_list:
                     self.dropdown.remove_widget(btn)
 
             # add new list button to the dropdown
@@ -700,22 +689,19 @@ class AddWords(Screen):
 
         # checks if all info is legal
         # if word exists
-        if self.word.text in js['WordList'].keys():
-            self.open_modal('The word is already in\nyour word list')
+        if store.has_word(self.word.text):
+            notifications.show('The word is already in\nyour word list')
         # if text input is empty
         elif len(meanings) == 0:
-            self.open_modal('Please fill in at least one blank')
+            notifications.show('Please fill in at least one blank')
         elif self.word_list_btn.text == 'Choose List':
-            self.open_modal('Please select the word list')
+            notifications.show('Please select the word list')
         else:
             current_word = self.word.text # the current word
-            # update js file
-            js['WordList'][current_word] = [meanings, 0, 0, self.word_list]
-
-            # update `word_lists` info
-            word_lists[self.word_list].append(current_word)
+            # add the word to the store and every index
+            vocabulary.add_word(current_word, meanings, self.word_list)
 
-            self.open_modal("Word saved")
+            notifications.show("Word saved")
 
             self.update()
 
@@ -727,25 +713,7 @@ class AddWords(Screen):
     """
     def cancel_pressed(self):
         self.update()
-        self.open_modal("Cancelled")
-    
-    """
-    Function that opens the modal view that displays `self.message`
-    The modalview flashes for 0.5 secs
-    """
-    def open_modal(self, message: str):
-        self.message = message
-        modal = Notice()
-        modal.bind(on_open=self.close_modal)
-        modal.open()
-
-    """
-    Function that closes the modal view
-    """
-    def close_modal(self, modal):
-        # pause for 0.5 seconds to let the user see the message
-        time.sleep(0.5)
-        modal.dismiss()
+        notifications.show("Cancelled")
 
 class WordsList(Screen):
     # main layout
@@ -754,14 +722,18 @@ class WordsList(Screen):
     # Button that lets user add another word, located 'on top' of the scroll view
     add_word_btn = ObjectProperty(None)
 
-    # Scrollview for all the word lists
-    scrollview = ScrollView()
+    # RecycleView for all the word lists, only the visible buttons exist
+    list_rv = ObjectProperty(None)
+
+    # Button that writes every list to EXPORT_FILE
+    export_btn = ObjectProperty(None)
 
     """
     `AddWords.__init__(**kwargs)`
     Constructor
     
-    1. Creates add_word_btn, binded to self.add_word
+    1. Creates add_word_btn, binded to self.add_word, and export_btn, binded to self.export,
+        on top of the RecycleView
     2. Calls update
     """
     def __init__(self, **kwargs):
@@ -776,54 +748,26 @@ class WordsList(Screen):
             size_hint=(0.3, 0.137), background_color=(0, 0, 0, 0))
         
         self.add_word_btn.bind(on_press=self.add_word)
+
+        self.export_btn = Button(pos_hint={"x": 0.09, "top": 0.3}, size_hint=(0.3, 0.06),
+            text='Export', font_size=25)
+        self.export_btn.bind(on_press=self.export)
+
+        # the RecycleView is in the kv, so these end up after it
+        self.main_layout.add_widget(self.add_word_btn)
+        self.main_layout.add_widget(self.export_btn)
         self.update()
 
     """
     `WordsList.update()`
     Called whenever the screen is switched to this
 
-    1. Deletes empty lists from word_lists (bug?)
-    2. Removes self.scrollview completely
-    3. Goes through word_lists and puts a button into the gridlayout for each word list
-    4. Adds the add word button after the layout so it stays unaffected by it
+    1. Gives the RecycleView one dict per word list, the buttons (`WordListButton` in the kv)
+        are created and reused by the RecycleView while scrolling
     """
     def update(self):
-        # ???
-        update_word_lists()
-
-        # awkward... but need to add the add_word_btn AFTER the scrollview
-        self.main_layout.remove_widget(self.add_word_btn)
-        self.main_layout.remove_widget(self.scrollview)
-
-        # scrollview that contains the word lists
-        self.scrollview = ScrollView(pos_hint={"x": 0.07, "top": 0.959}, 
-            size_hint=(0.84, 0.84), do_scroll=True)
-        
-        # inside it put a gridlayout with 2 columns
-        scrollview_layout = GridLayout(size_hint_y=None, size_hint_x=1, 
-            row_force_default=True, row_default_height=100, pos=(0, 0), cols=2, spacing=40)
-        scrollview_layout.bind(minimum_height=scrollview_layout.setter('height'))
-
-        # size_hint: 0.35 x 0.1
-
-        # Put the buttons inside the gridlayout
-        for word_list in word_lists:
-            btn = Button(text=word_list, background_normal="images/words_list/word_list.jpg", font_size=20, 
-                color=(0, 0, 0, 1))
-            btn.bind(on_press=self.go_to_list)
-            scrollview_layout.add_widget(btn)
-
-        # add an empty button to the grid layout if the # of buttons is odd
-        if len(word_lists) & 1: # if len(word_list) is odd
-            scrollview_layout.add_widget(Button(disabled=True, background_color=(0, 0, 0, 0)))
-
-        self.scrollview.add_widget(scrollview_layout)
-
-        # add the scrollview before the add_word_btn
-        self.main_layout.add_widget(self.scrollview)
-
-        # add the add_word_btn after the scrollview
-        self.main_layout.add_widget(self.add_word_btn)
+        self.list_rv.data = [{'text': word_list} for word_list in store.lists()]
+        self.export_btn.text = 'Export'
 
     """
     `Dictionary.go_to_list()`
@@ -855,79 +799,82 @@ class WordsList(Screen):
         self.manager.get_screen('add_words').update()
         self.manager.current = 'add_words'
 
+    """
+    `WordsList.export(btn: Button)`
+    Called when user presses the export button
+
+    1. Writes all lists with their statistics to EXPORT_FILE in a thread, a batch of words at a
+        time while holding the vocabulary's lock, so words can still be changed meanwhile
+    2. Shows the number of exported words on the button once it's done
+    """
+    def export(self, btn: Button):
+        if btn.text == 'Exporting...':
+            return
+        btn.text = 'Exporting...'
+        # `Vocabulary.close()` waits for it, a profile switch doesn't close the store under it
+        vocabulary.run_in_background(self._export, btn, vocabulary)
+
+    def _export(self, btn: Button, exported: Vocabulary):
+        try:
+            count = export_file(EXPORT_FILE, exported.store, lock=exported.lock)
+            text = 'Exported {} words'.format(count)
+        except OSError as error:
+            text = 'Export failed: {}'.format(error.strerror)
+        except Exception as error:
+            # anything else would leave the button on 'Exporting...', which blocks the next export
+            text = 'Export failed: {}'.format(error)
+
+        # widgets are only changed in the main thread
+        Clock.schedule_once(lambda dt: setattr(btn, 'text', text))
+
 class SingleList(Screen):
     search_textbox = ObjectProperty(None)
 
     # The list name the user selected
     list_name = ObjectProperty(None)
-    scrollview = ScrollView()
+
+    # RecycleView for the words, only the visible rows exist
+    word_rv = ObjectProperty(None)
     word_list = str()
 
     """
     `SingleList.__init__(**kwargs)`
-    1. main_layout: FloatLayout, everything fits in it
-    2. search_textbox: User searches through it
+    1. search_textbox: User searches through it
+    2. word_rv: the words of the list (in the kv)
     3. btn: Set Active button
     """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.main_layout = FloatLayout() # the main floatlayout
 
-        # lambda inst, val: self.update(val) reads textinput object, string and calls self.update 
-        self.search_textbox.bind(text = lambda inst, val: self.update(val))
+        # typing only restarts the timer, the list is searched once the user stops typing
+        self.search_trigger = Clock.create_trigger(
+            lambda dt: self.update(self.search_textbox.text), SEARCH_DELAY)
+        self.search_textbox.bind(text=self.search_changed)
 
-        # add everything in the main layout
-        self.main_layout.add_widget(self.scrollview) # add an empty scrollview in the layout
-                     # first so that it doesn't raise an exception when we call `main_layout.remove_widget`
-
-        self.add_widget(self.main_layout)
+    """
+    `SingleList.search_changed(instance: TextInput, text: str)`
+    Called for every keystroke in the search textbox
+    """
+    def search_changed(self, instance: TextInput, text: str):
+        self.search_trigger.cancel()
+        self.search_trigger()
 
     """
     `SingleList.update(prefix: str = '')`
 
-    Button Bindings:
-    view meaning: self.go_to_list
+    Row Bindings (`WordRow` in the kv):
+    view meaning: self.go_to_word
     delete word: self.delete_word
 
-    1. Resets the entire ScrollView
-    2. Matches all words with the prefix given
-    3. Adds 2 buttons into the GirdLayout in the ScrollView, one for the word
-        (which goes to a modal view) and a delete button (which deletes the word)
+    1. Gets the words matching the prefix given from the search index (sorted)
+    2. Gives the RecycleView one dict per word, the rows (a word button which goes to a modal view
+        and a delete button which deletes the word) are created and reused while scrolling
     """
     def update(self, prefix: str = ''):
-        # re-initialize everything
-        self.main_layout.remove_widget(self.scrollview)
-
-        self.scrollview = ScrollView(pos_hint={"x": 0.08, "top": 0.8}, size_hint=(0.84, 0.63))
+        # words in this word list that start with the prefix
+        self.words = vocabulary.search_index.search(self.word_list, prefix)
 
-        scrollview_layout = GridLayout(size_hint_y=None, size_hint_x=1, cols=2, 
-            row_force_default=True, row_default_height=100)
-        scrollview_layout.bind(minimum_height=scrollview_layout.setter('height'))
-
-        # list of words in this word list
-        self.words = word_lists[self.word_list]
-
-        for word in self.words:
-            # make sure prefix of both string matches 
-            if word[: len(prefix)] != prefix: continue
-
-            # no need to add another layout here, just set `cols=2` for the GridLayout
-
-            # word button, triggers modal view
-            word_btn = Button(text=word, pos_hint={"x": 0, "bottom": 1}, size_hint=(0.8, 1),
-                background_normal="images/single_list/word.jpg", color=(0, 0, 0, 1))
-            word_btn.bind(on_press=self.go_to_word)
-
-            # delete button, triggers word deletion
-            delete_btn = Button(pos_hint={"x": 0.78, "bottom": 1}, size_hint=(0.2, 1), 
-                background_normal="images/single_list/delete.jpg")
-            delete_btn.bind(on_press=self.delete_word)
-
-            scrollview_layout.add_widget(word_btn)
-            scrollview_layout.add_widget(delete_btn)
-        
-        self.scrollview.add_widget(scrollview_layout)
-        self.main_layout.add_widget(self.scrollview)
+        self.word_rv.data = [{'word': word} for word in self.words]
 
     """
     `SingleList.set_active(btn: Button)`
@@ -937,32 +884,22 @@ class SingleList(Screen):
     def set_active(self, btn: Button):
         print("New word list: {}".format(self.word_list))
         self.manager.get_screen('main_screen').list_to_practice = self.word_list
+        store.set_user('list', self.word_list)
 
     """
-    `SingleList.delete_word()`
-    Called when a delete button is called
+    `SingleList.delete_word(word: str)`
+    Called when a delete button is called, the row knows which word it shows
     
-    1. Finds the index of the delete button in the gridlayout, and figures out the index of the 
-        word button. 
-    2. Removes word info from word_lists and js file
-    3. Call self.update(original prefix)
+    1. Removes the word from the store
+    2. Call self.update(original prefix)
     """
-    def delete_word(self, delete_btn: Button):
-        # the index of the 'x' button in the children list 
-        # this is soooooo messy, might need to clean this up
-
-        pos = self.scrollview.children[0].children.index(delete_btn) # help!
-        word_btn = self.scrollview.children[0].children[pos + 1]
-        # removes the corresponding word button
-        self.scrollview.children[0].remove_widget(word_btn)
-
-        # remove word from word lists
-        word_lists[self.word_list].remove(word_btn.text)
-        if len(word_lists[self.word_list]) == 0:
-            word_lists.pop(self.word_list)
+    def delete_word(self, word: str):
+        if store.read_only(word):
+            notifications.show("Library words can't\nbe deleted")
+            return
 
-        # remove from js file
-        js['WordList'].pop(word_btn.text)
+        # remove the word from the store and every index
+        vocabulary.delete_word(word)
 
         # call update since word list changed
         self.update(self.search_textbox.text)
@@ -972,69 +909,53 @@ class SingleList(Screen):
     Called when word button is pressed, opens modal view
     """
     def go_to_word(self, btn: Button):
-        modal = WordModalView(btn.text, pos_hint={"x": 0.1, "bottom": 0.1}, size_hint=(0.8, 0.8))
-        modal.open()
+        modals.open('word', btn.text)
 
 class WordModalView(ModalView):
-    main_layout = FloatLayout()
+    main_layout = ObjectProperty(None)
+    word_label = ObjectProperty(None)
 
     """
-    `self.WordModalView.__init__`
+    `WordModalView.__init__(**kwargs)`
+    Built once by the modal pool, `refresh` shows a word
 
-    1. Adds meanings to a scrollview, the rest is in the kv
+    1. Adds the scrollview for the meanings, the rest is in the kv
+    2. Builds the modal that edits a meaning
     """
-    def __init__(self, word: str, **kwargs):
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.word = word # save it as instance variable 
-        self.word_label.text = word
+        self.word = None
 
         scrollview = ScrollView(pos_hint={"x": 0.05, "top": 0.75}, size_hint=(0.9, 0.7), do_scroll=True)
 
-        scrollview_layout = GridLayout(size_hint_y=None, size_hint_x=1, cols=1, 
+        self.scrollview_layout = GridLayout(size_hint_y=None, size_hint_x=1, cols=1, 
             spacing=50)
-        scrollview_layout.bind(minimum_height=scrollview_layout.setter('height'))
+        self.scrollview_layout.bind(minimum_height=self.scrollview_layout.setter('height'))
 
-        # the 3 meaning labels
-        meanings = js['WordList'][word][0] # list of meanings
+        # the meaning buttons of the current word, and all buttons built so far
         self.btn_list = list()
+        self.btn_pool = list()
 
-        for i in range(len(meanings)):
-            btn = WrappedButton(text=meanings[i], font_size=30, padding=(20, 20),
-                color=(0, 0, 0, 1), background_normal="images/meaning_label.jpg")
-            btn.size_hint_y = None
-            btn.padding_x = 50
-
-            btn.bind(on_press=self.edit)
-            self.btn_list.append(btn)
-            scrollview_layout.add_widget(btn)
-
-        scrollview.add_widget(scrollview_layout)
+        scrollview.add_widget(self.scrollview_layout)
         self.main_layout.add_widget(scrollview)
 
-    """
-    `WordModalView.edit`
-    Called when a meaning is pressed
-    
-    1. Creates another modalview that lets user enter the new meaning
-    2. Changes meaning in the hs file
-    """
-    def edit(self, btn: Button):
         # modal view that contains a textinput and a confirm button 
         self.modal = ModalView(pos_hint={"center_x": 0.5, "center_y": 0.5}, size_hint=(0.8, 0.8))
-        self.modal.background = "images/modal_background.jpg"
+        self.modal.background = res("images/modal_background.jpg")
 
         # main layout for the modal view
         layout = FloatLayout()
 
         # text input for the user to enter
         self.modal_txtinpt = TextInput(pos_hint={"x": 0.1, "top": 0.8}, size_hint=(0.8, 0.4), 
-            text=btn.text, background_color=(137/255, 166/255, 215/255))
+            background_color=(137/255, 166/255, 215/255))
 
-        # confirm button
+        # confirm button, changes the meaning that is edited
+        self.edited_btn = None
         self.modal_confirm_btn = Button(pos_hint={"center_x": 0.5, "top": 0.3}, size_hint=(0.6, 0.1),
-            background_normal = "images/word_modal_view/confirm.jpg")
+            background_normal = res("images/word_modal_view/confirm.jpg"))
 
-        self.modal_confirm_btn.bind(on_press = lambda x: self.process(btn))
+        self.modal_confirm_btn.bind(on_press = lambda x: self.process(self.edited_btn))
 
         # put stuff into the main layout
         layout.add_widget(self.modal_txtinpt)
@@ -1050,6 +971,51 @@ class WordModalView(ModalView):
         # When the modal is dismissed, call self.save_new_defs
         self.modal.bind(on_dismiss=self.save_new_defs)
 
+    """
+    `WordModalView.refresh(word: str)`
+    Called by the modal pool before the modal opens
+
+    1. Shows the word
+    2. Shows its meanings, reusing the buttons of earlier words
+    """
+    def refresh(self, word: str):
+        self.word = word
+        self.word_label.text = word
+
+        meanings = store.meanings(word) # list of meanings
+        self.btn_list.clear()
+        self.scrollview_layout.clear_widgets()
+
+        for i in range(len(meanings)):
+            if i == len(self.btn_pool):
+                btn = WrappedButton(font_size=30, padding=(20, 20),
+                    color=(0, 0, 0, 1), background_normal=res("images/meaning_label.jpg"))
+                btn.size_hint_y = None
+                btn.padding_x = 50
+
+                btn.bind(on_press=self.edit)
+                self.btn_pool.append(btn)
+
+            btn = self.btn_pool[i]
+            btn.text = meanings[i]
+            self.btn_list.append(btn)
+            self.scrollview_layout.add_widget(btn)
+
+    """
+    `WordModalView.edit`
+    Called when a meaning is pressed
+    
+    1. Opens the modal that lets user enter the new meaning
+    2. Changes meaning in the store once it is dismissed
+    """
+    def edit(self, btn: Button):
+        if store.read_only(self.word):
+            notifications.show("Library words can't\nbe changed")
+            return
+
+        self.edited_btn = btn
+        self.modal_txtinpt.text = btn.text
+
         # open the modal view
         self.modal.open()
 
@@ -1068,11 +1034,10 @@ class WordModalView(ModalView):
     `WordModalView.save_new_defs(btn: Button)`
     Binded to on_dismiss of the modal
 
-    1. Saves the text to the js file
+    1. Saves the text to the store
     """
     def save_new_defs(self, modal: ModalView):
-        for i in range(len(self.btn_list)):
-            js['WordList'][self.word][0][i] = self.btn_list[i].text
+        vocabulary.set_meanings(self.word, [btn.text for btn in self.btn_list])
 
 class Dictionary(Screen):
     search_textbox = ObjectProperty(None)
@@ -1080,6 +1045,9 @@ class Dictionary(Screen):
     target_word = ObjectProperty(None)
     word_missing = ObjectProperty(None)
 
+    # when it is down, the search text is looked up in the meanings
+    meaning_toggle = ObjectProperty(None)
+
     meaning_labels = list()
     # meaning layout
     meanings_layout = ObjectProperty(None)
@@ -1107,8 +1075,11 @@ class Dictionary(Screen):
     Called whenever the user presses the search button
     1. Resets labels, textbox, etc.
     2. Returns if searched string is empty
-    3. If word missing, set `self.word_missing` text to visible
-    4. Otherwise, set the meaning labels to visible
+    3. If searching by meaning, show the words with that meaning as buttons
+    4. If the word only differs by case/accents from one word, show that one
+    5. If word missing, show the closest words as buttons, or set `self.word_missing` text to
+        visible if there are none
+    6. Otherwise, set the meaning labels to visible
     """
     def show(self):
         # word that the user inputted
@@ -1121,16 +1092,37 @@ class Dictionary(Screen):
 
         word = text_input.strip()
 
-        # find the word in the js file, get(word) == None is when the word doesn't exist
-        if js['WordList'].get(word) == None:
-            self.word_missing.text = "Word missing :("
+        if self.meaning_toggle.state == 'down':
+            results = vocabulary.meaning_index.search(word)
+            if len(results) == 0:
+                self.word_missing.text = "No word found :("
+            else:
+                self.target_word.text = "Words meaning \"{}\"".format(word)
+                self.add_word_buttons([result[0] for result in results])
+            return
+
+        # e.g. 'cafe' finds 'Café'
+        if not store.has_word(word):
+            matches = vocabulary.fuzzy_index.lookup(word)
+            if len(matches) == 1:
+                word = matches[0]
+
+        # find the word in the store
+        if not store.has_word(word):
+            suggestions = vocabulary.fuzzy_index.suggest(word)
+            if len(suggestions) == 0:
+                self.word_missing.text = "Word missing :("
+                return
+
+            self.target_word.text = "Did you mean..."
+            self.add_word_buttons(suggestions)
         else:
             self.target_word.text = word
-            meanings = js['WordList'][word][0] # list of meanings
+            meanings = store.meanings(word) # list of meanings
             for i in range(len(meanings)):
                 # Actually a button since label doesn't have background_normal
                 lbl = WrappedButton(text=meanings[i], font_size=30, padding=(20, 20), 
-                    disabled_color=(0, 0, 0, 1), background_disabled_normal="images/meaning_label.jpg")
+                    disabled_color=(0, 0, 0, 1), background_disabled_normal=res("images/meaning_label.jpg"))
                 lbl.disabled = True
                 lbl.size_hint_y = None
                 lbl.padding_x = 50
@@ -1138,18 +1130,124 @@ class Dictionary(Screen):
                 self.meaning_labels.append(lbl)
                 self.meanings_layout.add_widget(lbl)
 
-# add screens
-screen_manager.add_widget(Main(name="main_screen"))
-screen_manager.add_widget(AddWords(name="add_words"))
-screen_manager.add_widget(WordsList(name="words_list"))
-screen_manager.add_widget(SingleList(name='single_list'))
-screen_manager.add_widget(Dictionary(name="dictionary"))
+    """
+    `Dictionary.add_word_buttons(words: list)`
+    Called for suggestions and results of a search by meaning
+
+    1. Adds a button for every word in the meaning layout, binded to `self.show_suggestion`
+    """
+    def add_word_buttons(self, words: list):
+        for word in words:
+            btn = WrappedButton(text=word, font_size=30, padding=(20, 20),
+                color=(0, 0, 0, 1), background_normal=res("images/meaning_label.jpg"))
+            btn.size_hint_y = None
+            btn.padding_x = 50
+            btn.bind(on_press=self.show_suggestion)
+
+            self.meaning_labels.append(btn)
+            self.meanings_layout.add_widget(btn)
+
+    """
+    `Dictionary.show_suggestion(btn: Button)`
+    Called when one of the suggested words is pressed
+
+    1. Switches back to searching words and searches for that word
+    """
+    def show_suggestion(self, btn: Button):
+        self.meaning_toggle.state = 'normal'
+        self.search_textbox.text = btn.text
+        self.show()
+
+# add screens, they are built when they are first shown (only the main screen at start)
+screen_manager.register('main_screen', Main, 'kv/main.kv')
+screen_manager.register('add_words', AddWords, 'kv/add_words.kv')
+screen_manager.register('words_list', WordsList, 'kv/words_list.kv')
+screen_manager.register('single_list', SingleList, 'kv/single_list.kv')
+screen_manager.register('dictionary', Dictionary, 'kv/dictionary.kv')
 
 class Notice(ModalView):
-    screen = screen_manager.get_screen('add_words')
+    # the text that is shown
+    message = StringProperty('')
+
+    # touches go through to the screen, the notice never blocks the app
+    def on_touch_down(self, touch):
+        return False
+
+    def on_touch_move(self, touch):
+        return False
+
+    def on_touch_up(self, touch):
+        return False
+
+class NotificationQueue:
+    """
+    `NotificationQueue.__init__()`
+    Shows messages one after the other in a single `Notice`, everything is scheduled on the Clock
+    queue: [message, count] waiting to be shown
+    current: [message, count] that is shown, None when the notice is closed
+    """
+    def __init__(self):
+        self.notice = None
+        self.queue = []
+        self.current = None
+        self.hide_event = None
+
+    """
+    `NotificationQueue.show(message: str)`
+
+    1. If the message is the one shown (or the last one waiting), counts it instead of queueing it
+        again, a message that is shown again stays longer
+    2. Otherwise queues it, it's shown right away if nothing else is
+    """
+    def show(self, message: str):
+        if self.current is not None and self.current[0] == message and len(self.queue) == 0:
+            self.current[1] += 1
+            self._show_current()
+        elif len(self.queue) > 0 and self.queue[-1][0] == message:
+            self.queue[-1][1] += 1
+        else:
+            self.queue.append([message, 1])
+            if self.current is None:
+                self._next()
+
+    def _next(self):
+        self.current = self.queue.pop(0)
+        if self.notice is None:
+            self.notice = Notice(opacity=0)
+        if self.notice.parent is None:
+            self.notice.open(animation=False)
+        self._show_current()
+
+    # fades the current message in and schedules its fade out
+    def _show_current(self):
+        message, count = self.current
+        self.notice.message = message if count == 1 else "{} (x{})".format(message, count)
+
+        Animation.cancel_all(self.notice, 'opacity')
+        Animation(opacity=1, d=NOTICE_FADE).start(self.notice)
+
+        if self.hide_event is not None:
+            self.hide_event.cancel()
+        self.hide_event = Clock.schedule_once(self._hide, NOTICE_FADE + NOTICE_DURATION)
+
+    def _hide(self, dt):
+        self.hide_event = None
+        fade = Animation(opacity=0, d=NOTICE_FADE)
+        fade.bind(on_complete=self._hidden)
+        fade.start(self.notice)
+
+    # the notice stays open if another message is waiting
+    def _hidden(self, animation, notice):
+        if len(self.queue) > 0:
+            self._next()
+        else:
+            self.current = None
+            self.notice.dismiss(animation=False)
+
+notifications = NotificationQueue()
 
 class UserProfile(ModalView):
-    main_layout = FloatLayout()
+    main_layout = ObjectProperty(None)
     cpb = ObjectProperty(None)
     learned = ObjectProperty(None)
     familiar = ObjectProperty(None)
@@ -1157,173 +1255,121 @@ class UserProfile(ModalView):
     done = ObjectProperty(None)
     goal = ObjectProperty(None)
     username = ObjectProperty(None)
-    scrollview_layout = ObjectProperty(None)
 
-    """
-    `UserProfile.__init__(**kwargs)`
+    # stats of every word list, rows are `ListStatsRow` in the kv
+    list_rv = ObjectProperty(None)
 
-    1. Creates the scrollview that includes stats of every word list
     """
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        self.cpb.value += 1 # buggy code...
-        self.cpb.value -= 1
+    `UserProfile.refresh()`
+    Called by the modal pool before the modal opens
 
-        update_word_lists()
-    
-        for word_list in word_lists:
-            # get the stats from the json file
-            total_answered = 0
-            answered_correct = 0
-            for word in word_lists[word_list]:
-                answered_correct += js['WordList'][word][1]
-                total_answered += js['WordList'][word][2]
-
-            layout = FloatLayout(size_hint_y=None, height=132.5)
-
-            # the button for background, covers the entire screen
-            btn = Button(pos_hint={"x": 0, "top": 1}, size_hint=(1, 1), disabled=True,
-                background_disabled_normal="images/user_profile/word_list_info.jpg")
-            layout.add_widget(btn)
-            
-            # name of the word list
-            lbl = Label(pos_hint={"x": 0.089, "top": 0.762}, size_hint=(0.58, 0.24), 
-                text=word_list, font_size=25, color=(0, 0, 0, 1), halign='left')
-            lbl.bind(size=lbl.setter('text_size'))
-
-            layout.add_widget(lbl)
+    1. Shows the stats of every word list, the recycleview only builds the visible rows
+    2. Updates everything else
+    """
+    def refresh(self):
+        data = []
+        for word_list in store.lists():
+            # get the stats from the counters, no need to look at the words
+            list_mastery = vocabulary.mastery.of(word_list)
+            answered_correct, total_answered = list_mastery.correct, list_mastery.total
 
             # avoid division by 0
             if total_answered == 0: correct_p = 0
             else: correct_p = answered_correct / total_answered
 
-            # progress bar made by buttons
-            btn_left = Button(pos_hint={"x": 0.089, "top": 0.438}, 
-                disabled=True, size_hint=(0.55 * correct_p, 0.08), 
-                    background_disabled_normal="images/user_profile/dark_blue.jpg")
-            btn_right = Button(pos_hint={"x": 0.089 + 0.55 * correct_p, "top": 0.438}, 
-                disabled=True, size_hint=(0.55 * (1 - correct_p), 0.08), 
-                    background_disabled_normal="images/user_profile/light_blue.jpg")
-
-            # weird things happen when correct_p = 0 (the button still gets shown)
-            if correct_p > 0:
-                layout.add_widget(btn_left)
-            layout.add_widget(btn_right)
-
-            # Correct percentage
-            lbl = Label(pos_hint={"x": 0.73, "top": 0.59}, size_hint=(0.15, 0.21), 
-                text=str(round(correct_p * 100)) + "%", color=(0, 0, 0, 1), font_size=25)
-
-            layout.add_widget(lbl)
-
-            self.scrollview_layout.add_widget(layout)
+            data.append({'word_list': word_list, 'correct_p': correct_p})
+        self.list_rv.data = data
 
+        self.update()
 
     """
     `UserProfile.update()`
-    Called when the modal is initialized. Called by the username label in the kv.
+    Called every time the modal opens
 
-    1. Creates learned (list), familiar (list), and to_learn (list)
+    1. Gets the number of learned, familiar and to learn words from the counters
     2. Sets up the CPB of done/goal
     """
-    # this will be called by the username label, but it will update everything
     def update(self):
-        learned = []
-        familiar = []
-        to_learn = []
+        buckets = vocabulary.mastery.buckets()
 
-        for word in js['WordList']:
-            # avoid division by 0
-            correct_percentage = 0 if js['WordList'][word][2] == 0 \
-                else js['WordList'][word][1] / js['WordList'][word][2]
+        self.username.text = store.get_user('name')
 
-            if correct_percentage > LEARNED_THRESHOLD:
-                learned.append(word)
-            elif correct_percentage > FAMILIAR_THRESHOLD:
-                familiar.append(word)
-            else:
-                to_learn.append(word)
-        
-        self.learned.text = str(len(learned))
-        self.familiar.text = str(len(familiar))
-        self.to_learn.text = str(len(to_learn))
+        self.learned.text = str(buckets[LEARNED])
+        self.familiar.text = str(buckets[FAMILIAR])
+        self.to_learn.text = str(buckets[TO_LEARN])
 
         # only count correct answers, since if we count incorrect ones 
         # a question can produce 4 tries
-        total_answered = total_question_answered_correct
-
-        for login in js['Login info']['all logins']:
-            timelist = time.localtime()[:4]
-            login_time = login[0]
-
-            # if the login is within one day
-            if login_time[2] == timelist[2] and login_time[1] == timelist[1] and login_time[0] == timelist[0]:
-                # login[2] is the total number of questions answered
-                total_answered += login[1]
+        total_answered = vocabulary.activity.today()[0]
 
         self.done.text = str(total_answered)
-        self.goal.text = str(js['User']['goal'])
+        self.goal.text = str(store.get_user('goal'))
 
-        self.cpb.max = max(1, js['User']['goal'])
+        self.cpb.max = max(1, store.get_user('goal'))
         self.cpb.value = total_answered
-
-        # remember this is called by the username label so return the text
-        return js['User']['name']
         
 class Settings(ModalView):
-    main_screen = screen_manager.get_screen('main_screen')
-    main_layout = FloatLayout()
+    main_layout = ObjectProperty(None)
     """
     `Settings.__init__(**kwargs)`
-    Creates all the GUI, no kv
+    Creates all the GUI, no kv. Built once by the modal pool, `refresh` shows the current settings
 
     """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
         # Username button
-        username = Button(text=js['User']['name'], font_size=40, color=(0, 0, 0, 1),
+        self.username = Button(font_size=40, color=(0, 0, 0, 1),
             pos_hint={"x": 0.05, "top": 0.9}, size_hint=(0.9, 0.1), background_color=(0, 0, 0, 0))
-        username.bind(on_press=self.edit)
+        self.username.bind(on_press=self.edit)
 
-        self.main_layout.add_widget(username)
+        self.main_layout.add_widget(self.username)
 
 
         # light/dark mode
-        light_mode = ToggleButton(text='Light', group='mode', background_color=(92/255, 103/255, 204/255, 0.5),
+        self.light_mode = ToggleButton(text='Light', group='mode', background_color=(92/255, 103/255, 204/255, 0.5),
             pos_hint={"x": 0.3, "top": 0.75}, size_hint=(0.2, 0.05))
-        light_mode.bind(on_press=self.change_mode)
+        self.light_mode.bind(on_press=self.change_mode)
 
-        dark_mode = ToggleButton(text='Dark', group='mode', background_color=(92/255, 103/255, 204/255, 0.5),
+        self.dark_mode = ToggleButton(text='Dark', group='mode', background_color=(92/255, 103/255, 204/255, 0.5),
             pos_hint={"x": 0.5, "top": 0.75}, size_hint=(0.2, 0.05), color=(0, 0, 0, 1))
-        dark_mode.bind(on_press=self.change_mode)
+        self.dark_mode.bind(on_press=self.change_mode)
 
-        if js['User']['mode'] == 'light':
-            light_mode.state = "down"
-        else:
-            dark_mode.state = "down"
+        self.main_layout.add_widget(self.light_mode)
+        self.main_layout.add_widget(self.dark_mode)
+
+        # practice every word / only the words that are due for review
+        self.all_words = ToggleButton(text='All words', group='review', background_color=(92/255, 103/255, 204/255, 0.5),
+            pos_hint={"x": 0.25, "top": 0.5}, size_hint=(0.25, 0.05))
+        self.all_words.bind(on_press=self.change_review_mode)
+
+        self.due_only = ToggleButton(text='Due only', group='review', background_color=(92/255, 103/255, 204/255, 0.5),
+            pos_hint={"x": 0.5, "top": 0.5}, size_hint=(0.25, 0.05), color=(0, 0, 0, 1))
+        self.due_only.bind(on_press=self.change_review_mode)
 
-        self.main_layout.add_widget(light_mode)
-        self.main_layout.add_widget(dark_mode)
+        self.main_layout.add_widget(self.all_words)
+        self.main_layout.add_widget(self.due_only)
         
 
         # daily goal
-        daily_goal = Button(text="Daily goal: {}".format(js['User']['goal']), halign='left', color=(0, 0, 0, 1), font_size=35,
+        self.daily_goal = Button(halign='left', color=(0, 0, 0, 1), font_size=35,
             valign='middle', pos_hint={"x": 0.05, "top": 0.65}, size_hint=(0.9, 0.1), background_color=(0, 0, 0, 0))
-        daily_goal.bind(size=daily_goal.setter('text_size'))    
-        daily_goal.halign='center'
-        daily_goal.bind(on_press=self.edit)
+        self.daily_goal.bind(size=self.daily_goal.setter('text_size'))    
+        self.daily_goal.halign='center'
+        self.daily_goal.bind(on_press=self.edit)
 
-        self.main_layout.add_widget(daily_goal)
+        self.main_layout.add_widget(self.daily_goal)
 
-    """
-    `Settings.edit(btn: Button)`
-    Called when the user presses one of the buttons
+        # switch to another profile or create one
+        self.profile_btn = Button(text='Switch profile', color=(0, 0, 0, 1), font_size=30,
+            pos_hint={"x": 0.05, "top": 0.38}, size_hint=(0.9, 0.08), background_color=(0, 0, 0, 0))
+        self.profile_btn.bind(on_press=self.open_profiles)
+
+        self.main_layout.add_widget(self.profile_btn)
+
+        self.profile_dropdown = DropDown()
+        self.profile_dropdown.bind(on_select=self.profile_selected)
 
-    1. Creates a modal for the user to enter new infos (same with the WordModalView)
-    """
-    def edit(self, btn: Button):
         # modal view that contains a textinput and a confirm button 
         self.modal = ModalView(pos_hint={"center_x": 0.5, "center_y": 0.5}, size_hint=(0.8, 0.8))
         self.modal.background = "word_list_modal.jpg"
@@ -1333,13 +1379,14 @@ class Settings(ModalView):
 
         # text input for the user to enter
         self.modal_txtinpt = TextInput(pos_hint={"x": 0.1, "top": 0.8}, size_hint=(0.8, 0.4), 
-            text=btn.text, background_color=(137/255, 166/255, 215/255))
+            background_color=(137/255, 166/255, 215/255))
 
-        # confirm button
+        # confirm button, changes the setting that is edited
+        self.edited_btn = None
         self.modal_confirm_btn = Button(pos_hint={"center_x": 0.5, "top": 0.3}, size_hint=(0.6, 0.1),
             background_normal = "confirm_change_meaning.jpg")
 
-        self.modal_confirm_btn.bind(on_press = lambda x: self.process(btn))
+        self.modal_confirm_btn.bind(on_press = lambda x: self.process(self.edited_btn))
 
         # put stuff into the main layout
         layout.add_widget(self.modal_txtinpt)
@@ -1353,6 +1400,37 @@ class Settings(ModalView):
 
         self.modal.add_widget(layout)
 
+    """
+    `Settings.refresh()`
+    Called by the modal pool before the modal opens
+
+    1. Shows the user name and the daily goal
+    2. Puts the toggle buttons in the state of the current settings
+    """
+    def refresh(self):
+        self.username.text = store.get_user('name')
+        self.daily_goal.text = "Daily goal: {}".format(store.get_user('goal'))
+
+        if store.get_user('mode') == 'light':
+            self.light_mode.state, self.dark_mode.state = "down", "normal"
+        else:
+            self.light_mode.state, self.dark_mode.state = "normal", "down"
+
+        if store.get_user('due only', False):
+            self.all_words.state, self.due_only.state = "normal", "down"
+        else:
+            self.all_words.state, self.due_only.state = "down", "normal"
+
+    """
+    `Settings.edit(btn: Button)`
+    Called when the user presses one of the buttons
+
+    1. Opens the modal for the user to enter new infos (same with the WordModalView)
+    """
+    def edit(self, btn: Button):
+        self.edited_btn = btn
+        self.modal_txtinpt.text = btn.text
+
         # open the modal view
         self.modal.open()
 
@@ -1363,8 +1441,16 @@ class Settings(ModalView):
     1. Changes information based on which button is pressed
     """
     def process(self, btn: Button):
+        # create a profile and switch to it
+        if btn is self.profile_btn:
+            name = self.modal_txtinpt.text.strip()
+            if len(name) != 0:
+                profile_id = profiles.create(name)
+                self.modal.dismiss()
+                self.dismiss()
+                App.get_running_app().switch_profile(profile_id)
         # change daily goal
-        if btn.text[:12] == 'Daily goal: ':
+        elif btn.text[:12] == 'Daily goal: ':
             str_to_check = self.modal_txtinpt.text.strip()
             if self.modal_txtinpt.text[:12] == 'Daily goal: ':
                 str_to_check = self.modal_txtinpt.text[12:].strip()
@@ -1376,74 +1462,176 @@ class Settings(ModalView):
             finally:
                 goal = int(str_to_check)
                 if goal > 0:
-                    js['User']['goal'] = goal
+                    store.set_user('goal', goal)
                     btn.text = btn.text[: 12] + str(goal)
                     self.modal.dismiss()
         # change username
         else:
             name = self.modal_txtinpt.text.strip()
             if len(name) != 0:
-                js['User']['name'] = name
+                store.set_user('name', name)
                 btn.text = name
                 self.modal.dismiss()
 
+    """
+    `Settings.open_profiles(btn: Button)`
+    Called when the profile button is pressed
+
+    1. Fills the dropdown with every profile and a button to create one
+    """
+    def open_profiles(self, btn: Button):
+        self.profile_dropdown.clear_widgets()
+
+        for profile_id, name in profiles.names().items():
+            profile = Button(text=name or "Profile {}".format(profile_id), height=60, size_hint_y=None,
+                color=(0, 0, 0, 1), disabled=profile_id == profiles.active)
+            profile.bind(on_press=lambda x, profile_id=profile_id: self.profile_dropdown.select(profile_id))
+            self.profile_dropdown.add_widget(profile)
+
+        new_profile = Button(text="New profile", height=60, size_hint_y=None, color=(0, 0, 0, 1))
+        new_profile.bind(on_press=lambda x: self.profile_dropdown.select(None))
+        self.profile_dropdown.add_widget(new_profile)
+
+        self.profile_dropdown.open(btn)
+
+    """
+    `Settings.profile_selected(dropdown: DropDown, profile_id: str)`
+    Called when something is chosen in the profile dropdown
+
+    1. None is the new profile button, asks for the name of the new profile
+    2. Otherwise closes the settings and switches to the profile
+    """
+    def profile_selected(self, dropdown: DropDown, profile_id: str):
+        if profile_id is None:
+            self.edited_btn = self.profile_btn
+            self.modal_txtinpt.text = ''
+            self.modal.open()
+            return
+
+        self.dismiss()
+        App.get_running_app().switch_profile(profile_id)
+
     """
     `Settings.change_mode`
     Called when the toggle button (light/dark mode) is pressed, currently not doing anything
     """
     def change_mode(self, btn: Button):
         print("Current Mode:", btn.text)
-        js['User']['mode'] = btn.text.lower()
+        store.set_user('mode', btn.text.lower())
+
+    """
+    `Settings.change_review_mode`
+    Called when the toggle button (all words/due only) is pressed
+    """
+    def change_review_mode(self, btn: Button):
+        store.set_user('due only', btn.text == 'Due only')
+
+# add modals, each one is built once and reused every time it is opened
+modals.register('word', WordModalView, pos_hint={"x": 0.1, "bottom": 0.1}, size_hint=(0.8, 0.8))
+modals.register('user_profile', UserProfile, pos_hint={"center_x": 0.5, "center_y": 0.5}, size_hint=(0.8, 0.8))
+modals.register('settings', Settings, pos_hint={"center_x": 0.5, "center_y": 0.5}, size_hint=(0.8, 0.8))
 
 class Vocabulary_LearnerApp(App):
     def build(self):
+        # the only screen that is built right away
+        screen_manager.get_screen('main_screen')
         return screen_manager
 
+    """
+    `Vocabulary_LearnerApp.on_start()`
+
+    1. Shows the main screen in its loading state
+    2. Loads the vocabulary in another thread, so the window doesn't freeze on a big file
+    """
     def on_start(self):
         Window.size = (1125 / 4, 2436 / 4)
 
-        generate_word_lists()
+        # switch to Main Screen, call update()
+        screen_manager.get_screen('main_screen').update()
+        screen_manager.current = 'main_screen'
+
+        threading.Thread(target=self.load, daemon=True).start()
 
-        # current word list to practice
-        current_list = js['User']['list']
-        # users can delete an active list, so now the list either exists or is an empty str
-        if len(word_lists[current_list]) == 0:
-            js['User']['list'] = ''
-        screen_manager.get_screen('main_screen').list_to_practice = js['User']['list']
+        # textures of the other screens, one image per frame while the words load
+        preload()
 
-        # remove logins past 1 week
+    # runs in the loading thread, the ui is only touched from the main thread
+    def load(self, profile_id: str = None):
+        try:
+            # the active profile if None, the one that was open is saved and closed first
+            loaded = profiles.open(profile_id)
 
-        all_logins = js['Login info']['all logins'] # a list of all logins
-        # all_logins is a reference
+            # the indexes of the current list, so the first question doesn't have to build them
+            loaded.preload(loaded.store.get_user('list'))
+        except Exception as error:
+            # raised in the main thread, so it doesn't get lost with this one
+            Clock.schedule_once(lambda dt, error=error: self.load_failed(error))
+            return
 
-        # year, month, day, hour
-        timelist = time.localtime()[:4]
+        Clock.schedule_once(lambda dt: self.loaded(loaded))
 
-        # early logins appears first
-        while len(all_logins) > 0:
-            if all_logins[0][0][2] < timelist[2] - 7 \
-                or all_logins[0][0][1] != timelist[1] or all_logins[0][0][0] != timelist[0]:
-                all_logins.pop(0)
-            else: 
-                break
+    def load_failed(self, error: Exception):
+        raise error
 
-        # switch to Main Screen, call update()
+    """
+    `Vocabulary_LearnerApp.loaded(loaded: Vocabulary)`
+    Called in the main thread once the vocabulary is loaded
+
+    1. Hands the vocabulary to the screens
+    2. Fills in the main screen
+    """
+    def loaded(self, loaded: Vocabulary):
+        global vocabulary, store
+        vocabulary, store = loaded, loaded.store
+
+        # users can delete an active list, so the current list is forgotten if it is empty,
+        # and old days are rolled up into months
+        vocabulary.start()
+        screen_manager.get_screen('main_screen').list_to_practice = store.get_user('list')
         screen_manager.get_screen('main_screen').update()
+
+        # e.g. fold the journal back into the json file once in a while
+        self.maintain_event = Clock.schedule_interval(lambda dt: vocabulary.maintain(), MAINTAIN_INTERVAL)
+
+        # so the first opening of a modal doesn't have to build it
+        modals.warm()
+
+        # and the first search of the dictionary doesn't have to build its indexes
+        loaded.run_in_background(loaded.warm)
+
+    """
+    `Vocabulary_LearnerApp.switch_profile(profile_id: str)`
+    Called from the settings
+
+    1. Remembers the current list of the profile and shows the main screen in its loading state
+    2. Opens the other profile in the loading thread, `loaded` takes over from there
+    """
+    def switch_profile(self, profile_id: str):
+        global vocabulary, store
+        if vocabulary is None or profile_id == profiles.active:
+            return
+
+        main_screen = screen_manager.get_screen('main_screen')
+        store.set_user('list', main_screen.list_to_practice)
+        self.maintain_event.cancel()
+
+        # the screens don't touch the old profile anymore, it's closed by the loading thread once
+        # its background threads (index warm up, export) are done, see `Vocabulary.close`
+        vocabulary, store = None, None
+        main_screen.update()
         screen_manager.current = 'main_screen'
 
-    def on_stop(self):
-        timelist = time.localtime()[:4]
+        threading.Thread(target=self.load, args=(profile_id,), daemon=True).start()
 
-        loginfo = [timelist, total_question_answered_correct, total_question_answered]
-        js["Login info"]["last login"] = loginfo
-        js["Login info"]["all logins"].append(loginfo)
+    def on_stop(self):
+        # closed before anything was loaded, so nothing changed
+        if vocabulary is None:
+            return
 
-        js['User']['list'] = screen_manager.get_screen('main_screen').list_to_practice
+        store.set_user('list', screen_manager.get_screen('main_screen').list_to_practice)
 
         # save score
-        file = open('Vocabulary_Words.json', 'w')
-        json.dump(js, file, indent=4)
-        file.close()
+        profiles.close()
         print('Thanks for using my App, bye!')
 
 
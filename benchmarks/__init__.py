@@ -0,0 +1,3 @@
+"""
+Benchmarks of the vocabulary engine, see run.py
+"""
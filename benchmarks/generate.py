@@ -0,0 +1,97 @@
+import json
+import random
+import string
+import argparse
+from datetime import date, timedelta
+
+"""
+Synthetic Vocabulary
+--------------------
+
+Writes a `Vocabulary_Words.json` with any number of words, shaped like a real one:
+    meanings: mostly 1 or 2 per word, a few with up to 5, made of 1 - 4 words each
+    lists: sizes vary from a handful of words to a few hundred
+    stats: about a third of the words were never answered, the others up to 20 times
+    logins: a couple of years of history in the old login format, rolled up into days by the app
+
+The words are written one at a time, so even 1M words don't have to fit in memory twice.
+
+Usage: python -m benchmarks.generate <file> <number of words> [--seed N]
+"""
+
+# (number of meanings, weight)
+MEANING_COUNTS = ((1, 50), (2, 30), (3, 15), (4, 3), (5, 2))
+
+# words meanings are made of
+MEANING_TOKENS = 5000
+
+# days of login history
+HISTORY_DAYS = 730
+
+def _random_word(rng: random.Random, low: int, high: int) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(low, high)))
+
+def _list_sizes(rng: random.Random):
+    # log-normal, so most lists are around 150 words with a long tail
+    while True:
+        yield max(5, int(rng.lognormvariate(5, 0.8)))
+
+"""
+`generate(path: str, word_count: int, seed: int = 0)`
+Writes the vocabulary to `path`, the same seed always gives the same file
+"""
+def generate(path: str, word_count: int, seed: int = 0):
+    rng = random.Random(seed)
+    tokens = [_random_word(rng, 2, 9) for _ in range(MEANING_TOKENS)]
+    counts, weights = zip(*MEANING_COUNTS)
+
+    with open(path, 'w') as file:
+        logins = []
+        day = date.today() - timedelta(days=HISTORY_DAYS)
+        while day < date.today():
+            for _ in range(rng.choice((0, 0, 1, 1, 2, 3))):
+                total = rng.randint(1, 40)
+                logins.append([[day.year, day.month, day.day, rng.randint(7, 22)],
+                    rng.randint(total // 2, total), total])
+            day += timedelta(days=1)
+
+        file.write('{"User": ')
+        json.dump({'name': 'Benchmark', 'goal': 20, 'mode': 'light', 'list': ''}, file)
+        file.write(', "Login info": ')
+        json.dump({'last login': logins[-1] if logins else [], 'all logins': logins}, file)
+        file.write(', "WordList": {')
+
+        seen = set()
+        sizes = _list_sizes(rng)
+        list_number, list_left = 0, 0
+        for i in range(word_count):
+            if list_left == 0:
+                list_number += 1
+                list_left = next(sizes)
+            list_left -= 1
+            word_list = 'List {}'.format(list_number)
+
+            word = _random_word(rng, 4, 12)
+            while word in seen:
+                word = _random_word(rng, 4, 12)
+            seen.add(word)
+
+            meanings = [' '.join(rng.choice(tokens) for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.choices(counts, weights)[0])]
+
+            total = 0 if rng.random() < 0.35 else rng.randint(1, 20)
+            correct = rng.randint(0, total)
+
+            file.write(', ' if i > 0 else '')
+            file.write(json.dumps(word) + ': ' + json.dumps([meanings, correct, total, word_list]))
+
+        file.write('}, "LearnedWords": {}}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write a synthetic vocabulary")
+    parser.add_argument('file')
+    parser.add_argument('words', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate(args.file, args.words, args.seed)
@@ -0,0 +1,257 @@
+import os
+import sys
+import json
+import time
+import random
+import glob
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+from engine import Vocabulary, copy_store, open_store
+from .generate import generate
+
+"""
+Benchmarks
+----------
+
+Times the hot paths of the app on synthetic vocabularies (see generate.py) of every size:
+    load: opening the store and the word lists (what `generate_word_lists` used to do)
+    list bookkeeping: adding and deleting words with all indexes kept up to date
+        (what `update_word_lists` used to do)
+    play valid: checking every list can be played, the first check builds the meaning pools
+    get word: asking questions and answering them, like `Main.get_word` and `Main.check`
+    single list search: typing words letter by letter in the search box of the biggest list
+    user profile: the statistics of every list and the mastery buckets
+    save: writing everything back to the file
+
+Every benchmark runs twice on a fresh copy of the file, once for the wall time and once with
+tracemalloc for the peak memory (tracemalloc slows things down too much to time them together).
+
+The results are saved as json and can be compared to an earlier run:
+    python -m benchmarks.run --output new.json --compare old.json
+"""
+
+SIZES = (1000, 10000, 100000, 1000000)
+
+# words added and deleted by the list bookkeeping benchmark
+BOOKKEEPING_WORDS = 1000
+
+# questions asked by the get word benchmark
+QUESTIONS = 1000
+
+# words typed by the single list search benchmark
+SEARCHES = 50
+
+class Measure:
+    """
+    `Measure.__init__(memory: bool)`
+    Context manager around the part of a benchmark that is measured
+    memory: if the peak memory is traced, otherwise only the time is taken
+    """
+    def __init__(self, memory: bool):
+        self.memory = memory
+        self.seconds = None
+        self.peak = None
+
+    def __enter__(self):
+        if self.memory:
+            tracemalloc.start()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        if self.memory:
+            self.peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+# the biggest list, most benchmarks work on it
+def _biggest_list(vocabulary: Vocabulary) -> str:
+    return max(vocabulary.store.lists(), key=vocabulary.store.list_size)
+
+# ------------------------------- Benchmarks -------------------------------
+
+def bench_load(path: str, measure: Measure):
+    with measure:
+        vocabulary = Vocabulary(path)
+    vocabulary.store.close()
+
+def bench_list_bookkeeping(path: str, measure: Measure):
+    vocabulary = Vocabulary(path)
+    word_list = _biggest_list(vocabulary)
+
+    # the indexes are built already when the user adds words
+    vocabulary.can_play(word_list)
+    vocabulary.next_question(word_list)
+    vocabulary.mastery.buckets()
+    vocabulary.search_index.search(word_list, '')
+
+    words = ['benchmark{}'.format(i) for i in range(BOOKKEEPING_WORDS)]
+    with measure:
+        for i, word in enumerate(words):
+            vocabulary.add_word(word, ['meaning {}'.format(i)], word_list)
+        for word in words:
+            vocabulary.delete_word(word)
+    vocabulary.store.close()
+
+def bench_play_valid(path: str, measure: Measure):
+    vocabulary = Vocabulary(path)
+    with measure:
+        for word_list in vocabulary.store.lists():
+            vocabulary.can_play(word_list)
+    vocabulary.store.close()
+
+def bench_get_word(path: str, measure: Measure):
+    vocabulary = Vocabulary(path)
+    word_list = _biggest_list(vocabulary)
+    rng = random.Random(0)
+    with measure:
+        for _ in range(QUESTIONS):
+            question = vocabulary.next_question(word_list, due_only=False)
+            vocabulary.answer(question, rng.randrange(len(question.choices)))
+    vocabulary.store.close()
+
+def bench_single_list_search(path: str, measure: Measure):
+    vocabulary = Vocabulary(path)
+    word_list = _biggest_list(vocabulary)
+    words = random.Random(0).choices(vocabulary.store.words_in(word_list), k=SEARCHES)
+    with measure:
+        for word in words:
+            for i in range(len(word) + 1):
+                vocabulary.search_index.search(word_list, word[:i])
+    vocabulary.store.close()
+
+def bench_user_profile(path: str, measure: Measure):
+    vocabulary = Vocabulary(path)
+    with measure:
+        for word_list in vocabulary.store.lists():
+            vocabulary.mastery.of(word_list)
+        vocabulary.mastery.buckets()
+        vocabulary.activity.today()
+    vocabulary.store.close()
+
+def bench_save(path: str, measure: Measure):
+    vocabulary = Vocabulary(path)
+    with measure:
+        vocabulary.close()
+
+BENCHMARKS = {
+    'load': bench_load,
+    'list bookkeeping': bench_list_bookkeeping,
+    'play valid': bench_play_valid,
+    'get word': bench_get_word,
+    'single list search': bench_single_list_search,
+    'user profile': bench_user_profile,
+    'save': bench_save,
+}
+
+# ---------------------------------- Runner --------------------------------
+
+"""
+`run(sizes: list, names: list, backend: str, directory: str, memory: bool = True) -> dict`
+
+1. Generates a vocabulary of every size (once, in `directory`)
+2. Runs every benchmark on a fresh copy of it
+3. Returns benchmark -> size -> {'seconds', 'peak'}, peak is in bytes
+"""
+def run(sizes: list, names: list, backend: str, directory: str, memory: bool = True) -> dict:
+    results = {name: {} for name in names}
+    for size in sizes:
+        source = os.path.join(directory, 'vocabulary_{}.json'.format(size))
+        if not os.path.exists(source):
+            generate(source, size)
+
+        if backend == 'sqlite':
+            json_source, source = source, os.path.join(directory, 'vocabulary_{}.db'.format(size))
+            if not os.path.exists(source):
+                json_store, sqlite_store = open_store(json_source), open_store(source)
+                copy_store(json_store, sqlite_store)
+                json_store.close()
+                sqlite_store.close()
+
+        for name in names:
+            result = {}
+            for traced in (False, True) if memory else (False,):
+                path = os.path.join(directory, 'work' + os.path.splitext(source)[1])
+                _remove(path)
+                shutil.copy(source, path)
+
+                measure = Measure(traced)
+                BENCHMARKS[name](path, measure)
+                if traced:
+                    result['peak'] = measure.peak
+                else:
+                    result['seconds'] = measure.seconds
+                _remove(path)
+
+            results[name][str(size)] = result
+            print("{:>20} {:>8} {:>10.4f}s {}".format(name, size, result['seconds'],
+                _megabytes(result.get('peak'))), file=sys.stderr)
+    return results
+
+# removes a store and the files that come with it
+def _remove(path: str):
+    base = os.path.splitext(path)[0]
+    for name in (path, base + '.journal', path + '.tmp', path + '-wal', path + '-shm'):
+        if os.path.exists(name):
+            os.remove(name)
+    # journals of earlier generations, see journal.py
+    for name in glob.glob(glob.escape(base) + '.journal.*'):
+        os.remove(name)
+
+def _megabytes(peak) -> str:
+    return '' if peak is None else '{:.1f} MB'.format(peak / 2 ** 20)
+
+"""
+`compare(old: dict, new: dict)`
+Prints every benchmark that is in both result files with its change in time and memory
+"""
+def compare(old: dict, new: dict):
+    print("{:>20} {:>8} {:>12} {:>12} {:>8} {:>10} {:>10}".format(
+        'benchmark', 'words', 'old', 'new', 'change', 'old peak', 'new peak'))
+    for name, sizes in new['results'].items():
+        for size, result in sizes.items():
+            before = old['results'].get(name, {}).get(size)
+            if before is None:
+                continue
+            change = (result['seconds'] - before['seconds']) / max(before['seconds'], 1e-9)
+            print("{:>20} {:>8} {:>11.4f}s {:>11.4f}s {:>+7.0%} {:>10} {:>10}".format(
+                name, size, before['seconds'], result['seconds'], change,
+                _megabytes(before.get('peak')), _megabytes(result.get('peak'))))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the vocabulary engine")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+        metavar='BENCHMARK', help="benchmarks to run, all by default")
+    parser.add_argument('--backend', choices=('json', 'sqlite'), default='json')
+    parser.add_argument('--no-memory', action='store_true', help="only measure the time")
+    parser.add_argument('--data', help="directory for the generated files (kept between runs), "
+        "a temporary one by default")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="results of an earlier run")
+    args = parser.parse_args()
+
+    if args.data is not None:
+        os.makedirs(args.data, exist_ok=True)
+        results = run(args.sizes, args.only, args.backend, args.data, not args.no_memory)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            results = run(args.sizes, args.only, args.backend, directory, not args.no_memory)
+
+    report = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'backend': args.backend,
+        'results': results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=4)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            compare(json.load(file), report)
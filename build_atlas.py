@@ -0,0 +1,88 @@
+import os
+import re
+import sys
+import json
+import argparse
+
+from PIL import Image
+from kivy.atlas import Atlas
+
+from engine.journal import replace_file
+from resources import ATLAS, MANIFEST
+
+"""
+Atlas Build
+-----------
+
+Packs the images referenced by the kv files and the app into `images/ui.atlas`, `res` (see
+resources.py) then points them at the atlas instead of their own files. Every image is listed in
+`images/ui.json` for `preload`. Run it again whenever an image is added or changed:
+
+    python build_atlas.py [--size 2048] [--max-side 512]
+
+Images bigger than `--max-side` (full screen backgrounds) are left out, they would fill a page on
+their own and gain nothing from being packed.
+"""
+
+# files the images are referenced from
+SOURCES = ('vocab.kv', 'kv', 'Vocabulary Learner Main.py')
+
+_IMAGE_PATH = re.compile(r'images/[\w/.-]+?\.(?:jpg|png)')
+
+# every image path referenced from `SOURCES`, sorted
+def image_paths() -> list:
+    files = []
+    for source in SOURCES:
+        if os.path.isdir(source):
+            files.extend(os.path.join(source, name) for name in sorted(os.listdir(source))
+                if name.endswith('.kv'))
+        elif os.path.exists(source):
+            files.append(source)
+
+    paths = set()
+    for name in files:
+        with open(name, encoding='utf-8') as file:
+            paths.update(_IMAGE_PATH.findall(file.read()))
+    return sorted(paths)
+
+def build(size: int, max_side: int) -> list:
+    packed, unpacked, skipped = [], [], []
+    for path in image_paths():
+        if not os.path.exists(path):
+            skipped.append((path, 'missing'))
+            continue
+        with Image.open(path) as image:
+            width, height = image.size
+        if max(width, height) > max_side:
+            skipped.append((path, '{}x{}'.format(width, height)))
+            unpacked.append(path)
+        else:
+            packed.append(path)
+
+    # removes the pages of an earlier build, there might be fewer now
+    directory, name = os.path.split(ATLAS)
+    if os.path.isdir(directory):
+        for page in os.listdir(directory):
+            if page.startswith(name + '-') and page.endswith('.png'):
+                os.remove(os.path.join(directory, page))
+    if os.path.exists(ATLAS + '.atlas'):
+        os.remove(ATLAS + '.atlas')
+
+    if len(packed) > 0:
+        # use_path, so images with the same name in different folders don't clash
+        Atlas.create(ATLAS, packed, size, use_path=True)
+    replace_file(MANIFEST, [json.dumps({'packed': packed, 'unpacked': unpacked}, indent=4)])
+
+    for path, reason in skipped:
+        print("not packed: {} ({})".format(path, reason), file=sys.stderr)
+    return packed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pack the images of the app into an atlas")
+    parser.add_argument('--size', type=int, default=2048, help="size of an atlas page")
+    parser.add_argument('--max-side', type=int, default=512,
+        help="images bigger than this are not packed")
+    args = parser.parse_args()
+
+    packed = build(args.size, args.max_side)
+    print("packed {} images into {}.atlas".format(len(packed), ATLAS))
@@ -35,6 +35,23 @@ _DEFAULT_TEXT_LABEL = Label(text="{}%", font_size=40)
 _NORMALISED_MAX = 1
 _NORMALISED_MIN = 0
 
+# Animations are off by default, the bar jumps to the new value
+_DEFAULT_ANIMATION_DURATION = 0
+
+# Number of label textures kept per bar, the cache is emptied when it gets bigger (e.g. the template keeps changing)
+_TEXTURE_CACHE_SIZE = 256
+
+
+def _rgba(colour: Iterable) -> tuple:
+    """
+    Function used to turn a colour accepted by kivy.graphics.Color (3 or 4 values) into an rgba tuple
+
+    :param colour: Colour value, e.g. (1, 0, 0) or "010"
+    :return: The colour as 4 floats
+    """
+    rgba = tuple(float(component) for component in colour)
+    return rgba if len(rgba) == 4 else rgba + (1,)
+
 
 class CircularProgressBar(Widget):
     """
@@ -56,6 +73,12 @@ class CircularProgressBar(Widget):
         10. label - kivy.graphics.Label textually representing the progress - pass a label with an empty text field to
         remove it, use "{}" as the progress value placeholder (it will be replaced via the format function)
         11. value_normalized - get the current progress but normalised, or set it using a normalised value
+        12. label_text - the text template of the label, change it without replacing the label
+        13. animation_duration - seconds the bar takes to move to a new value, 0 (default) to jump to it
+
+    Changing any of them doesn't draw right away, the bar is redrawn once in the next frame however many values
+    changed. The canvas instructions are only updated, and the texture of every label text is cached. While the bar
+    is animated, each frame only changes the angle of the progress line, the text only changes with the percentage.
 
     .. note::
 
@@ -92,10 +115,36 @@ class CircularProgressBar(Widget):
         self._default_label_text =  Label(text="{}%", font_size=40).text
         self._label_size = (0, 0)
 
+        # Rendered label text -> texture, so the same percentage is never rendered twice
+        self._texture_cache = {}
+
+        # Animation state: the progress that is on screen, where the animation started and the event moving it
+        self._animation_duration = _DEFAULT_ANIMATION_DURATION
+        self._shown_progress = None
+        self._shown_percentage = None
+        self._animation_start = 0
+        self._animation_time = 0
+        self._animation = None
+        self._circle = (0, 0, 0)
+
         # Create some aliases to match the progress bar method names
         self.get_norm_value = self.get_normalised_progress
         self.set_norm_value = self.set_normalised_progress
 
+        # The canvas instructions are created once and only updated by _draw
+        with self.canvas:
+            self._background_colour_instruction = Color(*_rgba(self._background_colour))
+            self._background_line = Line(width=self._thickness)
+            self._progress_colour_instruction = Color(*_rgba(self._progress_colour))
+            self._progress_line = Line(width=self._thickness)
+            Color(1, 1, 1, 1)
+            self._text_rectangle = Rectangle()
+
+        # Every change only marks the bar as dirty, it is drawn once in the next frame
+        self._trigger_draw = Clock.create_trigger(self._draw)
+        self.bind(pos=self._trigger_draw)
+        self._trigger_draw()
+
     @property
     def thickness(self):
         return self._thickness
@@ -108,6 +157,7 @@ class CircularProgressBar(Widget):
             raise ValueError("Circular bar thickness must be a positive integer, not {}!".format(value))
         else:
             self._thickness = value
+            self._trigger_draw()
 
     @property
     def cap_style(self):
@@ -122,6 +172,7 @@ class CircularProgressBar(Widget):
             raise ValueError("Bar line cap must be included in {}, and {} is not!".format(_ACCEPTED_BAR_CAPS, value))
         else:
             self._cap_style = value
+            self._trigger_draw()
 
     @property
     def cap_precision(self):
@@ -135,6 +186,7 @@ class CircularProgressBar(Widget):
             raise ValueError("Circular bar cap precision must be a positive integer, not {}!".format(value))
         else:
             self._cap_precision = value
+            self._trigger_draw()
 
     @property
     def progress_colour(self):
@@ -146,6 +198,7 @@ class CircularProgressBar(Widget):
             raise TypeError("Bar progress colour must be iterable (e.g. list, tuple), not {}!".format(type(value)))
         else:
             self._progress_colour = value
+            self._trigger_draw()
 
     @property
     def background_colour(self):
@@ -157,6 +210,7 @@ class CircularProgressBar(Widget):
             raise TypeError("Bar background colour must be iterable (e.g. list, tuple), not {}!".format(type(value)))
         else:
             self._background_colour = value
+            self._trigger_draw()
 
     @property
     def max(self):
@@ -171,7 +225,7 @@ class CircularProgressBar(Widget):
                              .format(value, self._min_progress))
         else:
             self._max_progress = value
-            self._draw()
+            self._trigger_draw()
 
     @property
     def min(self):
@@ -187,7 +241,7 @@ class CircularProgressBar(Widget):
         else:
             self._min_progress = value
             self._value = value
-            self._draw()
+            self._trigger_draw()
 
     @property
     def value(self):
@@ -202,7 +256,7 @@ class CircularProgressBar(Widget):
                              .format(self._min_progress, self._max_progress, value))
         elif value != self._value:
             self._value = value
-            self._draw()
+            self._trigger_draw()
 
     @property
     def widget_size(self):
@@ -216,6 +270,7 @@ class CircularProgressBar(Widget):
             raise ValueError("Size of this widget must be a positive integer, not {}!".format(value))
         else:
             self._widget_size = value
+            self._trigger_draw()
 
     @property
     def label(self):
@@ -228,6 +283,38 @@ class CircularProgressBar(Widget):
         else:
             self._text_label = value
             self._default_label_text = value.text
+            self._texture_cache.clear()
+            self._trigger_draw()
+
+    @property
+    def animation_duration(self):
+        return self._animation_duration
+
+    @animation_duration.setter
+    def animation_duration(self, value):
+        if type(value) != float and type(value) != int:
+            raise TypeError("Animation duration must be a float or an integer, not {}!".format(type(value)))
+        elif value < 0:
+            raise ValueError("Animation duration can't be negative, {} is!".format(value))
+        else:
+            self._animation_duration = value
+
+    @property
+    def label_text(self):
+        return self._default_label_text
+
+    @label_text.setter
+    def label_text(self, value: str):
+        """
+        Template of the label text, use "{}" as the progress value placeholder
+
+        Unlike setting a new label, this keeps the label's font and colour (and its cached textures)
+        """
+        if type(value) != str:
+            raise TypeError("Label text must be a string, not {}!".format(type(value)))
+        elif value != self._default_label_text:
+            self._default_label_text = value
+            self._trigger_draw()
 
     @property
     def value_normalized(self):
@@ -251,15 +338,34 @@ class CircularProgressBar(Widget):
         """
         self.set_normalised_progress(value)
 
-    def _refresh_text(self):
+    def _refresh_text(self, progress: float = None):
         """
         Function used to refresh the text of the progress label.
 
+        The texture of every text is rendered once and cached. A core label reuses its texture when it's refreshed,
+        so each cached texture gets a label of its own with the same options as the bar's label.
+
         Additionally updates the variable tracking the label's texture size
+
+        :param progress: Normalised progress to show, the current one if None
+        :return: Texture of the current text
         """
-        self._text_label.text = self._default_label_text.format(str(int(self.get_normalised_progress() * 100)))
-        self._text_label.refresh()
-        self._label_size = self._text_label.texture.size
+        if progress is None:
+            progress = self.get_normalised_progress()
+        self._shown_percentage = int(progress * 100)
+        text = self._default_label_text.format(str(self._shown_percentage))
+
+        texture = self._texture_cache.get(text)
+        if texture is None:
+            if len(self._texture_cache) >= _TEXTURE_CACHE_SIZE:
+                self._texture_cache.clear()
+
+            label = Label(**dict(self._text_label.options, text=text))
+            label.refresh()
+            texture = self._texture_cache[text] = label.texture
+
+        self._label_size = texture.size
+        return texture
 
     def get_normalised_progress(self) -> float:
         """
@@ -285,38 +391,81 @@ class CircularProgressBar(Widget):
             self.value = ceil(self._min_progress + (norm_progress - _NORMALISED_MIN) *
                               (self._max_progress - self._min_progress) / (_NORMALISED_MAX - _NORMALISED_MIN))
 
-    def _draw(self):
+    def _draw(self, *args):
         """
-        Function used to draw the progress bar onto the screen.
+        Function used to draw the progress bar onto the screen, called through a trigger at most once per frame.
 
-        The drawing process is as follows:
+        The canvas instructions are created once, the drawing process only updates them:
 
-            1. Clear the canvas
-            2. Draw the background progress line (360 degrees)
-            3. Draw the actual progress line (N degrees where n is between 0 and 360)
-            4. Draw the textual representation of progress in the middle of the circle
+            1. Update the background progress line (360 degrees)
+            2. Update the actual progress line (N degrees where n is between 0 and 360), or start animating it
+            3. Put the textual representation of progress in the middle of the circle
         """
+        centre_x = self.pos[0] + self._widget_size / 2
+        centre_y = self.pos[1] + self._widget_size / 2
+        self._circle = (centre_x, centre_y, self._widget_size / 2 - self._thickness)
+
+        # Update the background progress line
+        self._background_colour_instruction.rgba = _rgba(self.background_colour)
+        self._background_line.width = self._thickness
+        self._background_line.circle = self._circle
+
+        # Update the progress line
+        self._progress_colour_instruction.rgba = _rgba(self.progress_colour)
+        self._progress_line.width = self._thickness
+        self._progress_line.cap = self._cap_style
+        self._progress_line.cap_precision = self._cap_precision
+
+        progress = self.get_normalised_progress()
+        if self._animation_duration > 0 and self._shown_progress is not None and progress != self._shown_progress:
+            # The animation draws the line and the text from now on
+            self._animation_start = self._shown_progress
+            self._animation_time = 0
+            if self._animation is None:
+                self._animation = Clock.schedule_interval(self._animate, 0)
+            self._show_progress(self._shown_progress, force_text=True)
+        else:
+            self._stop_animation()
+            self._show_progress(progress, force_text=True)
 
-        with self.canvas:
-            self.canvas.clear()
-            self._refresh_text()
+    def _show_progress(self, progress: float, force_text: bool = False):
+        """
+        Function used to put the progress line and the text at some progress.
 
-            # Draw the background progress line
-            Color(*self.background_colour)
-            Line(circle=(self.pos[0] + self._widget_size / 2, self.pos[1] + self._widget_size / 2,
-                         self._widget_size / 2 - self._thickness), width=self._thickness)
+        Only the angle of the line changes, the text is only replaced when the integer percentage changes.
 
-            # Draw the progress line
-            Color(*self.progress_colour)
-            Line(circle=(self.pos[0] + self._widget_size / 2, self.pos[1] + self._widget_size / 2,
-                         self._widget_size / 2 - self._thickness, 0, self.get_normalised_progress() * 360),
-                 width=self._thickness, cap=self._cap_style, cap_precision=self._cap_precision)
+        :param progress: Normalised progress to show
+        :param force_text: Replace the text even if the percentage didn't change (e.g. the template changed)
+        """
+        self._shown_progress = progress
+        self._progress_line.circle = (*self._circle, 0, progress * 360)
 
-            # Center and draw the progress text
-            Color(1, 1, 1, 1)
-            Rectangle(texture=self._text_label.texture, size=self._label_size,
-                      pos=(self._widget_size / 2 - self._label_size[0] / 2 + self.pos[0],
-                           self._widget_size / 2 - self._label_size[1] / 2 + self.pos[1]))
+        if force_text or int(progress * 100) != self._shown_percentage:
+            centre_x, centre_y = self._circle[:2]
+            self._text_rectangle.texture = self._refresh_text(progress)
+            self._text_rectangle.size = self._label_size
+            self._text_rectangle.pos = (centre_x - self._label_size[0] / 2, centre_y - self._label_size[1] / 2)
+
+    def _animate(self, dt):
+        """
+        Function called every frame while the bar moves to its value, eases out of the movement.
+
+        :param dt: Time since the last frame
+        """
+        self._animation_time += dt
+        fraction = min(1, self._animation_time / self._animation_duration)
+        eased = 1 - (1 - fraction) ** 3
+
+        target = self.get_normalised_progress()
+        self._show_progress(self._animation_start + (target - self._animation_start) * eased)
+
+        if fraction >= 1:
+            self._stop_animation()
+
+    def _stop_animation(self):
+        if self._animation is not None:
+            self._animation.cancel()
+            self._animation = None
 
 
 class _Example(App):
@@ -0,0 +1,13 @@
+"""
+Engine
+------
+
+The vocabulary without the app: storage, indexes, questions, grading and statistics. Nothing in
+here imports kivy, so it can be used from scripts and benchmarks.
+"""
+
+from .storage import open_store, copy_store, VocabularyStore, JSONStore, SQLiteStore
+from .mastery import bucket, LEARNED, FAMILIAR, TO_LEARN
+from .vocabulary import Vocabulary, Question, CHOICES
+from .library import Library, ProfileStore
+from .profiles import Profiles
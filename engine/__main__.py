@@ -0,0 +1,14 @@
+import sys
+
+from .storage import open_store, copy_store
+
+# moves a vocabulary from one backend to the other, e.g. json -> sqlite
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("usage: python -m engine <from file> <to file>")
+        sys.exit(1)
+
+    source, target = open_store(sys.argv[1], read_only=True), open_store(sys.argv[2])
+    copy_store(source, target)
+    source.close()
+    target.close()
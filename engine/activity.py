@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+
+"""
+Activity
+--------
+
+The number of questions answered (correctly) is kept per calendar day:
+    days: 'YYYY-MM-DD' -> [correct answer count, all answers count]
+    months: 'YYYY-MM' -> [correct answer count, all answers count], days that are older than
+        `DAY_RETENTION` are rolled up into their month by `compact()`
+
+so "answered today" is a single lookup and the history doesn't grow forever.
+"""
+
+# days kept one by one
+DAY_RETENTION = 90
+
+# months kept as totals, older ones are dropped
+MONTH_RETENTION = 24
+
+class DailyActivity:
+    """
+    `DailyActivity.__init__(store: VocabularyStore)`
+
+    1. Loads the days and months from the store
+    2. Files from before this existed only have logins, those are rolled up into days once
+    """
+    def __init__(self, store):
+        self.store = store
+        self.days, self.months = store.activity()
+
+        if len(self.days) == 0 and len(self.months) == 0:
+            for login in store.logins():
+                year, month, day = login[0][:3]
+                self.add(date(year, month, day), login[1], login[2])
+
+            # everything in them is in the days now
+            store.prune_logins(lambda login: False)
+
+    def add(self, day: date, correct: int, total: int):
+        key = day.isoformat()
+        if key not in self.days:
+            self.days[key] = [0, 0]
+        self.days[key][0] += correct
+        self.days[key][1] += total
+        self.store.add_activity(key, correct, total)
+
+    # called for every answer
+    def record(self, correct: bool, day: date = None):
+        self.add(date.today() if day is None else day, 1 if correct else 0, 1)
+
+    # returns (correct answer count, all answers count) of `day`
+    def on(self, day: date) -> tuple:
+        counts = self.days.get(day.isoformat())
+        return (0, 0) if counts is None else tuple(counts)
+
+    def today(self) -> tuple:
+        return self.on(date.today())
+
+    """
+    `DailyActivity.range(start: date, end: date) -> list`
+    Returns [(day, correct answer count, all answers count)] for every day from start to end,
+    both included. Days that were rolled up into months count as 0.
+    """
+    def range(self, start: date, end: date) -> list:
+        history = []
+        day = start
+        while day <= end:
+            history.append((day, *self.on(day)))
+            day += timedelta(days=1)
+        return history
+
+    # returns (correct answer count, all answers count) of the 7 days ending at `day`
+    def week(self, day: date = None) -> tuple:
+        day = date.today() if day is None else day
+        correct, total = 0, 0
+        for _, day_correct, day_total in self.range(day - timedelta(days=6), day):
+            correct += day_correct
+            total += day_total
+        return correct, total
+
+    # returns (correct answer count, all answers count) of the calendar month of `day`
+    def month(self, day: date = None) -> tuple:
+        day = date.today() if day is None else day
+        key = day.strftime('%Y-%m')
+
+        correct, total = self.months.get(key, (0, 0))
+        prefix = key + '-'
+        for day_key, counts in self.days.items():
+            if day_key.startswith(prefix):
+                correct += counts[0]
+                total += counts[1]
+        return correct, total
+
+    """
+    `DailyActivity.compact(today: date = None)`
+    Called when the app starts
+
+    1. Rolls days older than `DAY_RETENTION` into their month
+    2. Drops months older than `MONTH_RETENTION`
+    """
+    def compact(self, today: date = None):
+        today = date.today() if today is None else today
+        oldest_day = (today - timedelta(days=DAY_RETENTION)).isoformat()
+
+        # the first day of the oldest month that is kept
+        month_index = today.year * 12 + today.month - 1 - MONTH_RETENTION
+        oldest_month = '{:04d}-{:02d}'.format(month_index // 12, month_index % 12 + 1)
+
+        changed = False
+        for day_key in [key for key in self.days if key < oldest_day]:
+            counts = self.days.pop(day_key)
+            month = self.months.setdefault(day_key[:7], [0, 0])
+            month[0] += counts[0]
+            month[1] += counts[1]
+            changed = True
+
+        for month_key in [key for key in self.months if key < oldest_month]:
+            self.months.pop(month_key)
+            changed = True
+
+        if changed:
+            self.store.set_activity(self.days, self.months)
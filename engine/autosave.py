@@ -0,0 +1,87 @@
+import time
+import threading
+
+"""
+Autosave
+--------
+
+Saves a store on a worker thread, so the app never waits for the disk:
+    the store calls `touch()` after every change (it's the store's `on_change`)
+    once nothing changed for `QUIET_PERIOD` seconds the worker calls `store.save()`, or
+        `MAX_DELAY` seconds after the first unsaved change if changes keep coming
+
+The json store only serializes what changed since its last save and swaps the file once the new
+one is on the disk, see `JSONStore.save`. Stores that write every change right away (sqlite)
+never call `on_change`, so the worker just waits.
+"""
+
+# seconds without a change before saving
+QUIET_PERIOD = 2
+
+# seconds a change waits at most before it is saved
+MAX_DELAY = 30
+
+class Autosave:
+    """
+    `Autosave.__init__(store: VocabularyStore, quiet: float = QUIET_PERIOD, max_delay: float = MAX_DELAY)`
+    Starts the worker, `stop()` must be called before the store is saved and closed for good
+    """
+    def __init__(self, store, quiet: float = QUIET_PERIOD, max_delay: float = MAX_DELAY):
+        self.store = store
+        self.quiet = quiet
+        self.max_delay = max_delay
+
+        self.condition = threading.Condition()
+
+        # times (time.monotonic) of the first and the last change that are not saved, None if saved
+        self.first_change = None
+        self.last_change = None
+        self.stopped = False
+
+        # error of the last save, the journal still has every change and the next one tries again
+        self.error = None
+
+        store.on_change = self.touch
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    # called by the store after every change, on the thread that made it
+    def touch(self):
+        with self.condition:
+            now = time.monotonic()
+            if self.first_change is None:
+                self.first_change = now
+            self.last_change = now
+            self.condition.notify()
+
+    # waits until it's time to save, returns False once stopped
+    def _wait(self) -> bool:
+        with self.condition:
+            while not self.stopped:
+                if self.first_change is None:
+                    self.condition.wait()
+                    continue
+
+                due = min(self.last_change + self.quiet, self.first_change + self.max_delay)
+                remaining = due - time.monotonic()
+                if remaining <= 0:
+                    self.first_change, self.last_change = None, None
+                    return True
+                self.condition.wait(remaining)
+            return False
+
+    def _run(self):
+        while self._wait():
+            try:
+                self.store.save()
+                self.error = None
+            except OSError as error:
+                self.error = error
+
+    # waits for a save that is running, changes made after that are saved by `store.save()`
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        self.thread.join()
+        self.store.on_change = None
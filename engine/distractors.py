@@ -0,0 +1,139 @@
+from random import randrange
+
+from .meaning_table import MeaningTable
+
+"""
+Distractors
+-----------
+
+The wrong answers of a question are meanings of other words in the same list. Instead of going
+through the whole list for every question, each list keeps a `DistractorPool` of its meaning ids
+that is updated whenever a word is added, deleted or edited. Only the picked ids are turned back
+into meanings.
+"""
+
+class DistractorPool:
+    """
+    `DistractorPool.__init__()`
+    A multiset of the meaning ids of one list, see meaning_table.py
+
+    ids: every distinct meaning id, in no particular order
+    positions: meaning id -> index in `ids`, so a meaning can be removed without searching
+    counts: meaning id -> number of words in the list that have this meaning
+    """
+    def __init__(self):
+        self.ids = []
+        self.positions = {}
+        self.counts = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, meaning_ids):
+        for meaning_id in meaning_ids:
+            if meaning_id in self.counts:
+                self.counts[meaning_id] += 1
+            else:
+                self.counts[meaning_id] = 1
+                self.positions[meaning_id] = len(self.ids)
+                self.ids.append(meaning_id)
+
+    """
+    `DistractorPool.remove(meaning_ids)`
+
+    1. Decrements the count of every meaning
+    2. A meaning that nobody has anymore is swapped with the last one and popped
+    """
+    def remove(self, meaning_ids):
+        for meaning_id in meaning_ids:
+            if meaning_id not in self.counts:
+                continue
+
+            self.counts[meaning_id] -= 1
+            if self.counts[meaning_id] > 0:
+                continue
+
+            self.counts.pop(meaning_id)
+            index = self.positions.pop(meaning_id)
+            last = self.ids.pop()
+            if index < len(self.ids):
+                self.ids[index] = last
+                self.positions[last] = index
+
+    """
+    `DistractorPool.sample(k: int, exclude) -> list`
+    Picks up to k different meaning ids that are not in `exclude` (the ids of the correct word)
+
+    1. Small pools are filtered completely, there is nothing to gain there
+    2. Otherwise random indexes are drawn until k good ones are found, which takes O(1) tries
+        on average since `exclude` is tiny compared to the pool
+    """
+    def sample(self, k: int, exclude) -> list:
+        if len(self.ids) <= 2 * (k + len(exclude)):
+            candidates = [meaning_id for meaning_id in self.ids if meaning_id not in exclude]
+            picked = []
+            while len(picked) < k and len(candidates) > 0:
+                index = randrange(len(candidates))
+                candidates[index], candidates[-1] = candidates[-1], candidates[index]
+                picked.append(candidates.pop())
+            return picked
+
+        picked = []
+        while len(picked) < k:
+            meaning_id = self.ids[randrange(len(self.ids))]
+            if meaning_id not in exclude and meaning_id not in picked:
+                picked.append(meaning_id)
+        return picked
+
+class DistractorIndex:
+    """
+    `DistractorIndex.__init__(store: VocabularyStore)`
+    list name -> DistractorPool, a pool is only built the first time its list is practiced
+    table: the meaning table of the store if it has one, the pools keep a reference to every
+        meaning they count
+    """
+    def __init__(self, store):
+        self.store = store
+        self.pools = {}
+        self.table = MeaningTable() if store.meaning_table is None else store.meaning_table
+
+    # returns the pool of `word_list`, building it if needed
+    def pool(self, word_list: str) -> DistractorPool:
+        if word_list not in self.pools:
+            pool = DistractorPool()
+            if self.table is self.store.meaning_table:
+                # the store has the ids already
+                for meaning_ids in self.store.iter_meaning_ids(word_list):
+                    self.table.acquire_all(meaning_ids)
+                    pool.add(meaning_ids)
+            else:
+                for word, meanings, correct, total, name in self.store.iter_words(word_list):
+                    pool.add(self.table.intern_all(meanings))
+            self.pools[word_list] = pool
+        return self.pools[word_list]
+
+    # returns up to k different meanings of `word_list` that are not in `exclude`
+    def sample(self, word_list: str, k: int, exclude: list) -> list:
+        exclude_ids = {self.table.id_of(meaning) for meaning in exclude}
+        return [self.table.text(meaning_id) for meaning_id in self.pool(word_list).sample(k, exclude_ids)]
+
+    # lists that were never practiced are skipped, they will be built from the store later
+    def add_word(self, word_list: str, meanings: list):
+        if word_list in self.pools:
+            self.pools[word_list].add(self.table.intern_all(meanings))
+
+    def _remove(self, word_list: str, meanings: list):
+        meaning_ids = [self.table.id_of(meaning) for meaning in meanings]
+        self.pools[word_list].remove(meaning_ids)
+        self.table.release_all(meaning_ids)
+
+    def delete_word(self, word_list: str, meanings: list):
+        if word_list in self.pools:
+            self._remove(word_list, meanings)
+            if len(self.pools[word_list]) == 0:
+                self.pools.pop(word_list)
+
+    def set_meanings(self, word_list: str, old_meanings: list, new_meanings: list):
+        if word_list in self.pools:
+            self.pools[word_list].add(self.table.intern_all(new_meanings))
+            self._remove(word_list, old_meanings)
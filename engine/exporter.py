@@ -0,0 +1,154 @@
+import csv
+import sys
+import json
+import html
+import argparse
+from itertools import islice
+
+from .storage import open_store
+from .mastery import bucket, LEARNED, FAMILIAR, TO_LEARN
+
+"""
+Exporter
+--------
+
+Writes word lists with the statistics of every word:
+    csv: word, meanings (separated by '; '), list, correct, total, mastery; can be imported again
+    jsonl: one object per word
+    html: a printable report with one table per list
+
+Words are read from the store and written one at a time, the output is never built in memory.
+
+Usage: python -m engine.exporter <file> [--list NAME ...] [--format csv|jsonl|html]
+"""
+
+FORMATS = ('csv', 'jsonl', 'html')
+
+# rows read at once while holding the lock, see `export_rows`
+LOCKED_ROWS = 1000
+
+BUCKET_NAMES = {LEARNED: 'learned', FAMILIAR: 'familiar', TO_LEARN: 'to learn'}
+
+CSV_HEADER = ['word', 'meanings', 'list', 'correct', 'total', 'mastery']
+
+_HTML_START = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Vocabulary</title>
+<style>
+body { font-family: sans-serif; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 2em; }
+th, td { border: 1px solid #999; padding: 4px 8px; text-align: left; vertical-align: top; }
+h2 { page-break-before: auto; }
+tr { page-break-inside: avoid; }
+</style>
+</head>
+<body>
+"""
+
+_HTML_TABLE_START = """<h2>{}</h2>
+<table>
+<tr><th>Word</th><th>Meanings</th><th>Correct</th><th>Mastery</th></tr>
+"""
+
+# returns the format of `path` from its extension
+def guess_format(path: str) -> str:
+    if path.endswith('.jsonl'):
+        return 'jsonl'
+    if path.endswith('.html') or path.endswith('.htm'):
+        return 'html'
+    return 'csv'
+
+"""
+`export_rows(store: VocabularyStore, word_lists: list = None, lock = None)`
+word_lists: lists to export, all of them if None
+lock: held by every change of the words when the export runs next to the app (`Vocabulary.lock`),
+    the rows are then read `LOCKED_ROWS` at a time while holding it
+
+1. Yields (word, meanings, list, correct, total, mastery bucket name) list after list
+"""
+def export_rows(store, word_lists: list = None, lock=None):
+    for word_list in store.lists() if word_lists is None else word_lists:
+        rows = store.iter_words(word_list)
+        if lock is not None:
+            rows = _locked(rows, lock)
+        for word, meanings, correct, total, name in rows:
+            yield word, meanings, name, correct, total, BUCKET_NAMES[bucket(correct, total)]
+
+# yields `rows`, taking `LOCKED_ROWS` of them at a time with `lock` held
+def _locked(rows, lock):
+    while True:
+        with lock:
+            batch = list(islice(rows, LOCKED_ROWS))
+        if len(batch) == 0:
+            return
+        yield from batch
+
+def write_csv(rows, file) -> int:
+    writer = csv.writer(file)
+    writer.writerow(CSV_HEADER)
+
+    count = 0
+    for word, meanings, word_list, correct, total, mastery in rows:
+        writer.writerow([word, '; '.join(meanings), word_list, correct, total, mastery])
+        count += 1
+    return count
+
+def write_jsonl(rows, file) -> int:
+    count = 0
+    for row in rows:
+        file.write(json.dumps(dict(zip(CSV_HEADER, row)), ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+def write_html(rows, file) -> int:
+    file.write(_HTML_START)
+
+    count = 0
+    current_list = None
+    for word, meanings, word_list, correct, total, mastery in rows:
+        # rows come list after list, so a new list starts a new table
+        if word_list != current_list:
+            if current_list is not None:
+                file.write("</table>\n")
+            file.write(_HTML_TABLE_START.format(html.escape(word_list)))
+            current_list = word_list
+
+        file.write("<tr><td>{}</td><td>{}</td><td>{}/{}</td><td>{}</td></tr>\n".format(
+            html.escape(word), '<br>'.join(html.escape(meaning) for meaning in meanings),
+            correct, total, mastery))
+        count += 1
+
+    if current_list is not None:
+        file.write("</table>\n")
+    file.write("</body>\n</html>\n")
+    return count
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'html': write_html}
+
+"""
+`export_file(path: str, store: VocabularyStore, word_lists: list = None, file_format: str = None,
+    lock = None) -> int`
+Writes the words of `word_lists` (all lists if None) to `path`, returns the number of words
+lock: see `export_rows`
+"""
+def export_file(path: str, store, word_lists: list = None, file_format: str = None, lock=None) -> int:
+    file_format = guess_format(path) if file_format is None else file_format
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        return WRITERS[file_format](export_rows(store, word_lists, lock), file)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export word lists from the vocabulary")
+    parser.add_argument('file')
+    parser.add_argument('--list', action='append', dest='lists', help="can be given more than once, "
+        "all lists are exported by default")
+    parser.add_argument('--format', choices=FORMATS, help="guessed from the extension by default")
+    parser.add_argument('--store', default='Vocabulary_Words.json')
+    args = parser.parse_args()
+
+    # the app may have the store open, its journal must stay where it is
+    store = open_store(args.store, read_only=True)
+    count = export_file(args.file, store, args.lists, args.format)
+    store.close()
+    print("{} words exported to {}".format(count, args.file), file=sys.stderr)
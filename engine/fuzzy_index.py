@@ -0,0 +1,142 @@
+import unicodedata
+from collections import defaultdict
+
+from .warm_index import WarmIndex
+
+"""
+Fuzzy Index
+-----------
+
+Finds the words closest to something that was typed with a typo, a different case or missing
+accents. Words are normalized (accents removed, case folded), then indexed by their trigrams:
+    exact: normalized word -> words
+    grams: trigram -> normalized words containing it
+
+A search only looks at the words sharing a trigram with the query, the best of those are ranked
+by their edit distance to the query.
+"""
+
+# number of candidates (by shared trigrams) that are ranked by edit distance
+CANDIDATES = 50
+
+# strips accents, folds case and collapses whitespace: 'Café ' -> 'cafe'
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+# the padding makes short words and the start of words count more
+def trigrams(normalized: str) -> set:
+    padded = '  ' + normalized + ' '
+    return {padded[i: i + 3] for i in range(len(padded) - 2)}
+
+# Levenshtein distance, only keeping 2 rows
+def edit_distance(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+class FuzzyIndex(WarmIndex):
+    """
+    `FuzzyIndex.__init__(store: VocabularyStore)`
+    The index is built with a single pass over the store by `warm` (see warm_index.py), or the
+    first time it is searched
+    """
+    def __init__(self, store):
+        self.store = store
+        self.exact = None
+        self.grams = None
+
+    def _built(self) -> bool:
+        return self.exact is not None
+
+    def _start(self):
+        self.exact = defaultdict(set)
+        self.grams = defaultdict(set)
+
+    def _index(self, word: str, meanings: list):
+        self._add(word)
+
+    def _take(self, index):
+        self.exact, self.grams = index.exact, index.grams
+
+    def _build(self):
+        self._start()
+        for word, meanings, correct, total, word_list in self.store.iter_words():
+            self._add(word)
+
+    def _add(self, word: str):
+        normalized = normalize(word)
+        if normalized not in self.exact:
+            for gram in trigrams(normalized):
+                self.grams[gram].add(normalized)
+        self.exact[normalized].add(word)
+
+    # the index is only kept up to date once it is built
+    def add_word(self, word: str):
+        if self._defer('add_word', word):
+            return
+        if self.exact is not None:
+            self._add(word)
+
+    def delete_word(self, word: str):
+        if self._defer('delete_word', word) or self.exact is None:
+            return
+
+        normalized = normalize(word)
+        words = self.exact.get(normalized)
+        if words is None:
+            return
+
+        words.discard(word)
+        if len(words) == 0:
+            self.exact.pop(normalized)
+            for gram in trigrams(normalized):
+                self.grams[gram].discard(normalized)
+                if len(self.grams[gram]) == 0:
+                    self.grams.pop(gram)
+
+    # returns the words that only differ from `query` by case, accents or spacing
+    def lookup(self, query: str) -> list:
+        self._ensure()
+        return sorted(self.exact.get(normalize(query), ()))
+
+    """
+    `FuzzyIndex.suggest(query: str, k: int = 5) -> list`
+
+    1. Counts the trigrams every word shares with the query
+    2. Takes the `CANDIDATES` words with the best overlap (Dice coefficient)
+    3. Returns the k closest of them by edit distance
+    """
+    def suggest(self, query: str, k: int = 5) -> list:
+        self._ensure()
+
+        normalized = normalize(query)
+        query_grams = trigrams(normalized)
+
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self.grams.get(gram, ()):
+                shared[candidate] += 1
+
+        # a word of length n has about n + 1 trigrams
+        def overlap(candidate):
+            return 2 * shared[candidate] / (len(query_grams) + len(candidate) + 1)
+
+        candidates = sorted(shared, key=overlap, reverse=True)[:CANDIDATES]
+        candidates.sort(key=lambda candidate: (edit_distance(normalized, candidate), -overlap(candidate)))
+
+        suggestions = []
+        for candidate in candidates:
+            suggestions += sorted(self.exact[candidate])
+            if len(suggestions) >= k:
+                break
+        return suggestions[:k]
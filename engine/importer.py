@@ -0,0 +1,194 @@
+import re
+import csv
+import sys
+import argparse
+
+from .storage import open_store
+
+"""
+Importer
+--------
+
+Adds word lists from text exports, one row per word:
+    csv / tsv: word, meanings (separated by ';'), list (optional, the default list is used if empty)
+    anki: the "Notes in Plain Text" export, front = word, back = meanings; lines starting with '#'
+        are headers and html tags are removed
+
+The file is read one line at a time and the words are written to the store in batches, so only
+one batch is ever in memory. A dry run writes nothing, so it keeps the name of every new word of
+the file to find the words that are in it twice: about 100 bytes a word, 10 MB for 100k words.
+
+Usage: python -m engine.importer <file> [--list NAME] [--format csv|tsv|anki] [--dry-run]
+"""
+
+# number of words written to the store at once
+BATCH_SIZE = 1000
+
+# problems kept in the report, the rest are only counted
+MAX_PROBLEMS = 100
+
+FORMATS = ('csv', 'tsv', 'anki')
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_HTML_BREAK = re.compile(r"<br\s*/?>|<div>", re.IGNORECASE)
+
+# returns the format of `path` from its extension
+def guess_format(path: str) -> str:
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith('.tsv'):
+        return 'tsv'
+    return 'anki'
+
+# splits a meanings field into the separate meanings
+def split_meanings(field: str, html: bool = False) -> list:
+    if html:
+        field = _HTML_TAG.sub('', _HTML_BREAK.sub(';', field))
+        field = field.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+
+    meanings = []
+    for meaning in re.split(r"[;\n]", field):
+        meaning = ' '.join(meaning.split())
+        if len(meaning) != 0:
+            meanings.append(meaning)
+    return meanings
+
+"""
+`read_rows(lines, file_format: str)`
+lines: any iterable of lines, e.g. an open file
+
+1. Yields (line number, word, meanings, list or None) for every row
+"""
+def read_rows(lines, file_format: str):
+    reader = csv.reader(lines, delimiter=',' if file_format == 'csv' else '\t')
+    html = file_format == 'anki'
+
+    for fields in reader:
+        if len(fields) == 0 or all(len(field.strip()) == 0 for field in fields):
+            continue
+
+        # the header lines only describe the export
+        if html and fields[0].startswith('#'):
+            continue
+
+        # the header of files written by the exporter
+        if reader.line_num == 1 and fields[:2] == ['word', 'meanings']:
+            continue
+
+        word = ' '.join(fields[0].split())
+        if html:
+            word = _HTML_TAG.sub('', word)
+
+        meanings = split_meanings(fields[1], html) if len(fields) > 1 else []
+
+        word_list = None
+        if file_format != 'anki' and len(fields) > 2 and len(fields[2].strip()) != 0:
+            word_list = fields[2].strip()
+
+        yield reader.line_num, word, meanings, word_list
+
+class ImportReport:
+    """
+    `ImportReport.__init__()`
+    read: rows read from the file
+    added: words written to the store (or that would be, for a dry run)
+    duplicates: words that already exist (in the store or earlier in the file)
+    invalid: rows without a word or without a meaning
+    problems: (line number, message) for the first `MAX_PROBLEMS` skipped rows
+    """
+    def __init__(self):
+        self.read = 0
+        self.added = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.problems = []
+
+    def skip(self, line: int, message: str):
+        if len(self.problems) < MAX_PROBLEMS:
+            self.problems.append((line, message))
+
+    def __str__(self):
+        return "{} rows read, {} words added, {} duplicates, {} invalid".format(
+            self.read, self.added, self.duplicates, self.invalid)
+
+"""
+`import_rows(rows, store, default_list: str, dry_run: bool = False, progress = None,
+    batch_size: int = BATCH_SIZE) -> ImportReport`
+rows: what `read_rows` yields
+progress: called with the report after every batch
+
+1. Skips rows without a word/meaning and words that already exist
+2. Writes the rest to the store `batch_size` words at a time (nothing is written for a dry run,
+    which keeps every new word instead, see above)
+"""
+def import_rows(rows, store, default_list: str, dry_run: bool = False, progress=None,
+        batch_size: int = BATCH_SIZE) -> ImportReport:
+    report = ImportReport()
+    batch = []
+
+    # words of the batch that isn't in the store yet, for a dry run every new word of the file as
+    # the store never gets them, otherwise it would count a word repeated in a later batch as new
+    pending = set()
+
+    def flush():
+        if not dry_run:
+            store.add_words(batch)
+            pending.clear()
+        report.added += len(batch)
+        batch.clear()
+        if progress is not None:
+            progress(report)
+
+    for line, word, meanings, word_list in rows:
+        report.read += 1
+
+        if len(word) == 0 or len(meanings) == 0:
+            report.invalid += 1
+            report.skip(line, "missing word" if len(word) == 0 else "no meaning for '{}'".format(word))
+            continue
+
+        if word in pending or store.has_word(word):
+            report.duplicates += 1
+            report.skip(line, "'{}' already exists".format(word))
+            continue
+
+        pending.add(word)
+        batch.append((word, meanings, default_list if word_list is None else word_list))
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+    return report
+
+"""
+`import_file(path: str, store, default_list: str, file_format: str = None, dry_run: bool = False,
+    progress = None) -> ImportReport`
+Imports a whole file, see `import_rows`
+"""
+def import_file(path: str, store, default_list: str, file_format: str = None, dry_run: bool = False,
+        progress=None) -> ImportReport:
+    file_format = guess_format(path) if file_format is None else file_format
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        return import_rows(read_rows(file, file_format), store, default_list, dry_run, progress)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Import word lists into the vocabulary")
+    parser.add_argument('file')
+    parser.add_argument('--list', default='Imported', help="list for rows that don't name one")
+    parser.add_argument('--format', choices=FORMATS, help="guessed from the extension by default")
+    parser.add_argument('--store', default='Vocabulary_Words.json')
+    parser.add_argument('--dry-run', action='store_true', help="only check the file, keeps every new word in memory")
+    args = parser.parse_args()
+
+    store = open_store(args.store)
+    report = import_file(args.file, store, args.list, args.format, args.dry_run,
+        progress=lambda report: print("\r" + str(report), end='', file=sys.stderr))
+    print(file=sys.stderr)
+
+    for line, message in report.problems:
+        print("line {}: {}".format(line, message))
+
+    # everything goes straight into the snapshot instead of a huge journal
+    if not args.dry_run:
+        store.save()
+    store.close()
@@ -0,0 +1,235 @@
+import os
+import json
+
+"""
+Journal File Structure
+----------------------
+
+One json list per line, appended in the order the changes happened:
+    ["generation", generation (int)]: first line of every journal, see below
+    ["answer", word (str), correct (bool)]
+    ["add", word (str), meanings (list), list (str), answered correctly (int), answered total (int)]
+    ["delete", word (str)]
+    ["meanings", word (str), meanings (list)]
+    ["user", key (str), value]
+    ["login", login (list)]
+    ["logins", every login that is kept (list)]: replaces all logins
+    ["schedule", word (str), review state (list)]
+    ["activity", day (str), correct answer count (int), all answers count (int)]
+    ["library", word (str), [answered correctly (int), answered total (int), review state (list)]]
+
+The json file is only a snapshot, the real data is the snapshot + every record in the journal.
+
+Generations: when a snapshot is taken the journal is renamed to `<journal>.<generation>` and a new
+one is started with the next generation, which is also written in the snapshot (`GENERATION_KEY`).
+Changes made while the snapshot is written go to the new journal, and a journal that is older
+than the snapshot is never replayed, so the app can die at any point of a save without losing or
+doubling a change. Journals written before generations existed are generation 0.
+
+After a replay the journal starts a generation newer than every journal on the disk, the
+snapshot may not have their changes yet (the app died before it was saved) so the next rotation
+must not rename the new journal onto one of them.
+"""
+
+# after this many records the app folds the journal back into the snapshot
+COMPACT_THRESHOLD = 500
+
+# key of the snapshot's generation in the json file
+GENERATION_KEY = 'Journal generation'
+
+class Journal:
+    """
+    `Journal.__init__(path: str)`
+    path: the journal file, usually next to the json snapshot
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+        # number of records written since the last snapshot
+        self.records = 0
+
+        # generation of the current journal
+        self.generation = 0
+
+        # opened lazily so that replaying doesn't create an empty file
+        self.file = None
+
+    # yields (generation, path) of the journals that were renamed by `rotate`
+    def _rotated(self):
+        directory, name = os.path.split(self.path)
+        for entry in os.listdir(directory or '.'):
+            suffix = entry[len(name) + 1:]
+            if entry.startswith(name + '.') and suffix.isdigit():
+                yield int(suffix), os.path.join(directory, entry)
+
+    """
+    `Journal.replay(js: dict, rotate: bool = True)`
+    Called once at startup, right after the snapshot is loaded
+    rotate: False to only read the journals (the store is read only, the app may be writing them)
+
+    1. Takes the generation of the snapshot out of `js`
+    2. Applies every record of the journals of that generation or later to `js`, oldest first
+    3. Stops reading a journal at its first broken line (the app died in the middle of a write)
+    4. Moves the current journal aside and starts a generation newer than any journal found
+    """
+    def replay(self, js: dict, rotate: bool = True):
+        self.generation = js.pop(GENERATION_KEY, 0)
+
+        journals = list(self._rotated())
+        newest = max([self.generation] + [generation for generation, _ in journals])
+        if os.path.exists(self.path):
+            journals.append((None, self.path))
+
+        replayed = []
+        for _, path in journals:
+            with open(path, 'r') as file:
+                records = []
+                for line in file:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+
+            generation = 0
+            if len(records) > 0 and records[0][0] == 'generation':
+                generation = records.pop(0)[1]
+            newest = max(newest, generation)
+            if generation >= self.generation:
+                replayed.append((generation, records))
+
+        for generation, records in sorted(replayed, key=lambda journal: journal[0]):
+            for record in records:
+                apply_record(js, record)
+            self.records += len(records)
+
+        # kept until a snapshot newer than `newest` is saved, like a rotated journal
+        self.generation = newest + 1
+        if rotate and os.path.exists(self.path):
+            os.replace(self.path, '{}.{}'.format(self.path, self.generation))
+            self.generation += 1
+
+    def _open(self):
+        new = not os.path.exists(self.path)
+        self.file = open(self.path, 'a')
+        if new:
+            self.file.write(json.dumps(['generation', self.generation]) + '\n')
+
+    """
+    `Journal.append(op: str, *args)`
+    Called for every change made to `js`
+
+    1. Writes one line to the end of the journal and flushes it
+    """
+    def append(self, op: str, *args):
+        if self.file is None:
+            self._open()
+
+        self.file.write(json.dumps([op, *args]) + '\n')
+        self.file.flush()
+        self.records += 1
+
+    """
+    `Journal.append_many(op: str, records: list)`
+    Same as calling `append(op, *args)` for every args in `records`, but flushes only once
+    """
+    def append_many(self, op: str, records: list):
+        if self.file is None:
+            self._open()
+
+        self.file.writelines(json.dumps([op, *args]) + '\n' for args in records)
+        self.file.flush()
+        self.records += len(records)
+
+    """
+    `Journal.rotate() -> int`
+    Called when a snapshot is taken, at the exact point the snapshot has every change so far
+
+    1. Renames the journal to `<journal>.<generation>`, it is replayed until the snapshot is saved
+    2. Starts the next generation and returns it, it goes into the snapshot
+    """
+    def rotate(self) -> int:
+        self.close()
+        if os.path.exists(self.path):
+            os.replace(self.path, '{}.{}'.format(self.path, self.generation))
+        self.generation += 1
+        self.records = 0
+        return self.generation
+
+    # deletes the renamed journals older than `generation`, once its snapshot is saved
+    def drop_before(self, generation: int):
+        for journal_generation, path in list(self._rotated()):
+            if journal_generation < generation:
+                os.remove(path)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+"""
+`replace_file(path: str, chunks)`
+Writes `chunks` (strings) to `path` so that the file is either the old or the new one, whenever
+the app or the machine dies
+
+1. Writes everything to `<path>.tmp` and waits until it is on the disk
+2. Renames it over `path`, and syncs the directory so the rename is on the disk too
+"""
+def replace_file(path: str, chunks):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as file:
+        file.writelines(chunks)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_path, path)
+
+    # directories can't be opened on windows, the rename is durable there already
+    if hasattr(os, 'O_DIRECTORY'):
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+# applies a single journal record to `js`, records for missing words are ignored
+def apply_record(js: dict, record: list):
+    op, args = record[0], record[1:]
+    words = js['WordList']
+
+    if op == 'answer':
+        word, correct = args
+        if word in words:
+            words[word][1] += 1 if correct else 0
+            words[word][2] += 1
+    elif op == 'add':
+        word, meanings, word_list = args[:3]
+        # the stats are missing in records written before they were journaled
+        correct, total = args[3:] if len(args) == 5 else (0, 0)
+        words[word] = [meanings, correct, total, word_list]
+    elif op == 'delete':
+        words.pop(args[0], None)
+        js.get('Schedule', {}).pop(args[0], None)
+    elif op == 'meanings':
+        word, meanings = args
+        if word in words:
+            words[word][0] = meanings
+    elif op == 'user':
+        key, value = args
+        js['User'][key] = value
+    elif op == 'schedule':
+        word, state = args
+        if word in words:
+            js.setdefault('Schedule', {})[word] = state
+    elif op == 'activity':
+        day, correct, total = args
+        counts = js['Login info'].setdefault('daily', {}).setdefault(day, [0, 0])
+        counts[0] += correct
+        counts[1] += total
+    elif op == 'library':
+        word, entry = args
+        js.setdefault('LibraryStats', {})[word] = entry
+    elif op == 'login':
+        js['Login info']['last login'] = args[0]
+        js['Login info']['all logins'].append(args[0])
+    elif op == 'logins':
+        js['Login info']['all logins'] = args[0]
@@ -0,0 +1,246 @@
+import json
+
+from .storage import VocabularyStore
+from .meaning_table import MeaningTable
+
+"""
+Library File Structure
+----------------------
+
+Word lists every profile can practice but nobody can change, e.g. the lists a teacher gives the
+whole class:
+
+Root (dict):
+    list (str):
+        word (str): meanings (list)
+
+The library is loaded once and shared by every profile (see profiles.py), the profiles only keep
+their own stats and review state of its words, see `ProfileStore`.
+"""
+
+class Library:
+    """
+    `Library.__init__(path: str)`
+    Loads the word lists of `path`, a word that is in several lists only counts for the first one
+    words: word -> (list, meaning ids)
+    word_lists: list -> words in the order of the file
+    """
+    def __init__(self, path: str):
+        with open(path, 'r') as file:
+            lists = json.load(file)
+
+        self.meaning_table = MeaningTable()
+        self.words = {}
+        self.word_lists = {}
+        for word_list, words in lists.items():
+            names = []
+            for word, meanings in words.items():
+                if word in self.words:
+                    continue
+                self.words[word] = (word_list, self.meaning_table.intern_all(meanings))
+                names.append(word)
+            if len(names) > 0:
+                self.word_lists[word_list] = names
+
+    def __len__(self):
+        return len(self.words)
+
+    def has_word(self, word: str) -> bool:
+        return word in self.words
+
+    # None if the word is not in the library
+    def list_of(self, word: str) -> str:
+        entry = self.words.get(word)
+        return None if entry is None else entry[0]
+
+    def meanings(self, word: str) -> tuple:
+        return self.meaning_table.texts_of(self.words[word][1])
+
+    def lists(self) -> list:
+        return list(self.word_lists)
+
+    def words_in(self, word_list: str) -> list:
+        return self.word_lists.get(word_list, [])
+
+class ProfileStore(VocabularyStore):
+    """
+    `ProfileStore.__init__(store: VocabularyStore, library: Library)`
+    The lists of the profile's store and of the library as one store
+
+    The words of the library are read only, the profile's store keeps their stats and review
+    state apart from its words (see `VocabularyStore.library_entry`). Everything else (user,
+    logins, activity, own words) is the profile's store.
+    """
+    def __init__(self, store: VocabularyStore, library: Library):
+        self.store = store
+        self.library = library
+
+    # the store saving in the background is the profile's
+    @property
+    def on_change(self):
+        return self.store.on_change
+
+    @on_change.setter
+    def on_change(self, callback):
+        self.store.on_change = callback
+
+    # if the word is the library's, a word of the profile with the same name hides it
+    def _library_word(self, word: str) -> bool:
+        return self.library.has_word(word) and not self.store.has_word(word)
+
+    # [answered correctly, answered total, review state] of a library word
+    def _entry(self, word: str) -> list:
+        entry = self.store.library_entry(word)
+        return [0, 0, None] if entry is None else list(entry)
+
+    def get_user(self, key: str, default=None):
+        return self.store.get_user(key, default)
+
+    def set_user(self, key: str, value):
+        self.store.set_user(key, value)
+
+    def logins(self) -> list:
+        return self.store.logins()
+
+    def add_login(self, login: list):
+        self.store.add_login(login)
+
+    def prune_logins(self, keep):
+        self.store.prune_logins(keep)
+
+    def activity(self) -> tuple:
+        return self.store.activity()
+
+    def add_activity(self, day: str, correct: int, total: int):
+        self.store.add_activity(day, correct, total)
+
+    def set_activity(self, days: dict, months: dict):
+        self.store.set_activity(days, months)
+
+    def has_word(self, word: str) -> bool:
+        return self.store.has_word(word) or self.library.has_word(word)
+
+    def read_only(self, word: str) -> bool:
+        return self._library_word(word)
+
+    def word_count(self) -> int:
+        return sum(self.list_size(word_list) for word_list in self.lists())
+
+    def meanings(self, word: str) -> list:
+        if self._library_word(word):
+            return self.library.meanings(word)
+        return self.store.meanings(word)
+
+    def stats(self, word: str) -> tuple:
+        if self._library_word(word):
+            correct, total, state = self._entry(word)
+            return correct, total
+        return self.store.stats(word)
+
+    def list_of(self, word: str) -> str:
+        if self._library_word(word):
+            return self.library.list_of(word)
+        return self.store.list_of(word)
+
+    def iter_words(self, word_list: str = None):
+        for name in (self.lists() if word_list is None else [word_list]):
+            if name not in self.library.word_lists:
+                yield from self.store.iter_words(name)
+                continue
+            for word in self.words_in(name):
+                yield (word, self.meanings(word), *self.stats(word), name)
+
+    def add_word(self, word: str, meanings: list, word_list: str, correct: int = 0, total: int = 0):
+        self.store.add_word(word, meanings, word_list, correct, total)
+
+    def add_words(self, rows: list):
+        self.store.add_words(rows)
+
+    def delete_word(self, word: str):
+        if self._library_word(word):
+            raise ValueError("{} is a library word, it can't be deleted".format(word))
+        self.store.delete_word(word)
+
+    def set_meanings(self, word: str, meanings: list):
+        if self._library_word(word):
+            raise ValueError("{} is a library word, its meanings can't be changed".format(word))
+        self.store.set_meanings(word, meanings)
+
+    def record_answer(self, word: str, correct: bool):
+        if not self._library_word(word):
+            self.store.record_answer(word, correct)
+            return
+        entry = self._entry(word)
+        entry[0] += 1 if correct else 0
+        entry[1] += 1
+        self.store.set_library_entry(word, entry)
+
+    def schedule(self, word: str) -> list:
+        if self._library_word(word):
+            return self._entry(word)[2]
+        return self.store.schedule(word)
+
+    def set_schedule(self, word: str, state: list):
+        if not self._library_word(word):
+            self.store.set_schedule(word, state)
+            return
+        entry = self._entry(word)
+        entry[2] = state
+        self.store.set_library_entry(word, entry)
+
+    # the library words of a list that are not hidden by a word of the profile
+    def _library_words_in(self, word_list: str) -> list:
+        return [word for word in self.library.words_in(word_list) if not self.store.has_word(word)]
+
+    def schedules(self, word_list: str) -> dict:
+        schedules = self.store.schedules(word_list)
+        for word in self._library_words_in(word_list):
+            state = self._entry(word)[2]
+            if state is not None:
+                schedules[word] = state
+        return schedules
+
+    def list_stats(self, word_list: str) -> tuple:
+        correct, total = self.store.list_stats(word_list)
+        for word in self._library_words_in(word_list):
+            entry = self._entry(word)
+            correct += entry[0]
+            total += entry[1]
+        return correct, total
+
+    # the profile's lists, then the library's
+    def lists(self) -> list:
+        library_lists = self.library.word_lists
+        return ([word_list for word_list in self.store.lists() if word_list not in library_lists] +
+            list(library_lists))
+
+    """
+    `ProfileStore.words_in(word_list: str) -> list`
+    A list of the library has its words (unless hidden by a word of the profile) and the words the
+    profile added to a list with the same name
+    """
+    def words_in(self, word_list: str) -> list:
+        if word_list not in self.library.word_lists:
+            return self.store.words_in(word_list)
+        return self._library_words_in(word_list) + list(self.store.words_in(word_list))
+
+    def list_size(self, word_list: str) -> int:
+        return len(self.words_in(word_list))
+
+    def library_entry(self, word: str) -> list:
+        return self.store.library_entry(word)
+
+    def set_library_entry(self, word: str, entry: list):
+        self.store.set_library_entry(word, entry)
+
+    def library_entries(self) -> dict:
+        return self.store.library_entries()
+
+    def maintain(self):
+        self.store.maintain()
+
+    def save(self):
+        self.store.save()
+
+    def close(self):
+        self.store.close()
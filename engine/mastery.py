@@ -0,0 +1,123 @@
+"""
+Mastery
+-------
+
+Every word is in one of 3 buckets depending on how often it was answered correctly:
+    learned: correct percentage > LEARNED_THRESHOLD
+    familiar: correct percentage > FAMILIAR_THRESHOLD
+    to learn: everything else (including words that were never answered)
+
+`MasteryCounters` keeps the number of words in each bucket and the answer counts of every list,
+updated on each answer, add and delete, so the profile never has to look at single words.
+"""
+
+LEARNED_THRESHOLD = 0.8
+FAMILIAR_THRESHOLD = 0.45
+
+LEARNED = 0
+FAMILIAR = 1
+TO_LEARN = 2
+
+# returns the bucket of a word answered `correct` times out of `total`
+def bucket(correct: int, total: int) -> int:
+    # avoid division by 0
+    correct_percentage = 0 if total == 0 else correct / total
+
+    if correct_percentage > LEARNED_THRESHOLD:
+        return LEARNED
+    elif correct_percentage > FAMILIAR_THRESHOLD:
+        return FAMILIAR
+    return TO_LEARN
+
+class ListMastery:
+    """
+    `ListMastery.__init__()`
+    buckets: number of words in [learned, familiar, to learn]
+    correct, total: answer counts summed over the list
+    """
+    def __init__(self):
+        self.buckets = [0, 0, 0]
+        self.correct = 0
+        self.total = 0
+
+    def size(self) -> int:
+        return sum(self.buckets)
+
+class MasteryCounters:
+    """
+    `MasteryCounters.__init__(store: VocabularyStore)`
+    The counters are built with a single pass over the store the first time they are needed
+    """
+    def __init__(self, store):
+        self.store = store
+        self.lists = None
+
+    def _build(self):
+        self.lists = {}
+        for word, meanings, correct, total, word_list in self.store.iter_words():
+            self._add(word_list, correct, total)
+
+    def _add(self, word_list: str, correct: int, total: int):
+        if word_list not in self.lists:
+            self.lists[word_list] = ListMastery()
+
+        mastery = self.lists[word_list]
+        mastery.buckets[bucket(correct, total)] += 1
+        mastery.correct += correct
+        mastery.total += total
+
+    def _remove(self, word_list: str, correct: int, total: int):
+        mastery = self.lists[word_list]
+        mastery.buckets[bucket(correct, total)] -= 1
+        mastery.correct -= correct
+        mastery.total -= total
+
+        if mastery.size() == 0:
+            self.lists.pop(word_list)
+
+    # returns the counters of `word_list`, all zeros if it doesn't exist
+    def of(self, word_list: str) -> ListMastery:
+        if self.lists is None:
+            self._build()
+        return self.lists.get(word_list, ListMastery())
+
+    # returns [learned, familiar, to learn] over every list
+    def buckets(self) -> list:
+        if self.lists is None:
+            self._build()
+
+        buckets = [0, 0, 0]
+        for mastery in self.lists.values():
+            for i in range(3):
+                buckets[i] += mastery.buckets[i]
+        return buckets
+
+    # the counters are only kept up to date once they are built
+    def add_word(self, word_list: str, correct: int = 0, total: int = 0):
+        if self.lists is not None:
+            self._add(word_list, correct, total)
+
+    def delete_word(self, word_list: str, correct: int, total: int):
+        if self.lists is not None:
+            self._remove(word_list, correct, total)
+
+    """
+    `MasteryCounters.answer(word_list: str, correct: int, total: int, answered_correctly: bool)`
+    correct, total: the stats of the word before the answer
+
+    1. Moves the word from its old bucket to the new one
+    """
+    def answer(self, word_list: str, correct: int, total: int, answered_correctly: bool):
+        if self.lists is None:
+            return
+
+        mastery = self.lists[word_list]
+        mastery.buckets[bucket(correct, total)] -= 1
+
+        if answered_correctly:
+            correct += 1
+            mastery.correct += 1
+        total += 1
+        mastery.total += 1
+
+        mastery.buckets[bucket(correct, total)] += 1
@@ -0,0 +1,122 @@
+import re
+import math
+import heapq
+from collections import Counter, defaultdict
+
+from .fuzzy_index import normalize
+from .warm_index import WarmIndex
+
+"""
+Meaning Index
+-------------
+
+An inverted index from the words used in meanings to the vocabulary words, so the dictionary can
+answer "which of my words mean 'happy'?":
+    postings: token -> {word: number of times the token is in the meanings of the word}
+    lengths: word -> number of tokens in its meanings
+
+Results are ranked with TF-IDF, only the postings of the query tokens are looked at.
+"""
+
+_TOKEN = re.compile(r"\w+")
+
+# too common to say anything about a meaning
+STOP_WORDS = {"a", "an", "the", "to", "of", "or", "and", "in", "on", "for", "is", "be", "as", "by",
+    "with", "that", "something", "someone", "sth", "sb"}
+
+# lower case, accent free tokens of `text` without the stop words
+def tokenize(text: str) -> list:
+    return [token for token in _TOKEN.findall(normalize(text)) if token not in STOP_WORDS]
+
+class MeaningIndex(WarmIndex):
+    """
+    `MeaningIndex.__init__(store: VocabularyStore)`
+    The index is built with a single pass over the store by `warm` (see warm_index.py), or the
+    first time it is searched
+    """
+    def __init__(self, store):
+        self.store = store
+        self.postings = None
+        self.lengths = None
+
+    def _built(self) -> bool:
+        return self.postings is not None
+
+    def _start(self):
+        self.postings = defaultdict(dict)
+        self.lengths = {}
+
+    def _index(self, word: str, meanings: list):
+        self._add(word, meanings)
+
+    def _take(self, index):
+        self.postings, self.lengths = index.postings, index.lengths
+
+    def _build(self):
+        self._start()
+        for word, meanings, correct, total, word_list in self.store.iter_words():
+            self._add(word, meanings)
+
+    def _add(self, word: str, meanings: list):
+        counts = Counter()
+        for meaning in meanings:
+            counts.update(tokenize(meaning))
+
+        for token, count in counts.items():
+            self.postings[token][word] = count
+        self.lengths[word] = sum(counts.values())
+
+    def _remove(self, word: str, meanings: list):
+        for meaning in meanings:
+            for token in tokenize(meaning):
+                posting = self.postings.get(token)
+                if posting is None:
+                    continue
+                posting.pop(word, None)
+                if len(posting) == 0:
+                    self.postings.pop(token)
+        self.lengths.pop(word, None)
+
+    # the index is only kept up to date once it is built
+    def add_word(self, word: str, meanings: list):
+        if self._defer('add_word', word, meanings):
+            return
+        if self.postings is not None:
+            self._add(word, meanings)
+
+    def delete_word(self, word: str, meanings: list):
+        if self._defer('delete_word', word, meanings):
+            return
+        if self.postings is not None:
+            self._remove(word, meanings)
+
+    def set_meanings(self, word: str, old_meanings: list, new_meanings: list):
+        if self._defer('set_meanings', word, old_meanings, new_meanings):
+            return
+        if self.postings is not None:
+            self._remove(word, old_meanings)
+            self._add(word, new_meanings)
+
+    """
+    `MeaningIndex.search(query: str, k: int = 10) -> list`
+
+    1. For every token of the query, adds tf * idf to the score of every word that has it
+        tf: share of the word's meaning tokens that are this token
+        idf: log(1 + number of words / number of words with the token)
+    2. Returns the k best (word, score), best first
+    """
+    def search(self, query: str, k: int = 10) -> list:
+        self._ensure()
+
+        word_count = len(self.lengths)
+        scores = defaultdict(float)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+
+            idf = math.log(1 + word_count / len(posting))
+            for word, count in posting.items():
+                scores[word] += count / self.lengths[word] * idf
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], item[0]))
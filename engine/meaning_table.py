@@ -0,0 +1,87 @@
+from array import array
+
+"""
+Meaning Table
+-------------
+
+Every distinct meaning is kept once and given an integer id, words and distractor pools only keep
+the ids. Words of the same list often share a meaning, so each of those strings is stored once
+instead of once per word:
+    ids: meaning -> id
+    texts: id -> meaning (None for an id that is free)
+    refs: id -> number of references, array('I'); an id is freed and reused once nothing
+        references it anymore
+"""
+
+class MeaningTable:
+    """
+    `MeaningTable.__init__()`
+    An empty table
+    """
+    def __init__(self):
+        self.ids = {}
+        self.texts = []
+        self.refs = array('I')
+        self.free = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    # returns the id of `meaning`, adding it if needed, and takes a reference to it
+    def intern(self, meaning: str) -> int:
+        meaning_id = self.ids.get(meaning)
+        if meaning_id is None:
+            if len(self.free) > 0:
+                meaning_id = self.free.pop()
+                self.texts[meaning_id] = meaning
+                self.refs[meaning_id] = 0
+            else:
+                meaning_id = len(self.texts)
+                self.texts.append(meaning)
+                self.refs.append(0)
+            self.ids[meaning] = meaning_id
+
+        self.refs[meaning_id] += 1
+        return meaning_id
+
+    # `intern` for every meaning, with the common case (the meaning is known) inlined
+    def intern_all(self, meanings: list) -> tuple:
+        ids, refs = self.ids, self.refs
+        meaning_ids = []
+        for meaning in meanings:
+            meaning_id = ids.get(meaning)
+            if meaning_id is None:
+                meaning_id = self.intern(meaning)
+            else:
+                refs[meaning_id] += 1
+            meaning_ids.append(meaning_id)
+        return tuple(meaning_ids)
+
+    # takes another reference to ids that are in the table already
+    def acquire_all(self, meaning_ids):
+        refs = self.refs
+        for meaning_id in meaning_ids:
+            refs[meaning_id] += 1
+
+    # gives back a reference taken by `intern`, the meaning is dropped with its last reference
+    def release(self, meaning_id: int):
+        self.refs[meaning_id] -= 1
+        if self.refs[meaning_id] == 0:
+            self.ids.pop(self.texts[meaning_id])
+            self.texts[meaning_id] = None
+            self.free.append(meaning_id)
+
+    def release_all(self, meaning_ids):
+        for meaning_id in meaning_ids:
+            self.release(meaning_id)
+
+    # returns the id of `meaning` without taking a reference, None if it isn't in the table
+    def id_of(self, meaning: str) -> int:
+        return self.ids.get(meaning)
+
+    def text(self, meaning_id: int) -> str:
+        return self.texts[meaning_id]
+
+    def texts_of(self, meaning_ids) -> tuple:
+        texts = self.texts
+        return tuple(texts[meaning_id] for meaning_id in meaning_ids)
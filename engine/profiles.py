@@ -0,0 +1,116 @@
+import os
+import json
+
+from .journal import replace_file
+from .library import Library
+from .vocabulary import Vocabulary
+
+"""
+Profiles
+--------
+
+Several users can share the app (e.g. the tablets of a classroom), each one has a profile with its
+own store, its shard: words, stats, logins and settings. The profiles are listed in
+`profiles.json`, shard files are relative to it:
+
+    {"active": "1", "profiles": {"1": {"name": "Alice", "file": "Vocabulary_Words.json"},
+        "2": {"name": "Bob", "file": "profiles/2.json"}}}
+
+Only the active profile is loaded. The library is loaded once and every profile sees its lists
+next to its own lists, see `ProfileStore` in library.py.
+
+Without a `profiles.json` the existing vocabulary becomes the first profile, nothing is moved.
+"""
+
+# new shards go in here, next to profiles.json
+SHARD_DIRECTORY = 'profiles'
+
+# the user block of a new profile
+DEFAULT_USER = {'goal': 1, 'mode': 'dark', 'list': ''}
+
+class Profiles:
+    """
+    `Profiles.__init__(path: str, default_file: str, library_path: str = None)`
+    path: profiles.json, created with `default_file` as the first profile if it doesn't exist
+    library_path: the library, profiles only have their own lists if it doesn't exist
+    """
+    def __init__(self, path: str, default_file: str, library_path: str = None):
+        self.path = path
+        self.directory = os.path.dirname(path)
+        self.library_path = library_path
+
+        # loaded by the first `open()`, the same one for every profile after that
+        self.library = None
+
+        # the vocabulary of the active profile, None until it is opened
+        self.vocabulary = None
+
+        if os.path.exists(path):
+            with open(path, 'r') as file:
+                self.index = json.load(file)
+        else:
+            self.index = {'active': '1', 'profiles': {'1': {'name': None,
+                'file': os.path.relpath(default_file, self.directory or '.')}}}
+
+    @property
+    def active(self) -> str:
+        return self.index['active']
+
+    # profile id -> name, None for a profile that was never opened
+    def names(self) -> dict:
+        return {profile_id: profile['name'] for profile_id, profile in self.index['profiles'].items()}
+
+    def _file(self, profile_id: str) -> str:
+        return os.path.join(self.directory, self.index['profiles'][profile_id]['file'])
+
+    def _save(self):
+        replace_file(self.path, [json.dumps(self.index, indent=4)])
+
+    """
+    `Profiles.create(name: str) -> str`
+    Creates an empty json shard for a new profile and returns its id, the active profile stays
+    """
+    def create(self, name: str) -> str:
+        profile_id = str(max(int(profile_id) for profile_id in self.index['profiles']) + 1)
+        shard = os.path.join(SHARD_DIRECTORY, profile_id + '.json')
+        os.makedirs(os.path.join(self.directory, SHARD_DIRECTORY), exist_ok=True)
+
+        user = dict(DEFAULT_USER, name=name)
+        js = {'User': user, 'Login info': {'last login': [], 'all logins': []}, 'WordList': {},
+            'LearnedWords': {}}
+        replace_file(os.path.join(self.directory, shard), [json.dumps(js)])
+
+        self.index['profiles'][profile_id] = {'name': name, 'file': shard}
+        self._save()
+        return profile_id
+
+    """
+    `Profiles.open(profile_id: str = None) -> Vocabulary`
+    Switches to a profile, the active one if None
+
+    1. Saves and closes the profile that was open
+    2. Loads the library the first time
+    3. Opens the shard of the profile and makes it the active one
+    """
+    def open(self, profile_id: str = None) -> Vocabulary:
+        self.close()
+        if profile_id is None:
+            profile_id = self.active
+
+        if self.library is None and self.library_path is not None and os.path.exists(self.library_path):
+            self.library = Library(self.library_path)
+
+        self.vocabulary = Vocabulary(self._file(profile_id), self.library)
+        self.index['active'] = profile_id
+        self.index['profiles'][profile_id]['name'] = self.vocabulary.store.get_user('name')
+        self._save()
+        return self.vocabulary
+
+    # saves and closes the open profile, its name is kept in profiles.json for the profile list
+    def close(self):
+        if self.vocabulary is None:
+            return
+        self.index['profiles'][self.active]['name'] = self.vocabulary.store.get_user('name')
+        self.vocabulary.close()
+        self.vocabulary = None
+        self._save()
@@ -0,0 +1,147 @@
+import time
+import heapq
+
+"""
+Scheduler
+---------
+
+Spaced repetition based on SM-2. Every word that was practiced has a review state:
+    due (float): time (seconds since epoch) of the next review
+    interval (float): days between the last review and `due`
+    ease (float): how fast the interval grows
+    reps (int): number of successful reviews in a row
+
+Words that were never practiced have no state and are due right away, in the order they were added.
+Each list keeps a heap of (due, order, word) so the next word is found in O(log n).
+"""
+
+DAY = 24 * 60 * 60
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# a word answered incorrectly comes back after this many seconds
+LAPSE_DELAY = 10 * 60
+
+# quality (0 - 5 in SM-2) given for a correct and an incorrect first answer
+CORRECT_QUALITY = 4
+INCORRECT_QUALITY = 1
+
+# returns the new state of a word after it was answered with `quality` at `now`
+def review(state: list, quality: int, now: float) -> list:
+    if state is None:
+        interval, ease, reps = 0, DEFAULT_EASE, 0
+    else:
+        interval, ease, reps = state[1], state[2], state[3]
+
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+    if quality < 3:
+        return [now + LAPSE_DELAY, 0, ease, 0]
+
+    reps += 1
+    if reps == 1:
+        interval = 1
+    elif reps == 2:
+        interval = 6
+    else:
+        interval = interval * ease
+    return [now + interval * DAY, interval, ease, reps]
+
+class ListScheduler:
+    """
+    `ListScheduler.__init__(words: list, schedules: dict)`
+    words: every word of the list, in the order they were added
+    schedules: word -> state, for the words that have one
+
+    due: word -> due time, a heap entry is stale when its time doesn't match this anymore
+    """
+    def __init__(self, words: list, schedules: dict):
+        self.due = {}
+        self.heap = []
+        self.order = 0
+
+        for word in words:
+            state = schedules.get(word)
+            self.push(word, 0 if state is None else state[0])
+
+    def __len__(self):
+        return len(self.due)
+
+    def push(self, word: str, due: float):
+        self.due[word] = due
+        heapq.heappush(self.heap, (due, self.order, word))
+        self.order += 1
+
+        # too many stale entries, rebuild the heap from `due`
+        if len(self.heap) > 2 * len(self.due) + 64:
+            self.heap = [(due_time, i, name) for i, (name, due_time) in enumerate(self.due.items())]
+            heapq.heapify(self.heap)
+
+    # the heap entries are dropped lazily by `peek`
+    def remove(self, word: str):
+        self.due.pop(word, None)
+
+    """
+    `ListScheduler.peek(now: float, due_only: bool) -> str`
+
+    1. Drops stale entries from the top of the heap
+    2. Returns the word that is due the earliest, None if the list is empty (or nothing is due
+        and `due_only` is set)
+    """
+    def peek(self, now: float, due_only: bool) -> str:
+        while len(self.heap) > 0:
+            due, order, word = self.heap[0]
+            if self.due.get(word) == due:
+                if due_only and due > now:
+                    return None
+                return word
+            heapq.heappop(self.heap)
+        return None
+
+    def due_count(self, now: float) -> int:
+        return sum(1 for due in self.due.values() if due <= now)
+
+class Scheduler:
+    """
+    `Scheduler.__init__(store: VocabularyStore)`
+    list name -> ListScheduler, a list is only loaded the first time it is practiced
+    """
+    def __init__(self, store):
+        self.store = store
+        self.queues = {}
+
+    def queue(self, word_list: str) -> ListScheduler:
+        if word_list not in self.queues:
+            self.queues[word_list] = ListScheduler(self.store.words_in(word_list),
+                self.store.schedules(word_list))
+        return self.queues[word_list]
+
+    # returns the next word to practice in `word_list`, see `ListScheduler.peek`
+    def next_word(self, word_list: str, due_only: bool = False, now: float = None) -> str:
+        return self.queue(word_list).peek(time.time() if now is None else now, due_only)
+
+    """
+    `Scheduler.grade(word: str, correct: bool, now: float = None)`
+    Called once per question, with the first answer the user picked
+
+    1. Computes the new state, saves it and puts the word back in the heap
+    """
+    def grade(self, word: str, correct: bool, now: float = None):
+        now = time.time() if now is None else now
+        state = review(self.store.schedule(word), CORRECT_QUALITY if correct else INCORRECT_QUALITY, now)
+        self.store.set_schedule(word, state)
+
+        word_list = self.store.list_of(word)
+        if word_list in self.queues:
+            self.queues[word_list].push(word, state[0])
+
+    def add_word(self, word_list: str, word: str):
+        if word_list in self.queues:
+            self.queues[word_list].push(word, 0)
+
+    def delete_word(self, word_list: str, word: str):
+        if word_list in self.queues:
+            self.queues[word_list].remove(word)
+            if len(self.queues[word_list]) == 0:
+                self.queues.pop(word_list)
@@ -0,0 +1,90 @@
+from bisect import bisect_left, insort
+
+"""
+Search Index
+------------
+
+Each list keeps its words sorted, so the words starting with a prefix are one slice of it, found
+with 2 binary searches. While the user is typing, the next prefix extends the previous one and
+the search only looks inside the previous slice.
+"""
+
+# returns the smallest string that is bigger than every string starting with `prefix`
+def _prefix_end(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+class PrefixIndex:
+    """
+    `PrefixIndex.__init__(words: list)`
+    words: sorted words of one list
+    last_prefix, last_range: the previous search, narrowed by the next one
+    """
+    def __init__(self, words: list):
+        self.words = sorted(words)
+        self.last_prefix = None
+        self.last_range = (0, 0)
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word: str):
+        insort(self.words, word)
+        self.last_prefix = None
+
+    def remove(self, word: str):
+        index = bisect_left(self.words, word)
+        if index < len(self.words) and self.words[index] == word:
+            self.words.pop(index)
+        self.last_prefix = None
+
+    """
+    `PrefixIndex.range(prefix: str) -> tuple`
+
+    1. Starts from the slice of the previous prefix if this one extends it
+    2. Returns (lo, hi), `words[lo:hi]` are the words starting with `prefix`
+    """
+    def range(self, prefix: str) -> tuple:
+        if len(prefix) == 0:
+            return 0, len(self.words)
+
+        lo, hi = 0, len(self.words)
+        if self.last_prefix is not None and prefix.startswith(self.last_prefix):
+            lo, hi = self.last_range
+
+        lo = bisect_left(self.words, prefix, lo, hi)
+        hi = bisect_left(self.words, _prefix_end(prefix), lo, hi)
+
+        self.last_prefix, self.last_range = prefix, (lo, hi)
+        return lo, hi
+
+    def search(self, prefix: str) -> list:
+        lo, hi = self.range(prefix)
+        return self.words[lo: hi]
+
+class SearchIndex:
+    """
+    `SearchIndex.__init__(store: VocabularyStore)`
+    list name -> PrefixIndex, a list is only sorted the first time it is opened
+    """
+    def __init__(self, store):
+        self.store = store
+        self.lists = {}
+
+    def index(self, word_list: str) -> PrefixIndex:
+        if word_list not in self.lists:
+            self.lists[word_list] = PrefixIndex(self.store.words_in(word_list))
+        return self.lists[word_list]
+
+    # returns the words of `word_list` starting with `prefix`, sorted
+    def search(self, word_list: str, prefix: str) -> list:
+        return self.index(word_list).search(prefix)
+
+    def add_word(self, word_list: str, word: str):
+        if word_list in self.lists:
+            self.lists[word_list].add(word)
+
+    def delete_word(self, word_list: str, word: str):
+        if word_list in self.lists:
+            self.lists[word_list].remove(word)
+            if len(self.lists[word_list]) == 0:
+                self.lists.pop(word_list)
@@ -0,0 +1,839 @@
+import os
+import json
+import sqlite3
+import pathlib
+import threading
+from collections import defaultdict
+
+from .journal import Journal, COMPACT_THRESHOLD, GENERATION_KEY, replace_file
+from .word_table import WordTable
+
+"""
+Storage
+-------
+
+Everything the app knows about the user lives behind a `VocabularyStore`, the screens never touch
+the file format. There are 2 backends:
+
+JSONStore: the original `Vocabulary_Words.json` format, changes are appended to a journal and
+    folded back into the json file by `save()`, which can run on another thread (see autosave.py)
+SQLiteStore: an indexed database, only the rows that are asked for are read
+
+Use `open_store(path)` to get the right one for a file, and `python -m engine <from> <to>` to
+move a vocabulary from one backend to the other.
+"""
+
+class VocabularyStore:
+    # stores that keep their meanings in a `MeaningTable` share it with the indexes, see distractors.py
+    meaning_table = None
+
+    # stores that can be saved on another thread call this after every change, see autosave.py
+    on_change = None
+
+    # ---------------------------------- User ----------------------------------
+    def get_user(self, key: str, default=None):
+        raise NotImplementedError
+
+    def set_user(self, key: str, value):
+        raise NotImplementedError
+
+    # --------------------------------- Logins ---------------------------------
+    """
+    Each login is a list of [[year, month, day, hour], correct answer count, all answers count],
+    early logins come first
+    """
+    def logins(self) -> list:
+        raise NotImplementedError
+
+    def add_login(self, login: list):
+        raise NotImplementedError
+
+    """
+    `VocabularyStore.prune_logins(keep)`
+    Removes every login where keep(login) is False
+    """
+    def prune_logins(self, keep):
+        raise NotImplementedError
+
+    # ---------------------------------- Words ---------------------------------
+    def has_word(self, word: str) -> bool:
+        raise NotImplementedError
+
+    # words that can't be deleted or edited, e.g. the library's (see profiles.py)
+    def read_only(self, word: str) -> bool:
+        return False
+
+    def word_count(self) -> int:
+        raise NotImplementedError
+
+    def meanings(self, word: str) -> list:
+        raise NotImplementedError
+
+    # returns (answered correctly, answered total)
+    def stats(self, word: str) -> tuple:
+        raise NotImplementedError
+
+    def list_of(self, word: str) -> str:
+        raise NotImplementedError
+
+    """
+    `VocabularyStore.iter_words(word_list: str = None)`
+    Yields (word, meanings, answered correctly, answered total, list) for every word, or only the
+    words of `word_list`
+    """
+    def iter_words(self, word_list: str = None):
+        raise NotImplementedError
+
+    # yields the meaning ids of every word of `word_list`, only for stores with a `meaning_table`
+    def iter_meaning_ids(self, word_list: str):
+        raise NotImplementedError
+
+    # the stats are only given when words are copied from another store
+    def add_word(self, word: str, meanings: list, word_list: str, correct: int = 0, total: int = 0):
+        raise NotImplementedError
+
+    """
+    `VocabularyStore.add_words(rows: list)`
+    Adds many (word, meanings, list) at once, used by the importer. Backends that can write
+    them together override this.
+    """
+    def add_words(self, rows: list):
+        for word, meanings, word_list in rows:
+            self.add_word(word, meanings, word_list)
+
+    def delete_word(self, word: str):
+        raise NotImplementedError
+
+    def set_meanings(self, word: str, meanings: list):
+        raise NotImplementedError
+
+    def record_answer(self, word: str, correct: bool):
+        raise NotImplementedError
+
+    # -------------------------------- Activity --------------------------------
+    """
+    `VocabularyStore.activity() -> tuple`
+    Returns copies of (days, months), see activity.py
+    """
+    def activity(self) -> tuple:
+        raise NotImplementedError
+
+    # adds to the counts of `day` ('YYYY-MM-DD')
+    def add_activity(self, day: str, correct: int, total: int):
+        raise NotImplementedError
+
+    # replaces all days and months, used when old days are rolled up
+    def set_activity(self, days: dict, months: dict):
+        raise NotImplementedError
+
+    # ------------------------------- Scheduling -------------------------------
+    # review state of a word (see scheduler.py), None if it was never reviewed
+    def schedule(self, word: str) -> list:
+        raise NotImplementedError
+
+    def set_schedule(self, word: str, state: list):
+        raise NotImplementedError
+
+    # word -> review state for the words of `word_list` that have one
+    def schedules(self, word_list: str) -> dict:
+        raise NotImplementedError
+
+    # ---------------------------------- Lists ---------------------------------
+    # lists with at least one word in them
+    def lists(self) -> list:
+        raise NotImplementedError
+
+    def words_in(self, word_list: str) -> list:
+        raise NotImplementedError
+
+    def list_size(self, word_list: str) -> int:
+        raise NotImplementedError
+
+    # returns (answered correctly, answered total) summed over the list
+    def list_stats(self, word_list: str) -> tuple:
+        raise NotImplementedError
+
+    # --------------------------------- Library --------------------------------
+    """
+    The profile's stats of words the store doesn't have, the library's (see library.py), as
+    [answered correctly, answered total, review state or None]. They are kept apart from the
+    words, so they never show up as one, even once the word is gone from the library.
+    """
+    # None if the word was never answered
+    def library_entry(self, word: str) -> list:
+        raise NotImplementedError
+
+    def set_library_entry(self, word: str, entry: list):
+        raise NotImplementedError
+
+    # word -> entry for every word that has one
+    def library_entries(self) -> dict:
+        raise NotImplementedError
+
+    # ---------------------------------- File ----------------------------------
+    # called periodically, cheap when there is nothing to do
+    def maintain(self):
+        pass
+
+    # makes sure everything is on disk
+    def save(self):
+        pass
+
+    def close(self):
+        pass
+
+class JSONStore(VocabularyStore):
+    """
+    `JSONStore.__init__(path: str, read_only: bool = False)`
+    read_only: for tools reading a store the app may have open, the journals are replayed without
+        touching their files and nothing may be changed
+
+    1. Loads the snapshot and replays the journal on top of it
+    2. Moves the words into a `WordTable`
+    3. Creates `word_lists`
+
+    Every change is made with `lock` held, so `save()` can be called from another thread. The
+    json is kept serialized per section (`fragments`) and per word list (`list_fragments`), a
+    save only serializes again what was changed since the last one.
+    """
+    def __init__(self, path: str, read_only: bool = False):
+        self.path = path
+
+        with open(path, 'r') as file:
+            self.js = json.load(file)
+
+        # every change since the last save is in the journal, put them back on top of the snapshot
+        self.journal = Journal(os.path.splitext(path)[0] + '.journal')
+        self.journal.replay(self.js, rotate=not read_only)
+
+        # the words are kept in columns, the section is written back from them on save
+        self.words = WordTable.from_json(self.js.pop('WordList'))
+        self.meaning_table = self.words.meaning_table
+
+        # Because looping through the words everytime is very inefficient, create a dictionary
+        # that maps lists to words
+        self.word_lists = defaultdict(list)
+        for word in self.words:
+            self.word_lists[self.words.list_of(word)].append(word)
+
+        # files saved before scheduling / daily activity existed don't have these sections
+        self.js.setdefault('Schedule', {})
+        self.js['Login info'].setdefault('daily', {})
+        self.js['Login info'].setdefault('monthly', {})
+
+        self.lock = threading.RLock()
+        # only one save at a time, they share the temporary file
+        self.save_lock = threading.Lock()
+
+        # section -> its line of the json, word list -> its words in the json
+        self.fragments = {}
+        self.list_fragments = {}
+        self.dirty = set(self.js)
+        self.dirty_lists = set(self.word_lists)
+
+    # called with `lock` held after every change
+    def _changed(self, section: str = None, word_list: str = None):
+        if section is not None:
+            self.dirty.add(section)
+        if word_list is not None:
+            self.dirty_lists.add(word_list)
+        if self.on_change is not None:
+            self.on_change()
+
+    def get_user(self, key: str, default=None):
+        return self.js['User'].get(key, default)
+
+    def set_user(self, key: str, value):
+        with self.lock:
+            self.js['User'][key] = value
+            self.journal.append('user', key, value)
+            self._changed('User')
+
+    def logins(self) -> list:
+        return self.js['Login info']['all logins']
+
+    def add_login(self, login: list):
+        with self.lock:
+            self.js['Login info']['last login'] = login
+            self.js['Login info']['all logins'].append(login)
+            self.journal.append('login', login)
+            self._changed('Login info')
+
+    def prune_logins(self, keep):
+        with self.lock:
+            all_logins = self.js['Login info']['all logins']
+            all_logins[:] = [login for login in all_logins if keep(login)]
+            # the logins that are kept, it's usually none (see activity.py)
+            self.journal.append('logins', all_logins)
+            self._changed('Login info')
+
+    def activity(self) -> tuple:
+        login_info = self.js['Login info']
+        return ({day: list(counts) for day, counts in login_info['daily'].items()},
+            {month: list(counts) for month, counts in login_info['monthly'].items()})
+
+    def add_activity(self, day: str, correct: int, total: int):
+        with self.lock:
+            counts = self.js['Login info']['daily'].setdefault(day, [0, 0])
+            counts[0] += correct
+            counts[1] += total
+            self.journal.append('activity', day, correct, total)
+            self._changed('Login info')
+
+    def set_activity(self, days: dict, months: dict):
+        # not journaled, rolling up the days is done again on the next start anyway
+        with self.lock:
+            self.js['Login info']['daily'] = {day: list(counts) for day, counts in days.items()}
+            self.js['Login info']['monthly'] = {month: list(counts) for month, counts in months.items()}
+            self._changed('Login info')
+
+    def has_word(self, word: str) -> bool:
+        return word in self.words
+
+    def word_count(self) -> int:
+        return len(self.words)
+
+    def meanings(self, word: str) -> list:
+        return self.words.meanings_of(word)
+
+    def stats(self, word: str) -> tuple:
+        return self.words.stats(word)
+
+    def list_of(self, word: str) -> str:
+        return self.words.list_of(word)
+
+    def iter_words(self, word_list: str = None):
+        names = self.words if word_list is None else self.word_lists.get(word_list, [])
+        for word in names:
+            yield (word, *self.words.record(word))
+
+    def iter_meaning_ids(self, word_list: str):
+        for word in self.word_lists.get(word_list, []):
+            yield self.words.meaning_ids(word)
+
+    def add_word(self, word: str, meanings: list, word_list: str, correct: int = 0, total: int = 0):
+        with self.lock:
+            self.words.add(word, meanings, word_list, correct, total)
+            self.word_lists[word_list].append(word)
+            self.journal.append('add', word, meanings, word_list, correct, total)
+            self._changed(word_list=word_list)
+
+    def add_words(self, rows: list):
+        with self.lock:
+            for word, meanings, word_list in rows:
+                self.words.add(word, meanings, word_list)
+                self.word_lists[word_list].append(word)
+                self.dirty_lists.add(word_list)
+            self.journal.append_many('add', [(word, meanings, word_list, 0, 0)
+                for word, meanings, word_list in rows])
+            self._changed()
+
+    def delete_word(self, word: str):
+        with self.lock:
+            word_list = self.words.remove(word)
+            self.js['Schedule'].pop(word, None)
+            self.word_lists[word_list].remove(word)
+
+            # removes lists that became empty
+            if len(self.word_lists[word_list]) == 0:
+                self.word_lists.pop(word_list)
+            self.journal.append('delete', word)
+            self._changed('Schedule', word_list)
+
+    def set_meanings(self, word: str, meanings: list):
+        with self.lock:
+            self.words.set_meanings(word, meanings)
+            self.journal.append('meanings', word, meanings)
+            self._changed(word_list=self.words.list_of(word))
+
+    def record_answer(self, word: str, correct: bool):
+        with self.lock:
+            self.words.answer(word, correct)
+            self.journal.append('answer', word, correct)
+            self._changed(word_list=self.words.list_of(word))
+
+    def schedule(self, word: str) -> list:
+        return self.js['Schedule'].get(word)
+
+    def set_schedule(self, word: str, state: list):
+        with self.lock:
+            self.js['Schedule'][word] = state
+            self.journal.append('schedule', word, state)
+            self._changed('Schedule')
+
+    def schedules(self, word_list: str) -> dict:
+        schedule = self.js['Schedule']
+        return {word: schedule[word] for word in self.word_lists.get(word_list, []) if word in schedule}
+
+    def lists(self) -> list:
+        return list(self.word_lists.keys())
+
+    def words_in(self, word_list: str) -> list:
+        return self.word_lists.get(word_list, [])
+
+    def list_size(self, word_list: str) -> int:
+        return len(self.word_lists.get(word_list, []))
+
+    def list_stats(self, word_list: str) -> tuple:
+        correct, total = 0, 0
+        for word in self.word_lists.get(word_list, []):
+            word_correct, word_total = self.words.stats(word)
+            correct += word_correct
+            total += word_total
+        return correct, total
+
+    # only the shards of profiles have the section, see profiles.py
+    def library_entry(self, word: str) -> list:
+        return self.js.get('LibraryStats', {}).get(word)
+
+    def set_library_entry(self, word: str, entry: list):
+        with self.lock:
+            self.js.setdefault('LibraryStats', {})[word] = entry
+            self.journal.append('library', word, entry)
+            self._changed('LibraryStats')
+
+    def library_entries(self) -> dict:
+        return dict(self.js.get('LibraryStats', {}))
+
+    # the words of `word_list` as they are in the json, called with `lock` held
+    def _serialize_list(self, word_list: str):
+        self.dirty_lists.discard(word_list)
+        words = self.word_lists.get(word_list)
+        if words is None:
+            self.list_fragments.pop(word_list, None)
+            return
+
+        json_info = self.words.json_info
+        self.list_fragments[word_list] = ',\n'.join('        ' + json.dumps(word) + ': ' +
+            json.dumps(json_info(word)) for word in words)
+
+    """
+    `JSONStore.snapshot() -> tuple`
+    Returns (the json as a list of strings, its journal generation)
+
+    1. Serializes the word lists that changed, one at a time with the lock held only for one list,
+        so changes made meanwhile wait at most that long
+    2. With the lock held: serializes the lists that changed meanwhile and the other sections that
+        changed, and starts a new journal generation, the snapshot has exactly the changes of the
+        journals before it
+    """
+    def snapshot(self) -> tuple:
+        with self.lock:
+            word_lists = list(self.dirty_lists)
+        for word_list in word_lists:
+            with self.lock:
+                if word_list in self.dirty_lists:
+                    self._serialize_list(word_list)
+
+        with self.lock:
+            for word_list in list(self.dirty_lists):
+                self._serialize_list(word_list)
+            for key in self.dirty:
+                if key in self.js:
+                    self.fragments[key] = '    {}: {},\n'.format(json.dumps(key), json.dumps(self.js[key]))
+            self.dirty.clear()
+
+            generation = self.journal.rotate()
+            chunks = ['{\n']
+            chunks.extend(self.fragments[key] for key in self.js)
+            chunks.append('    {}: {},\n'.format(json.dumps(GENERATION_KEY), generation))
+            chunks.append('    "WordList": {\n')
+            chunks.append(',\n'.join(self.list_fragments.values()))
+            chunks.append('\n    }\n}\n')
+        return chunks, generation
+
+    # fold the journal back into the snapshot once it got long enough
+    def maintain(self):
+        if self.journal.records >= COMPACT_THRESHOLD:
+            self.save()
+
+    """
+    `JSONStore.save()`
+    Can be called from any thread, does nothing if nothing changed since the last save
+
+    1. Takes a snapshot, see `snapshot()`
+    2. Writes it next to the json file and swaps them once it's on the disk, see journal.py
+    3. Deletes the journals the snapshot made useless
+    """
+    def save(self):
+        with self.save_lock:
+            with self.lock:
+                if len(self.dirty) == 0 and len(self.dirty_lists) == 0 and self.journal.records == 0:
+                    return
+            chunks, generation = self.snapshot()
+            replace_file(self.path, chunks)
+            self.journal.drop_before(generation)
+
+    def close(self):
+        with self.lock:
+            self.journal.close()
+
+"""
+SQLite File Structure
+---------------------
+
+user (key, value): value is json encoded
+logins (id, year, month, day, hour, correct, total)
+daily (day, correct, total)
+monthly (month, correct, total)
+lists (id, name)
+words (id, word, list_id, correct, total): indexed on the list and on the stats of a list
+meanings (word_id, position, meaning)
+schedule (word_id, due, interval, ease, reps): indexed on due
+library (word, correct, total, schedule): schedule is json encoded, see `library_entry`
+"""
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logins (
+    id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logins_date ON logins (year, month, day);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT PRIMARY KEY,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS monthly (
+    month TEXT PRIMARY KEY,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lists (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    word TEXT UNIQUE NOT NULL,
+    list_id INTEGER NOT NULL REFERENCES lists (id),
+    correct INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS words_list ON words (list_id);
+CREATE INDEX IF NOT EXISTS words_list_stats ON words (list_id, total, correct);
+CREATE TABLE IF NOT EXISTS meanings (
+    word_id INTEGER NOT NULL REFERENCES words (id),
+    position INTEGER NOT NULL,
+    meaning TEXT NOT NULL,
+    PRIMARY KEY (word_id, position)
+);
+CREATE TABLE IF NOT EXISTS schedule (
+    word_id INTEGER PRIMARY KEY REFERENCES words (id),
+    due REAL NOT NULL,
+    interval REAL NOT NULL,
+    ease REAL NOT NULL,
+    reps INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schedule_due ON schedule (due);
+CREATE TABLE IF NOT EXISTS library (
+    word TEXT PRIMARY KEY,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    schedule TEXT
+);
+"""
+
+# the same defaults as the json file that ships with the app
+_DEFAULT_USER = {"name": "Enter name", "goal": 1, "mode": "dark", "list": ""}
+
+class SQLiteStore(VocabularyStore):
+    """
+    `SQLiteStore.__init__(path: str, read_only: bool = False)`
+    read_only: the database is opened read only, it must exist
+
+    1. Opens (or creates) the database, nothing else is read until it is asked for
+    """
+    def __init__(self, path: str, read_only: bool = False):
+        self.path = path
+
+        # the app opens the store in a loading thread and uses it in the main thread, the autosave,
+        # the index warm up and the export read it on threads of their own: every use of the
+        # connection holds `lock`, so their statements and commits never interleave
+        self.lock = threading.RLock()
+        if read_only:
+            uri = pathlib.Path(path).resolve().as_uri() + '?mode=ro'
+            self.db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(_SCHEMA)
+
+        for key, value in _DEFAULT_USER.items():
+            self.db.execute("INSERT OR IGNORE INTO user VALUES (?, ?)", (key, json.dumps(value)))
+        self.db.commit()
+
+    def get_user(self, key: str, default=None):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM user WHERE key = ?", (key,)).fetchone()
+            return default if row is None else json.loads(row[0])
+
+    def set_user(self, key: str, value):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO user VALUES (?, ?)", (key, json.dumps(value)))
+            self.db.commit()
+
+    def logins(self) -> list:
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT year, month, day, hour, correct, total FROM logins ORDER BY id")
+            return [[list(row[:4]), row[4], row[5]] for row in rows]
+
+    def add_login(self, login: list):
+        with self.lock:
+            self.db.execute("INSERT INTO logins (year, month, day, hour, correct, total) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (*login[0][:4], login[1], login[2]))
+            self.db.commit()
+
+    def prune_logins(self, keep):
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT id, year, month, day, hour, correct, total FROM logins").fetchall()
+            dropped = [(row[0],) for row in rows if not keep([list(row[1:5]), row[5], row[6]])]
+            self.db.executemany("DELETE FROM logins WHERE id = ?", dropped)
+            self.db.commit()
+
+    def activity(self) -> tuple:
+        with self.lock:
+            days = {row[0]: [row[1], row[2]] for row in
+                self.db.execute("SELECT * FROM daily ORDER BY day")}
+            months = {row[0]: [row[1], row[2]] for row in
+                self.db.execute("SELECT * FROM monthly ORDER BY month")}
+            return days, months
+
+    def add_activity(self, day: str, correct: int, total: int):
+        with self.lock:
+            self.db.execute("INSERT INTO daily VALUES (?, ?, ?) ON CONFLICT (day) DO UPDATE SET "
+                "correct = correct + excluded.correct, total = total + excluded.total",
+                (day, correct, total))
+            self.db.commit()
+
+    def set_activity(self, days: dict, months: dict):
+        with self.lock:
+            self.db.execute("DELETE FROM daily")
+            self.db.execute("DELETE FROM monthly")
+            self.db.executemany("INSERT INTO daily VALUES (?, ?, ?)",
+                [(day, *counts) for day, counts in days.items()])
+            self.db.executemany("INSERT INTO monthly VALUES (?, ?, ?)",
+                [(month, *counts) for month, counts in months.items()])
+            self.db.commit()
+
+    def _word_id(self, word: str) -> int:
+        with self.lock:
+            row = self.db.execute("SELECT id FROM words WHERE word = ?", (word,)).fetchone()
+            if row is None:
+                raise KeyError(word)
+            return row[0]
+
+    # returns the id of `word_list`, creating it if it doesn't exist
+    def _list_id(self, word_list: str) -> int:
+        self.db.execute("INSERT OR IGNORE INTO lists (name) VALUES (?)", (word_list,))
+        return self.db.execute("SELECT id FROM lists WHERE name = ?", (word_list,)).fetchone()[0]
+
+    def has_word(self, word: str) -> bool:
+        with self.lock:
+            return self.db.execute("SELECT 1 FROM words WHERE word = ?", (word,)).fetchone() is not None
+
+    def word_count(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def meanings(self, word: str) -> list:
+        with self.lock:
+            rows = self.db.execute("SELECT meaning FROM meanings WHERE word_id = ? ORDER BY position",
+                (self._word_id(word),))
+            return [row[0] for row in rows]
+
+    def stats(self, word: str) -> tuple:
+        with self.lock:
+            row = self.db.execute("SELECT correct, total FROM words WHERE word = ?", (word,)).fetchone()
+            if row is None:
+                raise KeyError(word)
+            return row
+
+    def list_of(self, word: str) -> str:
+        with self.lock:
+            row = self.db.execute("SELECT lists.name FROM words JOIN lists ON lists.id = words.list_id "
+                "WHERE words.word = ?", (word,)).fetchone()
+            if row is None:
+                raise KeyError(word)
+            return row[0]
+
+    def iter_words(self, word_list: str = None):
+        # 2 cursors sorted by word id are walked side by side, so only one word is in memory
+        condition, params = "", ()
+        if word_list is not None:
+            condition, params = "WHERE lists.name = ?", (word_list,)
+
+        with self.lock:
+            words = self.db.execute("SELECT words.id, words.word, words.correct, words.total, "
+                "lists.name FROM words JOIN lists ON lists.id = words.list_id " + condition +
+                " ORDER BY words.id", params)
+            meanings = self.db.execute("SELECT meanings.word_id, meanings.meaning FROM meanings "
+                "JOIN words ON words.id = meanings.word_id JOIN lists ON lists.id = words.list_id " +
+                condition + " ORDER BY meanings.word_id, meanings.position", params)
+
+        # the lock is only held for a row, never while the caller has the word
+        def fetch(cursor):
+            with self.lock:
+                return cursor.fetchone()
+
+        meaning_row = fetch(meanings)
+        for word_id, word, correct, total, name in iter(lambda: fetch(words), None):
+            word_meanings = []
+            while meaning_row is not None and meaning_row[0] <= word_id:
+                if meaning_row[0] == word_id:
+                    word_meanings.append(meaning_row[1])
+                meaning_row = fetch(meanings)
+            yield word, word_meanings, correct, total, name
+
+    def add_word(self, word: str, meanings: list, word_list: str, correct: int = 0, total: int = 0):
+        with self.lock:
+            cursor = self.db.execute("INSERT INTO words (word, list_id, correct, total) "
+                "VALUES (?, ?, ?, ?)", (word, self._list_id(word_list), correct, total))
+            self.db.executemany("INSERT INTO meanings VALUES (?, ?, ?)",
+                [(cursor.lastrowid, i, meaning) for i, meaning in enumerate(meanings)])
+            self.db.commit()
+
+    # one transaction for all of them
+    def add_words(self, rows: list):
+        with self.lock:
+            list_ids = {}
+            for word, meanings, word_list in rows:
+                if word_list not in list_ids:
+                    list_ids[word_list] = self._list_id(word_list)
+
+                cursor = self.db.execute("INSERT INTO words (word, list_id) VALUES (?, ?)",
+                    (word, list_ids[word_list]))
+                self.db.executemany("INSERT INTO meanings VALUES (?, ?, ?)",
+                    [(cursor.lastrowid, i, meaning) for i, meaning in enumerate(meanings)])
+            self.db.commit()
+
+    def delete_word(self, word: str):
+        with self.lock:
+            word_id = self._word_id(word)
+            self.db.execute("DELETE FROM meanings WHERE word_id = ?", (word_id,))
+            self.db.execute("DELETE FROM schedule WHERE word_id = ?", (word_id,))
+            self.db.execute("DELETE FROM words WHERE id = ?", (word_id,))
+            self.db.commit()
+
+    def set_meanings(self, word: str, meanings: list):
+        with self.lock:
+            word_id = self._word_id(word)
+            self.db.execute("DELETE FROM meanings WHERE word_id = ?", (word_id,))
+            self.db.executemany("INSERT INTO meanings VALUES (?, ?, ?)",
+                [(word_id, i, meaning) for i, meaning in enumerate(meanings)])
+            self.db.commit()
+
+    def record_answer(self, word: str, correct: bool):
+        with self.lock:
+            self.db.execute("UPDATE words SET correct = correct + ?, total = total + 1 WHERE word = ?",
+                (1 if correct else 0, word))
+            self.db.commit()
+
+    def schedule(self, word: str) -> list:
+        with self.lock:
+            row = self.db.execute("SELECT due, interval, ease, reps FROM schedule WHERE word_id = ?",
+                (self._word_id(word),)).fetchone()
+            return None if row is None else list(row)
+
+    def set_schedule(self, word: str, state: list):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO schedule VALUES (?, ?, ?, ?, ?)",
+                (self._word_id(word), *state))
+            self.db.commit()
+
+    def schedules(self, word_list: str) -> dict:
+        with self.lock:
+            rows = self.db.execute("SELECT words.word, schedule.due, schedule.interval, schedule.ease, "
+                "schedule.reps FROM schedule JOIN words ON words.id = schedule.word_id "
+                "JOIN lists ON lists.id = words.list_id WHERE lists.name = ?", (word_list,))
+            return {row[0]: list(row[1:]) for row in rows}
+
+    def lists(self) -> list:
+        with self.lock:
+            rows = self.db.execute("SELECT name FROM lists WHERE EXISTS "
+                "(SELECT 1 FROM words WHERE words.list_id = lists.id) ORDER BY id")
+            return [row[0] for row in rows]
+
+    def words_in(self, word_list: str) -> list:
+        with self.lock:
+            rows = self.db.execute("SELECT words.word FROM words JOIN lists ON lists.id = words.list_id "
+                "WHERE lists.name = ? ORDER BY words.id", (word_list,))
+            return [row[0] for row in rows]
+
+    def list_size(self, word_list: str) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM words JOIN lists ON lists.id = words.list_id "
+                "WHERE lists.name = ?", (word_list,)).fetchone()[0]
+
+    def list_stats(self, word_list: str) -> tuple:
+        with self.lock:
+            row = self.db.execute("SELECT COALESCE(SUM(correct), 0), COALESCE(SUM(total), 0) FROM words "
+                "JOIN lists ON lists.id = words.list_id WHERE lists.name = ?", (word_list,)).fetchone()
+            return row[0], row[1]
+
+    def library_entry(self, word: str) -> list:
+        with self.lock:
+            row = self.db.execute("SELECT correct, total, schedule FROM library WHERE word = ?",
+                (word,)).fetchone()
+            return None if row is None else [row[0], row[1], json.loads(row[2])]
+
+    def set_library_entry(self, word: str, entry: list):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO library VALUES (?, ?, ?, ?)",
+                (word, entry[0], entry[1], json.dumps(entry[2])))
+            self.db.commit()
+
+    def library_entries(self) -> dict:
+        with self.lock:
+            rows = self.db.execute("SELECT word, correct, total, schedule FROM library")
+            return {row[0]: [row[1], row[2], json.loads(row[3])] for row in rows}
+
+    def save(self):
+        with self.lock:
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+# picks the backend from the file extension, read_only: for tools that only read the store
+def open_store(path: str, read_only: bool = False) -> VocabularyStore:
+    if os.path.splitext(path)[1] in ('.db', '.sqlite'):
+        return SQLiteStore(path, read_only)
+    return JSONStore(path, read_only)
+
+# copies everything in `source` into `target`, used to switch backends
+def copy_store(source: VocabularyStore, target: VocabularyStore):
+    for key in ('name', 'goal', 'mode', 'list', 'due only'):
+        value = source.get_user(key)
+        if value is not None:
+            target.set_user(key, value)
+
+    for login in source.logins():
+        target.add_login(login)
+
+    days, months = source.activity()
+    target.set_activity(days, months)
+
+    for word, meanings, correct, total, word_list in source.iter_words():
+        target.add_word(word, meanings, word_list, correct, total)
+        state = source.schedule(word)
+        if state is not None:
+            target.set_schedule(word, state)
+
+    for word, entry in source.library_entries().items():
+        target.set_library_entry(word, entry)
+
+    target.save()
@@ -0,0 +1,264 @@
+import threading
+from random import randint
+
+from .storage import open_store
+from .distractors import DistractorIndex
+from .scheduler import Scheduler
+from .mastery import MasteryCounters
+from .activity import DailyActivity
+from .search_index import SearchIndex
+from .fuzzy_index import FuzzyIndex
+from .meaning_index import MeaningIndex
+from .autosave import Autosave
+from .library import Library, ProfileStore
+
+"""
+Vocabulary
+----------
+
+Everything the app does with the words, without any UI: the store, the indexes built from it,
+questions and grading. The screens only show what this returns, and scripts can use it directly:
+
+    vocabulary = Vocabulary('Vocabulary_Words.json')
+    question = vocabulary.next_question('SAT')
+    vocabulary.answer(question, question.answer)
+    vocabulary.close()
+"""
+
+# number of choices of a question
+CHOICES = 4
+
+class Question:
+    """
+    `Question.__init__(word: str, choices: list, answer: int, correct: int, total: int)`
+    choices: `CHOICES` meanings, None where the list didn't have enough different meanings
+    answer: index of the meaning of `word` in choices
+    correct, total: how often the word was answered (correctly) before this question
+    graded: if the scheduler already saw an answer, only the first one counts
+    """
+    def __init__(self, word: str, choices: list, answer: int, correct: int, total: int):
+        self.word = word
+        self.choices = choices
+        self.answer = answer
+        self.correct = correct
+        self.total = total
+        self.graded = False
+
+class Vocabulary:
+    """
+    `Vocabulary.__init__(path: str, library: Library = None)`
+    Opens the store of `path`, the indexes are only built the first time they are used
+    library: shared word lists shown next to the store's own lists, see profiles.py
+    """
+    def __init__(self, path: str, library: Library = None):
+        # all reads and writes of the file go through the store, see storage.py
+        self.store = open_store(path)
+        if library is not None:
+            self.store = ProfileStore(self.store, library)
+
+        # list -> pool of meanings used as wrong answers
+        self.distractors = DistractorIndex(self.store)
+
+        # list -> heap of words ordered by their next review
+        self.scheduler = Scheduler(self.store)
+
+        # list -> number of learned/familiar/to learn words and answer counts
+        self.mastery = MasteryCounters(self.store)
+
+        # day -> number of questions answered (correctly) that day
+        self.activity = DailyActivity(self.store)
+
+        # list -> sorted words, for searching by prefix
+        self.search_index = SearchIndex(self.store)
+
+        # normalized words and their trigrams, for suggestions when a word is missing
+        self.fuzzy_index = FuzzyIndex(self.store)
+
+        # meaning tokens -> words, for searching words by meaning
+        self.meaning_index = MeaningIndex(self.store)
+
+        # saves the store in the background once the app started, see `start()`
+        self.autosave = None
+
+        # held while the words or their stats change, so `warm()` and the export can read them on
+        # other threads
+        self.lock = threading.RLock()
+
+        # threads started by `run_in_background`, `close()` waits for them
+        self.workers = []
+
+        # set by `close()`, background work checks it to stop early
+        self.closed = False
+
+    # ---------------------------------- Words ---------------------------------
+
+    # words must be added, deleted and edited through these so that every index stays up to date
+    def add_word(self, word: str, meanings: list, word_list: str):
+        with self.lock:
+            self.store.add_word(word, meanings, word_list)
+            self.distractors.add_word(word_list, meanings)
+            self.scheduler.add_word(word_list, word)
+            self.mastery.add_word(word_list)
+            self.search_index.add_word(word_list, word)
+            self.fuzzy_index.add_word(word)
+            self.meaning_index.add_word(word, meanings)
+
+    def delete_word(self, word: str):
+        with self.lock:
+            word_list, meanings = self.store.list_of(word), self.store.meanings(word)
+            correct, total = self.store.stats(word)
+            self.store.delete_word(word)
+            self.distractors.delete_word(word_list, meanings)
+            self.scheduler.delete_word(word_list, word)
+            self.mastery.delete_word(word_list, correct, total)
+            self.search_index.delete_word(word_list, word)
+            self.fuzzy_index.delete_word(word)
+            self.meaning_index.delete_word(word, meanings)
+
+    def set_meanings(self, word: str, meanings: list):
+        with self.lock:
+            word_list, old_meanings = self.store.list_of(word), list(self.store.meanings(word))
+            self.store.set_meanings(word, meanings)
+            self.distractors.set_meanings(word_list, old_meanings, meanings)
+            self.meaning_index.set_meanings(word, old_meanings, meanings)
+
+            # `next_question` took it out of the queue while it had no meanings
+            if len(old_meanings) == 0 and len(meanings) > 0:
+                self.scheduler.add_word(word_list, word)
+
+    def record_answer(self, word: str, correct: bool):
+        with self.lock:
+            word_list, (old_correct, old_total) = self.store.list_of(word), self.store.stats(word)
+            self.store.record_answer(word, correct)
+            self.mastery.answer(word_list, old_correct, old_total, correct)
+            self.activity.record(correct)
+
+    # -------------------------------- Questions -------------------------------
+
+    # a list can be practiced once it has `CHOICES` different meanings
+    def can_play(self, word_list: str) -> bool:
+        if self.store.list_size(word_list) == 0:
+            return False
+        return len(self.distractors.pool(word_list)) >= CHOICES
+
+    """
+    `Vocabulary.next_question(word_list: str, due_only: bool = None, now: float = None) -> Question`
+    due_only: the user setting is used if None
+
+    1. Asks the scheduler for the word that is due the earliest, None if nothing is due
+    2. Skips words without meanings (old files, or all meanings removed), they leave the queue until
+        they get one
+    3. Puts one of its meanings at a random choice, the others are meanings of other words
+    """
+    def next_question(self, word_list: str, due_only: bool = None, now: float = None) -> Question:
+        if due_only is None:
+            due_only = self.store.get_user('due only', False)
+
+        while True:
+            word = self.scheduler.next_word(word_list, due_only, now)
+            if word is None:
+                return None
+
+            meanings = self.store.meanings(word)
+            if len(meanings) > 0:
+                break
+            self.scheduler.queue(word_list).remove(word)
+
+        # up to 3 different meanings of the list that are not meanings of the current word
+        others = self.distractors.sample(word_list, CHOICES - 1, meanings)
+
+        answer = randint(0, CHOICES - 1)
+        choices = []
+        for i in range(CHOICES):
+            if i == answer:
+                choices.append(meanings[randint(0, len(meanings) - 1)])
+            else:
+                choices.append(others.pop() if len(others) > 0 else None)
+
+        return Question(word, choices, answer, *self.store.stats(word))
+
+    """
+    `Vocabulary.answer(question: Question, choice: int, now: float = None) -> bool`
+
+    1. The first answer of a question is graded by the scheduler
+    2. Every answer counts for the word's statistics and the activity of today
+    3. Returns if the choice was correct
+    """
+    def answer(self, question: Question, choice: int, now: float = None) -> bool:
+        correct = choice == question.answer
+
+        with self.lock:
+            if not question.graded:
+                self.scheduler.grade(question.word, correct, now)
+                question.graded = True
+
+            self.record_answer(question.word, correct)
+        return correct
+
+    # ---------------------------------- File ----------------------------------
+
+    """
+    `Vocabulary.start()`
+    Called when the app starts
+
+    1. Forgets the current list if it was emptied
+    2. Rolls up old activity
+    3. Starts saving every change in the background
+    """
+    def start(self):
+        if self.store.list_size(self.store.get_user('list')) == 0:
+            self.store.set_user('list', '')
+        self.activity.compact()
+        self.autosave = Autosave(self.store)
+
+    """
+    `Vocabulary.preload(word_list: str)`
+    Called on the loading thread, so the first screens don't have to look at every word
+
+    1. Builds the mastery counters, the user profile shows them for every list
+    2. Builds the indexes used by the questions of `word_list`
+    """
+    def preload(self, word_list: str):
+        self.mastery.buckets()
+        if self.store.list_size(word_list) > 0:
+            self.distractors.pool(word_list)
+            self.scheduler.queue(word_list)
+
+    # builds the search indexes of the dictionary, called on a background thread once the app runs
+    def warm(self):
+        cancelled = lambda: self.closed
+        self.fuzzy_index.warm(self.lock, cancelled)
+        self.meaning_index.warm(self.lock, cancelled)
+
+    # runs `target(*args)` on a thread that reads the vocabulary, nothing is started once closed
+    def run_in_background(self, target, *args):
+        with self.lock:
+            if self.closed:
+                return
+            self.workers = [worker for worker in self.workers if worker.is_alive()]
+            worker = threading.Thread(target=target, args=args, daemon=True)
+            self.workers.append(worker)
+            worker.start()
+
+    # housekeeping of the store, called every now and then, the autosave does it once started
+    def maintain(self):
+        if self.autosave is None:
+            self.store.maintain()
+
+    """
+    `Vocabulary.close()`
+
+    1. Tells the background threads to stop and waits for them, so none reads a closed store
+    2. Stops the autosave, then saves and closes the store
+    """
+    def close(self):
+        with self.lock:
+            self.closed = True
+        for worker in self.workers:
+            worker.join()
+
+        if self.autosave is not None:
+            self.autosave.stop()
+            self.autosave = None
+        self.store.save()
+        self.store.close()
@@ -0,0 +1,76 @@
+import threading
+
+"""
+Warm Index
+----------
+
+The search indexes take a pass over every word to build, too long for the ui thread with a big
+vocabulary. `WarmIndex.warm` builds one on another thread while the app keeps going:
+    the words are read one list at a time, holding the vocabulary's lock only for that list
+    changes made in the meantime are kept in `pending` and replayed on the built index, adding
+    and deleting a word twice gives the same index so the order of the two doesn't matter
+    a search made before the index is ready waits for it
+
+An index using it implements `_built()`, `_start()` (empty index), `_index(word, meanings)` and
+`_take(index)` (uses the structures of another index), its changes start with `_defer`.
+"""
+
+class WarmIndex:
+    # changes made while `warm` builds the index, None otherwise
+    pending = None
+
+    # set once the index `warm` built is in use, None if it never ran
+    ready = None
+
+    """
+    `WarmIndex.warm(lock: threading.RLock, cancelled = None)`
+    lock: held by every change of the words, see `Vocabulary.warm`
+    cancelled: checked before every list, the build stops if it returns True (the store is closing)
+
+    1. Takes the lists and starts keeping the changes, unless the index is built already
+    2. Builds a new index from the words of every list
+    3. Uses its structures and replays the changes kept meanwhile
+    """
+    def warm(self, lock, cancelled=None):
+        with lock:
+            if self._built() or self.pending is not None:
+                return
+            self.pending = []
+            self.ready = threading.Event()
+            word_lists = self.store.lists()
+
+        built, complete = type(self)(self.store), False
+        built._start()
+        try:
+            for word_list in word_lists:
+                with lock:
+                    if cancelled is not None and cancelled():
+                        break
+                    rows = list(self.store.iter_words(word_list))
+                for word, meanings, correct, total, name in rows:
+                    built._index(word, meanings)
+            else:
+                complete = True
+        finally:
+            with lock:
+                pending, self.pending = self.pending, None
+                # if the build failed or was cancelled the index is built the first time it is used
+                if complete:
+                    self._take(built)
+                    for method, args in pending:
+                        getattr(self, method)(*args)
+            self.ready.set()
+
+    # keeps a change for the index `warm` is building, False if it can be made right away
+    def _defer(self, method: str, *args) -> bool:
+        if self.pending is None:
+            return False
+        self.pending.append((method, args))
+        return True
+
+    # waits for `warm` if it is building the index, builds it here if nothing did
+    def _ensure(self):
+        if self.ready is not None:
+            self.ready.wait()
+        if not self._built():
+            self._build()
@@ -0,0 +1,124 @@
+from array import array
+
+from .meaning_table import MeaningTable
+
+"""
+Word Table
+----------
+
+The words of the json store, kept in columns instead of one `[meanings, correct, total, list]`
+list per word:
+    rows: word -> row, rows of deleted words are reused by the next word
+    meanings: row -> tuple of meaning ids, the meanings themselves are in `meaning_table`
+    correct, total: row -> answer counts, array('I')
+    list_ids: row -> id of the list, array('I'); list_names and list_ids_by_name map ids and names
+
+Numbers in an array take 4 bytes instead of a pointer plus a boxed int, and the list name is
+stored once per list instead of once per word. Meanings shared by several words are stored once.
+"""
+
+class WordTable:
+    """
+    `WordTable.__init__()`
+    An empty table, see `WordTable.from_json` to load the "WordList" section of the json file
+    """
+    def __init__(self):
+        self.rows = {}
+        self.meanings = []
+        self.meaning_table = MeaningTable()
+        self.correct = array('I')
+        self.total = array('I')
+        self.list_ids = array('I')
+
+        # rows of deleted words
+        self.free = []
+
+        self.list_names = []
+        self.list_ids_by_name = {}
+
+    # word -> [meanings, answered correctly, answered total, list], the json file format
+    @classmethod
+    def from_json(cls, words: dict):
+        table = cls()
+        for word, info in words.items():
+            table.add(word, info[0], info[3], info[1], info[2])
+        return table
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.rows
+
+    # words in the order they were added
+    def __iter__(self):
+        return iter(self.rows)
+
+    def _list_id(self, word_list: str) -> int:
+        list_id = self.list_ids_by_name.get(word_list)
+        if list_id is None:
+            list_id = len(self.list_names)
+            self.list_names.append(word_list)
+            self.list_ids_by_name[word_list] = list_id
+        return list_id
+
+    def add(self, word: str, meanings: list, word_list: str, correct: int = 0, total: int = 0):
+        list_id = self._list_id(word_list)
+        if len(self.free) > 0:
+            row = self.free.pop()
+            self.meanings[row] = self.meaning_table.intern_all(meanings)
+            self.correct[row], self.total[row], self.list_ids[row] = correct, total, list_id
+        else:
+            row = len(self.meanings)
+            self.meanings.append(self.meaning_table.intern_all(meanings))
+            self.correct.append(correct)
+            self.total.append(total)
+            self.list_ids.append(list_id)
+        self.rows[word] = row
+
+    # returns the list the word was in
+    def remove(self, word: str) -> str:
+        row = self.rows.pop(word)
+        self.meaning_table.release_all(self.meanings[row])
+        self.meanings[row] = ()
+        self.free.append(row)
+        return self.list_names[self.list_ids[row]]
+
+    def meanings_of(self, word: str) -> tuple:
+        return self.meaning_table.texts_of(self.meanings[self.rows[word]])
+
+    def meaning_ids(self, word: str) -> tuple:
+        return self.meanings[self.rows[word]]
+
+    def set_meanings(self, word: str, meanings: list):
+        row = self.rows[word]
+        # the new ones first, so meanings that stay are never dropped from the table
+        new_meanings = self.meaning_table.intern_all(meanings)
+        self.meaning_table.release_all(self.meanings[row])
+        self.meanings[row] = new_meanings
+
+    # returns (answered correctly, answered total)
+    def stats(self, word: str) -> tuple:
+        row = self.rows[word]
+        return self.correct[row], self.total[row]
+
+    def list_of(self, word: str) -> str:
+        return self.list_names[self.list_ids[self.rows[word]]]
+
+    def answer(self, word: str, correct: bool):
+        row = self.rows[word]
+        if correct:
+            self.correct[row] += 1
+        self.total[row] += 1
+
+    # returns (meanings, answered correctly, answered total, list)
+    def record(self, word: str) -> tuple:
+        row = self.rows[word]
+        return (self.meaning_table.texts_of(self.meanings[row]), self.correct[row], self.total[row],
+            self.list_names[self.list_ids[row]])
+
+    # [meanings, answered correctly, answered total, list], the json file format
+    def json_info(self, word: str) -> list:
+        row = self.rows[word]
+        return [list(self.meaning_table.texts_of(self.meanings[row])), self.correct[row], self.total[row],
+            self.list_names[self.list_ids[row]]]
@@ -0,0 +1,81 @@
+import os
+import json
+
+from kivy.clock import Clock
+from kivy.core.image import Image as CoreImage
+
+"""
+Resources
+---------
+
+The images of the app are referenced by their path ("images/single_list/word.jpg"). Once
+`python build_atlas.py` packed them into `images/ui.atlas`, `res` turns a path into the url of its
+atlas region ("atlas://images/ui/images_single_list_word") so every packed image shares a few
+textures, images that weren't packed (too big, or no atlas was built) keep their path.
+
+    #:import res resources.res
+    background_normal: res("images/single_list/word.jpg")
+
+`preload` loads every image once when the app starts, so the first time a screen is shown its
+textures are in the cache already. The images it loads are listed in `images/ui.json`, written by
+`build_atlas.py` next to the atlas, so the app never has to look for them.
+"""
+
+# the atlas is images/ui.atlas with its pages images/ui-0.png, images/ui-1.png...
+ATLAS = 'images/ui'
+
+# the images of the app: {"packed": [paths in the atlas], "unpacked": [paths of the other images]}
+MANIFEST = ATLAS + '.json'
+
+# atlas ids of the packed images, read from the atlas the first time `res` is used
+_atlas_ids = None
+
+# images loaded by `preload`, kept so their textures stay alive
+_preloaded = []
+
+# "images/single_list/word.jpg" -> "images_single_list_word", what the atlas calls it
+def atlas_id(path: str) -> str:
+    return os.path.splitext(path)[0].replace('/', '_')
+
+def _load_atlas_ids() -> set:
+    if not os.path.exists(ATLAS + '.atlas'):
+        return set()
+    with open(ATLAS + '.atlas') as file:
+        pages = json.load(file)
+    return {uid for regions in pages.values() for uid in regions}
+
+def res(path: str) -> str:
+    global _atlas_ids
+    if _atlas_ids is None:
+        _atlas_ids = _load_atlas_ids()
+
+    uid = atlas_id(path)
+    if uid in _atlas_ids:
+        return 'atlas://{}/{}'.format(ATLAS, uid)
+    return path
+
+"""
+`preload()`
+Warms the texture cache without stalling the first frames
+
+1. Reads the images of `MANIFEST`, nothing is preloaded if the atlas was never built
+2. Loads one image per frame: the whole atlas with its first region, then every image that
+    isn't packed
+3. Stops once everything is loaded
+"""
+def preload():
+    if not os.path.exists(MANIFEST):
+        return
+    with open(MANIFEST) as file:
+        manifest = json.load(file)
+
+    queue = [res(path) for path in manifest['packed'][:1]] + manifest['unpacked']
+    queue.reverse()
+
+    def load_next(dt):
+        if len(queue) == 0:
+            return False
+        _preloaded.append(CoreImage(queue.pop()))
+
+    if len(queue) > 0:
+        Clock.schedule_interval(load_next, 0)
@@ -0,0 +1,47 @@
+import unittest
+
+from engine.distractors import DistractorPool
+
+class DistractorPoolTest(unittest.TestCase):
+    def test_shared_meaning_stays_until_its_last_word_goes(self):
+        pool = DistractorPool()
+        pool.add([1, 2])
+        pool.add([2, 3])
+        self.assertEqual(sorted(pool.ids), [1, 2, 3])
+        self.assertEqual(pool.counts[2], 2)
+
+        pool.remove([1, 2])
+        self.assertEqual(sorted(pool.ids), [2, 3])
+        self.assertEqual(pool.counts[2], 1)
+
+        pool.remove([2, 3])
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(pool.positions, {})
+
+    def test_positions_follow_the_swapped_id(self):
+        pool = DistractorPool()
+        pool.add([1, 2, 3, 4])
+        pool.remove([2])
+        for meaning_id, index in pool.positions.items():
+            self.assertEqual(pool.ids[index], meaning_id)
+
+    def test_removing_a_missing_id_does_nothing(self):
+        pool = DistractorPool()
+        pool.add([1])
+        pool.remove([5])
+        self.assertEqual(pool.ids, [1])
+
+    def test_sample_is_distinct_and_excludes(self):
+        pool = DistractorPool()
+        pool.add(range(100))
+        for _ in range(50):
+            picked = pool.sample(3, {0, 1})
+            self.assertEqual(len(set(picked)), 3)
+            self.assertFalse({0, 1} & set(picked))
+
+        small = DistractorPool()
+        small.add([1, 2])
+        self.assertEqual(small.sample(3, {1}), [2])
+
+if __name__ == '__main__':
+    unittest.main()
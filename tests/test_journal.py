@@ -0,0 +1,145 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from engine.journal import Journal, GENERATION_KEY, replace_file
+from engine.storage import JSONStore
+
+SNAPSHOT = {'User': {'name': 'test', 'goal': 1, 'mode': 'dark', 'list': ''},
+    'Login info': {'last login': [], 'all logins': []}, 'WordList': {}, 'LearnedWords': {}}
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'words.json')
+        self.journal_path = os.path.join(self.directory, 'words.journal')
+        with open(self.path, 'w') as file:
+            json.dump(SNAPSHOT, file)
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+
+    # opens the store again without saving the one that was open, like after a crash
+    def reopen(self) -> JSONStore:
+        store = JSONStore(self.path)
+        self.stores.append(store)
+        return store
+
+    def journals(self) -> list:
+        return sorted(name for name in os.listdir(self.directory) if name.startswith('words.journal'))
+
+    def test_replay_applies_the_journal(self):
+        store = self.reopen()
+        store.add_word('a', ['first'], 'L')
+        store.record_answer('a', True)
+        store.set_meanings('a', ['second'])
+
+        store = self.reopen()
+        self.assertEqual(list(store.meanings('a')), ['second'])
+        self.assertEqual(store.stats('a'), (1, 1))
+
+    def test_replay_stops_at_a_broken_line(self):
+        store = self.reopen()
+        store.add_word('a', ['first'], 'L')
+        store.close()
+        with open(self.journal_path, 'a') as file:
+            file.write('["add", "b", ["sec')
+
+        store = self.reopen()
+        self.assertTrue(store.has_word('a'))
+        self.assertFalse(store.has_word('b'))
+
+    def test_save_drops_the_journals(self):
+        store = self.reopen()
+        store.add_word('a', ['first'], 'L')
+        store.save()
+        self.assertEqual(self.journals(), [])
+
+        with open(self.path) as file:
+            generation = json.load(file)[GENERATION_KEY]
+        store.add_word('b', ['second'], 'L')
+        self.assertEqual(self.journals(), ['words.journal'])
+
+        store = self.reopen()
+        self.assertTrue(store.has_word('a') and store.has_word('b'))
+        self.assertGreater(store.journal.generation, generation)
+
+    def test_interrupted_saves_keep_every_change(self):
+        store = self.reopen()
+        store.save()
+        store.add_word('a', ['first'], 'L')
+        # the app dies after the journal is rotated, before the snapshot is written
+        store.snapshot()
+
+        store = self.reopen()
+        store.add_word('b', ['second'], 'L')
+        store.snapshot()
+
+        store = self.reopen()
+        self.assertTrue(store.has_word('a'))
+        self.assertTrue(store.has_word('b'))
+
+        store.save()
+        self.assertEqual(self.journals(), [])
+        store = self.reopen()
+        self.assertTrue(store.has_word('a') and store.has_word('b'))
+
+    def test_changes_during_a_save_are_replayed_once(self):
+        store = self.reopen()
+        store.add_word('a', ['first'], 'L')
+        chunks, generation = store.snapshot()
+        store.record_answer('a', True)
+        replace_file(self.path, chunks)
+        # the app died before `drop_before`, the old journal is still there
+
+        store = self.reopen()
+        self.assertEqual(store.stats('a'), (1, 1))
+
+    def test_pruned_logins_stay_pruned(self):
+        store = self.reopen()
+        store.add_login([[2020, 1, 2, 3], 4, 5])
+        store.save()
+        store.prune_logins(lambda login: False)
+        store.add_activity('2020-01-02', 4, 5)
+
+        store = self.reopen()
+        self.assertEqual(store.logins(), [])
+        self.assertEqual(store.activity()[0], {'2020-01-02': [4, 5]})
+
+    def test_read_only_replay_leaves_the_journal(self):
+        store = self.reopen()
+        store.add_word('a', ['first'], 'L')
+
+        reader = JSONStore(self.path, read_only=True)
+        reader.close()
+        self.assertTrue(reader.has_word('a'))
+        self.assertEqual(self.journals(), ['words.journal'])
+
+    def test_drop_before(self):
+        for generation in (1, 2, 3):
+            open('{}.{}'.format(self.journal_path, generation), 'w').close()
+        open(self.journal_path, 'w').close()
+
+        Journal(self.journal_path).drop_before(3)
+        self.assertEqual(self.journals(), ['words.journal', 'words.journal.3'])
+
+    def test_rotate(self):
+        journal = Journal(self.journal_path)
+        journal.append('user', 'goal', 2)
+        self.assertEqual(journal.rotate(), 1)
+        journal.append('user', 'goal', 3)
+        self.assertEqual(journal.rotate(), 2)
+        journal.close()
+
+        self.assertEqual(self.journals(), ['words.journal.0', 'words.journal.1'])
+        js = json.loads(json.dumps(SNAPSHOT))
+        Journal(self.journal_path).replay(js)
+        self.assertEqual(js['User']['goal'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from engine.scheduler import ListScheduler, Scheduler, DAY
+from engine.storage import JSONStore
+
+class ListSchedulerTest(unittest.TestCase):
+    def test_new_words_come_first_in_order(self):
+        queue = ListScheduler(['a', 'b', 'c'], {'a': [50, 1, 2.5, 1]})
+        self.assertEqual(queue.peek(0, False), 'b')
+
+    def test_deleted_word_is_skipped(self):
+        queue = ListScheduler(['a', 'b'], {})
+        queue.remove('a')
+        self.assertEqual(queue.peek(0, False), 'b')
+        queue.remove('b')
+        self.assertIsNone(queue.peek(0, False))
+        self.assertEqual(len(queue.heap), 0)
+
+    def test_pushed_again_the_old_entry_is_stale(self):
+        queue = ListScheduler(['a', 'b'], {})
+        queue.push('a', 100)
+        self.assertEqual(queue.peek(0, False), 'b')
+        queue.push('b', 200)
+        self.assertEqual(queue.peek(0, False), 'a')
+        self.assertIsNone(queue.peek(0, True))
+
+    def test_heap_is_rebuilt_when_mostly_stale(self):
+        queue = ListScheduler(['a'], {})
+        for due in range(200):
+            queue.push('a', due)
+        self.assertLess(len(queue.heap), 2 * len(queue.due) + 65)
+        self.assertEqual(queue.peek(1000, True), 'a')
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'words.json')
+        with open(path, 'w') as file:
+            json.dump({'User': {}, 'Login info': {'last login': [], 'all logins': []},
+                'WordList': {'a': [['x'], 0, 0, 'L'], 'b': [['y'], 0, 0, 'L']},
+                'LearnedWords': {}}, file)
+        self.store = JSONStore(path)
+        self.scheduler = Scheduler(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_regrade_moves_the_word(self):
+        self.assertEqual(self.scheduler.next_word('L', now=0), 'a')
+        self.scheduler.grade('a', True, now=0)
+        self.assertEqual(self.scheduler.next_word('L', now=0), 'b')
+        self.assertEqual(self.store.schedule('a')[0], DAY)
+
+        self.scheduler.grade('b', True, now=0)
+        self.scheduler.grade('a', False, now=0)
+        self.assertEqual(self.scheduler.next_word('L', now=0), 'a')
+        self.assertIsNone(self.scheduler.next_word('L', due_only=True, now=0))
+
+    def test_deleted_word_is_never_asked(self):
+        self.scheduler.next_word('L', now=0)
+        self.store.delete_word('a')
+        self.scheduler.delete_word('L', 'a')
+        self.assertEqual(self.scheduler.next_word('L', now=0), 'b')
+
+        self.store.delete_word('b')
+        self.scheduler.delete_word('L', 'b')
+        self.assertNotIn('L', self.scheduler.queues)
+        self.assertIsNone(self.scheduler.next_word('L', now=0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from engine.word_table import WordTable
+
+class WordTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = WordTable.from_json({
+            'a': [['first', 'shared'], 1, 2, 'L'],
+            'b': [['shared'], 0, 1, 'M'],
+        })
+
+    def test_from_json(self):
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table.record('a'), (('first', 'shared'), 1, 2, 'L'))
+        self.assertEqual(self.table.json_info('b'), [['shared'], 0, 1, 'M'])
+
+    def test_delete_reuses_the_row(self):
+        row = self.table.rows['a']
+        self.assertEqual(self.table.remove('a'), 'L')
+        self.assertNotIn('a', self.table)
+
+        self.table.add('c', ['third'], 'M')
+        self.assertEqual(self.table.rows['c'], row)
+        self.assertEqual(self.table.record('c'), (('third',), 0, 0, 'M'))
+        self.assertEqual(list(self.table), ['b', 'c'])
+
+    def test_re_add_starts_over(self):
+        self.table.remove('a')
+        self.table.add('a', ['again'], 'M', 3, 4)
+        self.assertEqual(self.table.record('a'), (('again',), 3, 4, 'M'))
+
+    def test_meanings_stay_while_a_word_has_them(self):
+        meaning_table = self.table.meaning_table
+        shared = meaning_table.id_of('shared')
+        self.table.remove('a')
+        self.assertEqual(meaning_table.id_of('shared'), shared)
+        self.assertEqual(self.table.meanings_of('b'), ('shared',))
+
+        self.table.set_meanings('b', ['shared', 'new'])
+        self.table.remove('b')
+        self.assertEqual(len(meaning_table), 0)
+
+    def test_answer(self):
+        self.table.answer('b', True)
+        self.table.answer('b', False)
+        self.assertEqual(self.table.stats('b'), (1, 3))
+
+if __name__ == '__main__':
+    unittest.main()